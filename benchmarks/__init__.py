@@ -0,0 +1,12 @@
+"""
+Benchmarks of the overhead added by wires.
+
+# usage
+```
+python -m benchmarks                          # run everything
+python -m benchmarks -k inject                # only matching benchmarks
+python -m benchmarks -k import                # import time of wires
+python -m benchmarks -o results.json          # save the results
+python -m benchmarks --compare results.json   # compare with saved results
+```
+"""
@@ -0,0 +1,60 @@
+import argparse
+import sys
+
+from . import (  # noqa: F401, registers the benchmarks
+    bench_resolve, bench_inject, bench_overrides,
+    bench_strategy, bench_registry, bench_import, bench_memory,
+)
+from .runner import registry, run, dump, load
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-k", dest="keyword", default="",
+        help="only run benchmarks whose name contains KEYWORD",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the results as JSON to OUTPUT",
+    )
+    parser.add_argument(
+        "--compare", help="compare with the JSON results of a previous run",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=1.10,
+        help="ratio over the previous run reported as a regression",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="multiplies the number of operations of every benchmark",
+    )
+    options = parser.parse_args(argv)
+
+    previous = load(options.compare) if options.compare else {}
+    results = []
+    regressions = []
+
+    for benchmark in registry:
+        if options.keyword not in benchmark.name:
+            continue
+        result = run(benchmark, repeat=options.repeat, scale=options.scale)
+        results.append(result)
+
+        line = f"{result.name:<48} {result.best:12.1f} {result.unit}"
+        if result.name in previous:
+            ratio = result.best / previous[result.name]["best"]
+            line += f"  {ratio:6.2f}x"
+            if ratio > options.threshold:
+                regressions.append(result.name)
+                line += "  REGRESSION"
+        print(line)
+
+    if options.output:
+        dump(results, options.output)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+from pathlib import Path
+import subprocess
+import sys
+
+from .runner import benchmark
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# the import is timed inside the child, so interpreter startup isn't counted
+TIMED_IMPORT = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(statement: str):
+    def subject(number: int) -> float:
+        elapsed = 0.0
+        for _ in range(number):
+            output = subprocess.run(
+                [sys.executable, "-c", TIMED_IMPORT.format(
+                    statement=statement
+                )],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            ).stdout
+            elapsed += float(output)
+        return elapsed
+    return subject
+
+
+@benchmark("import", number=10, timer="wall")
+def import_wires():
+    return import_time("import wires")
+
+
+@benchmark("import", number=10, timer="wall")
+def import_context():
+    return import_time(
+        "from wires import Context, Composite, inject"
+    )
+
+
+@benchmark("import", number=10, timer="wall")
+def import_everything():
+    return import_time("from wires import *")
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+
+from wires import Context, Composite, inject
+from .runner import benchmark
+
+
+@dataclass
+class Repository:
+    conn: str = field(default="sqlite://")
+
+
+@dataclass
+class Service:
+    repository: Repository
+
+
+class InjectContext(Context):
+    repository: Composite[Repository] = Composite(Repository)
+    service: Composite[Service] = Composite(
+        Service,
+        repository=repository
+    )
+
+
+def handler(user_id: int, service: Service) -> int:
+    return user_id
+
+
+injected_handler = inject(InjectContext)(handler)
+
+
+@benchmark("inject", number=100_000)
+def direct():
+    service = Service(Repository())
+    return lambda: handler(1, service)
+
+
+@benchmark("inject", number=100_000)
+def direct_with_build():
+    return lambda: handler(1, Service(Repository()))
+
+
+@benchmark("inject", number=100_000)
+def injected():
+    return lambda: injected_handler(1)
+
+
+@benchmark("inject", number=100_000)
+def injected_with_argument():
+    service = Service(Repository())
+    return lambda: injected_handler(1, service=service)
@@ -0,0 +1,58 @@
+from typing import Any
+
+from wires import Composite, ContextStrategy
+from wires.composite import DependencyObject
+from wires.context import Adapter
+from .models import Leaf, Node
+from .runner import benchmark
+
+
+# memory used by graphs of 10k nodes, in bytes per node
+
+
+@benchmark("memory", number=10_000, timer="memory")
+def composite_nodes():
+    def subject(number: int) -> Any:
+        leaves = [Composite(Leaf, index) for index in range(number // 2)]
+        return [
+            Composite(Node, leaf, name=DependencyObject("name", "node"))
+            for leaf in leaves
+        ]
+    return subject
+
+
+@benchmark("memory", number=10_000, timer="memory")
+def singleton_nodes():
+    def subject(number: int) -> Any:
+        return [Composite.singleton(Leaf, index) for index in range(number)]
+    return subject
+
+
+@benchmark("memory", number=10_000, timer="memory")
+def strategy_tenants():
+    # one branch per tenant, a node and its leaf
+    def subject(number: int) -> Any:
+        return ContextStrategy(
+            DependencyObject("tenant", "tenant-0"),
+            {
+                f"tenant-{index}": Composite(Node, Composite(Leaf, index))
+                for index in range(number // 2)
+            },
+        )
+    return subject
+
+
+@benchmark("memory", number=10_000, timer="memory")
+def dependency_objects():
+    def subject(number: int) -> Any:
+        return [DependencyObject("value", index) for index in range(number)]
+    return subject
+
+
+@benchmark("memory", number=10_000, timer="memory")
+def adapters():
+    leaf = Composite(Leaf)
+
+    def subject(number: int) -> Any:
+        return [Adapter(leaf, "Leaf") for _ in range(number)]
+    return subject
@@ -0,0 +1,31 @@
+from wires import Composite
+from wires.composite import DependencyObject
+from .models import Node
+from .runner import benchmark
+
+
+dsn = DependencyObject("dsn", "sqlite://")
+connection = Composite(Node, dsn)
+repository = Composite(Node, connection)
+override = {"dsn": DependencyObject("dsn", "postgres://")}
+
+
+@benchmark("overrides")
+def enter_exit():
+    def subject():
+        with connection.overrides(override):
+            pass
+    return subject
+
+
+@benchmark("overrides")
+def resolve_dependent():
+    def subject():
+        with connection.overrides(override):
+            repository()
+    return subject
+
+
+@benchmark("overrides")
+def resolve_without_overrides():
+    return repository
@@ -0,0 +1,48 @@
+from threading import Barrier, Thread
+from typing import Any
+
+from wires import BoundedRegistry, Context, ContextRegistry
+from .runner import benchmark
+
+
+class RegistryContext(Context):
+    pass
+
+
+def _threaded(registry: Any, threads: int = 16):
+    def subject(number: int) -> None:
+        barrier = Barrier(threads)
+
+        def worker():
+            barrier.wait()
+            for _ in range(number // threads):
+                registry.get_instance(RegistryContext)
+
+        workers = [Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    return subject
+
+
+@benchmark("registry", number=100_000)
+def get_instance():
+    return lambda: ContextRegistry.get_instance(RegistryContext)
+
+
+@benchmark("registry", number=100_000, timer="wall")
+def get_instance_16_threads():
+    return _threaded(ContextRegistry)
+
+
+@benchmark("registry", number=100_000)
+def get_instance_bounded():
+    registry = BoundedRegistry()
+    return lambda: registry.get_instance(RegistryContext)
+
+
+@benchmark("registry", number=100_000, timer="wall")
+def get_instance_bounded_16_threads():
+    return _threaded(BoundedRegistry())
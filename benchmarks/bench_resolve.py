@@ -0,0 +1,135 @@
+from wires import Context, Composite, Scope
+from .models import Leaf, Node, deep_graph, wide_graph
+from .runner import benchmark
+
+
+class Deep:
+    pass
+
+
+class Wide:
+    pass
+
+
+class ResolveContext(Context):
+    leaf: Composite[Leaf] = Composite(Leaf)
+    deep: Composite[Deep] = deep_graph(25)
+    wide: Composite[Wide] = wide_graph(25)
+    singleton: Composite[Node] = Composite.singleton(Node, deep_graph(25))
+
+
+class GeneratedContext(Context):
+    codegen = True
+
+    leaf: Composite[Leaf] = Composite(Leaf)
+    deep: Composite[Deep] = deep_graph(25)
+    wide: Composite[Wide] = wide_graph(25)
+
+
+class Service1:
+    pass
+
+
+class Service2:
+    pass
+
+
+class Service3:
+    pass
+
+
+class Service4:
+    pass
+
+
+class Service5:
+    pass
+
+
+SERVICES = [Service1, Service2, Service3, Service4, Service5]
+_shared = deep_graph(10)
+
+
+class BatchContext(Context):
+    service_1: Composite[Service1] = Composite(Node, _shared)
+    service_2: Composite[Service2] = Composite(Node, _shared)
+    service_3: Composite[Service3] = Composite(Node, _shared)
+    service_4: Composite[Service4] = Composite(Node, _shared)
+    service_5: Composite[Service5] = Composite(Node, _shared)
+
+
+class ScopedContext(Context):
+    scoped: Composite[Node] = Composite.scoped(Node, deep_graph(25))
+
+
+def _context(context_type: type[Context]) -> Context:
+    context = context_type()
+    context.initialize_adapters()
+    return context
+
+
+@benchmark("resolve")
+def leaf():
+    context = _context(ResolveContext)
+    return lambda: context.resolve(Leaf)
+
+
+@benchmark("resolve", number=2_000)
+def deep_25():
+    context = _context(ResolveContext)
+    return lambda: context.resolve(Deep)
+
+
+@benchmark("resolve", number=2_000)
+def wide_25():
+    context = _context(ResolveContext)
+    return lambda: context.resolve(Wide)
+
+
+@benchmark("resolve")
+def leaf_generated():
+    context = _context(GeneratedContext)
+    return lambda: context.resolve(Leaf)
+
+
+@benchmark("resolve", number=2_000)
+def deep_25_generated():
+    context = _context(GeneratedContext)
+    return lambda: context.resolve(Deep)
+
+
+@benchmark("resolve", number=2_000)
+def wide_25_generated():
+    context = _context(GeneratedContext)
+    return lambda: context.resolve(Wide)
+
+
+@benchmark("resolve", number=2_000)
+def five_ports_one_by_one():
+    context = _context(BatchContext)
+    return lambda: [context.resolve(port) for port in SERVICES]
+
+
+@benchmark("resolve", number=2_000)
+def five_ports_resolve_many():
+    context = _context(BatchContext)
+    return lambda: context.resolve_many(SERVICES)
+
+
+@benchmark("resolve")
+def singleton():
+    context = _context(ResolveContext)
+    return lambda: context.resolve(Node)
+
+
+@benchmark("resolve")
+def scoped_cached():
+    context = _context(ScopedContext)
+    scope = Scope()
+    scope.__enter__()
+    return lambda: context.resolve(Node)
+
+
+@benchmark("resolve", number=1_000)
+def initialize_adapters():
+    return lambda: ResolveContext().initialize_adapters()
@@ -0,0 +1,43 @@
+from wires import Context, Composite, ContextStrategy, Scope, ScopeValue
+from wires.composite import DependencyObject
+from .models import Leaf, Node
+from .runner import benchmark
+
+
+class Storage:
+    pass
+
+
+def strategies() -> dict[str, Composite[Node]]:
+    return {
+        f"tenant-{index}": Composite(Node, Composite(Leaf, index))
+        for index in range(16)
+    }
+
+
+class StrategyContext(Context):
+    storage: Composite[Storage] = ContextStrategy(
+        DependencyObject("tenant", "tenant-7"), strategies()
+    )
+
+
+class CachedStrategyContext(Context):
+    storage: Composite[Storage] = ContextStrategy.singleton(
+        ScopeValue("tenant"), strategies()
+    )
+
+
+@benchmark("strategy")
+def dispatch():
+    context = StrategyContext()
+    context.initialize_adapters()
+    return lambda: context.resolve(Storage)
+
+
+@benchmark("strategy")
+def dispatch_cached_per_scope_key():
+    context = CachedStrategyContext()
+    context.initialize_adapters()
+    scope = Scope(tenant="tenant-7")
+    scope.__enter__()
+    return lambda: context.resolve(Storage)
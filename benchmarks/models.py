@@ -0,0 +1,28 @@
+from typing import Any
+
+from wires import Composite
+
+
+class Leaf:
+    def __init__(self, value: int = 0):
+        self.value = value
+
+
+class Node:
+    def __init__(self, *children: Any, **named: Any):
+        self.children = children
+        self.named = named
+
+
+def deep_graph(depth: int) -> Composite[Node]:
+    composite: Composite = Composite(Leaf)
+    for _ in range(depth):
+        composite = Composite(Node, composite)
+    return composite
+
+
+def wide_graph(width: int) -> Composite[Node]:
+    return Composite(
+        Node,
+        **{f"leaf_{index}": Composite(Leaf, index) for index in range(width)}
+    )
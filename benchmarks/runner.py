@@ -0,0 +1,168 @@
+from dataclasses import dataclass, asdict
+from typing import Callable, Any
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], Any]]
+    number: int
+    timer: str
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    number: int
+    repeat: int
+    # measured in `unit`, nanoseconds per operation for timed benchmarks
+    # and bytes per object for memory benchmarks
+    best: float
+    median: float
+    unit: str = "ns/op"
+
+    @property
+    def ops_per_second(self) -> float:
+        if self.unit != "ns/op" or not self.best:
+            return 0.0
+        return 1e9 / self.best
+
+
+registry: list[Benchmark] = []
+
+
+def benchmark(
+    group: str,
+    number: int = 10_000,
+    timer: str = "timeit",
+) -> Callable[[Callable[[], Callable[[], Any]]], Any]:
+    """
+    Registers a benchmark.
+
+    The decorated function prepares everything the benchmark needs and
+    returns the callable that is measured. With `timer="wall"` the
+    callable runs `number` operations by itself and is timed once per
+    repeat, which is used by benchmarks that start threads. If it
+    returns a number, that number is used as the elapsed time in seconds
+    instead, for benchmarks that only want to time part of their work.
+
+    With `timer="memory"` the callable builds `number` objects and
+    returns them, the result is the memory they use in bytes per object.
+    """
+    def wrapper(setup: Callable[[], Callable[[], Any]]):
+        registry.append(Benchmark(
+            name=f"{group}.{setup.__name__}",
+            group=group,
+            setup=setup,
+            number=number,
+            timer=timer,
+        ))
+        return setup
+    return wrapper
+
+
+def run(benchmark: Benchmark, repeat: int = 5, scale: float = 1.0) -> Result:
+    subject = benchmark.setup()
+    number = max(1, int(benchmark.number * scale))
+
+    if benchmark.timer == "memory":
+        return _measure_memory(benchmark, subject, number, repeat)
+    if benchmark.timer == "wall":
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            elapsed = subject(number)  # type: ignore
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+            timings.append(elapsed)
+    else:
+        subject()
+        timings = timeit.repeat(subject, number=number, repeat=repeat)
+
+    per_call = [timing / number * 1e9 for timing in timings]
+    return Result(
+        name=benchmark.name,
+        group=benchmark.group,
+        number=number,
+        repeat=repeat,
+        best=min(per_call),
+        median=statistics.median(per_call),
+    )
+
+
+def _measure_memory(
+    benchmark: Benchmark,
+    subject: Callable[..., Any],
+    number: int,
+    repeat: int,
+) -> Result:
+    import gc
+    import tracemalloc
+
+    sizes = []
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            built = subject(number)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del built
+        sizes.append(size / number)
+    return Result(
+        name=benchmark.name,
+        group=benchmark.group,
+        number=number,
+        repeat=repeat,
+        best=min(sizes),
+        median=statistics.median(sizes),
+        unit="B/object",
+    )
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": commit,
+    }
+
+
+def dump(results: list[Result], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump({
+            "environment": environment(),
+            "results": [asdict(result) for result in results],
+        }, file, indent=2)
+
+
+def load(path: str) -> dict[str, dict[str, Any]]:
+    with open(path) as file:
+        data = json.load(file)
+    results = {}
+    for result in data["results"]:
+        if "best" not in result:
+            # results of older runs, which had unit specific names
+            result["best"] = result.pop("best_ns")
+            result["median"] = result.pop("median_ns")
+        results[result["name"]] = result
+    return results
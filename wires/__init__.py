@@ -43,19 +43,82 @@ def main(
 ```
 """
 
-from .context import Context, Adapter
-from .context_registry import ContextRegistry
-from .composite import Composite
-from .strategy import ContextStrategy
+from typing import Any, TYPE_CHECKING
+import importlib
+
+# `inject` is cheap to import and shares its name with its module,
+# so it's imported eagerly, everything else on first access
 from .inject import inject
 
+if TYPE_CHECKING:
+    from .context import Context, Adapter
+    from .context_registry import (
+        BoundedRegistry, ContextRegistry, ContextVarRegistry, ThreadRegistry
+    )
+    from .composite import Composite, AsyncComposite
+    from .strategy import ContextStrategy
+    from .lazy import Lazy
+    from .instrumentation import Instrumentation
+    from .lifetime import Lifetime
+    from .fork import ForkPolicy
+    from .pool import Pool
+    from .scope import Scope, ScopeValue
+    from .resources import aclose_singletons, close_singletons
+
+
+_exports = {
+    "Context": ".context",
+    "Adapter": ".context",
+    "ContextRegistry": ".context_registry",
+    "ContextVarRegistry": ".context_registry",
+    "ThreadRegistry": ".context_registry",
+    "BoundedRegistry": ".context_registry",
+    "Composite": ".composite",
+    "AsyncComposite": ".composite",
+    "ContextStrategy": ".strategy",
+    "Lazy": ".lazy",
+    "Instrumentation": ".instrumentation",
+    "Lifetime": ".lifetime",
+    "ForkPolicy": ".fork",
+    "Pool": ".pool",
+    "Scope": ".scope",
+    "ScopeValue": ".scope",
+    "close_singletons": ".resources",
+    "aclose_singletons": ".resources",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_exports})
+
 
 __all__ = [
     "Context",
     "inject",
     "ContextRegistry",
+    "ContextVarRegistry",
+    "ThreadRegistry",
+    "BoundedRegistry",
     "ContextStrategy",
     "Composite",
+    "AsyncComposite",
     "Adapter",
-    "Port"
+    "Lazy",
+    "Instrumentation",
+    "Lifetime",
+    "ForkPolicy",
+    "Pool",
+    "Scope",
+    "ScopeValue",
+    "close_singletons",
+    "aclose_singletons",
 ]
@@ -0,0 +1,157 @@
+from typing import Any, Callable, Iterable
+import itertools
+import keyword
+import linecache
+
+from .composite import Composite, _MISSING, _overrides
+from .graph import BuildPlan
+from .instrumentation import current_recorder, label
+from .lifetime import Lifetime
+
+
+_counter = itertools.count()
+
+
+def _identifier(name: str) -> str:
+    return "".join(char if char.isalnum() else "_" for char in name)
+
+
+def _is_keyword_argument(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def _inline_singleton(node: Any) -> bool:
+    return (
+        type(node) is Composite
+        and node.lifetime is Lifetime.SINGLETON
+    )
+
+
+def plan_source(name: str, root: Composite, plan: BuildPlan) -> tuple[
+    str, dict[str, Any]
+]:
+    """
+    The source of a function that runs `plan` and the values it reads,
+    which are bound as defaults of its keyword only parameters.
+    """
+    values: dict[str, Any] = {
+        "_node": root,
+        "_overrides": _overrides.get,
+        "_recorder": current_recorder.get,
+        "_MISSING": _MISSING,
+    }
+    body = [
+        # overrides and instrumentation are handled by the composite
+        "    if _overrides() is not None or _recorder() is not None:",
+        "        return _node()",
+    ]
+
+    for index, step in enumerate(plan.steps):
+        factory = f"_f{index}"
+        result = f"_v{index}"
+        values[factory] = step.factory
+
+        if step.node is None and _inline_singleton(step.factory):
+            body.append(f"    {result} = {factory}._instance")
+            body.append(f"    if {result} is _MISSING:")
+            body.append(f"        {result} = {factory}()")
+            continue
+
+        arguments = []
+        slots = dict(step.arg_slots)
+        for position, arg in enumerate(step.args):
+            if position in slots:
+                arguments.append(f"_v{slots[position]}")
+            else:
+                values[f"_a{index}_{position}"] = arg
+                arguments.append(f"_a{index}_{position}")
+
+        kwarg_slots = dict(step.kwarg_slots)
+        extra = []
+        for position, (key, value) in enumerate(step.kwargs.items()):
+            if key in kwarg_slots:
+                expression = f"_v{kwarg_slots[key]}"
+            else:
+                expression = f"_k{index}_{position}"
+                values[expression] = value
+            if _is_keyword_argument(key):
+                arguments.append(f"{key}={expression}")
+            else:
+                extra.append(f"{key!r}: {expression}")
+        if extra:
+            arguments.append("**{" + ", ".join(extra) + "}")
+
+        body.append(f"    {result} = {factory}({', '.join(arguments)})")
+
+    body.append(f"    return _v{len(plan.steps) - 1}")
+    parameters = ", ".join(f"{value}={value}" for value in values)
+    source = "\n".join([f"def {name}(*, {parameters}):", *body, ""])
+    return source, values
+
+
+def singleton_source(name: str, root: Composite) -> tuple[
+    str, dict[str, Any]
+]:
+    """
+    The source of a function that returns the object of a singleton,
+    only calling the composite when it isn't built yet.
+    """
+    values = {"_node": root, "_MISSING": _MISSING}
+    source = "\n".join([
+        f"def {name}(*, _node=_node, _MISSING=_MISSING):",
+        "    instance = _node._instance",
+        "    if instance is not _MISSING:",
+        "        return instance",
+        "    return _node()",
+        "",
+    ])
+    return source, values
+
+
+def generate(root: Any) -> Callable[[], Any] | None:
+    """
+    Generates a function specialized in resolving `root`.
+
+    Transient composites get their whole build plan unrolled, one
+    constructor call per line, singletons a check of the built object.
+    Returns None for anything else, which is resolved as usual.
+
+    The source of the function is kept in `__generated_source__` and
+    registered in `linecache`, so `inspect.getsource` and tracebacks
+    show it.
+    """
+    if type(root) is not Composite:
+        return None
+
+    model = getattr(root.model, "__name__", type(root.model).__name__)
+    name = f"resolve_{_identifier(model)}"
+    if root.lifetime is Lifetime.SINGLETON:
+        source, values = singleton_source(name, root)
+    elif root.lifetime is Lifetime.TRANSIENT:
+        plan = root._plan
+        if plan is None:
+            plan = root.compile()
+        source, values = plan_source(name, root, plan)
+    else:
+        return None
+
+    filename = f"<wires generated {label(root)} {next(_counter)}>"
+    namespace = dict(values)
+    exec(compile(source, filename, "exec"), namespace)
+    function: Callable[[], Any] = namespace[name]
+    function.__generated_source__ = source  # type: ignore
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(keepends=True), filename
+    )
+    return function
+
+
+def install(adapters: Iterable[Any]) -> None:
+    """
+    Replaces the factory of every adapter that can be specialized
+    with a generated function.
+    """
+    for adapter in adapters:
+        function = generate(adapter.adapter)
+        if function is not None:
+            adapter.factory = function
@@ -1,14 +1,133 @@
 from typing import (
-    Generic, TypeVar, Any, Generator, Union, Self,
+    Generic, TypeVar, Any, Callable, Generator, Iterator, Mapping, Union,
+    Self, Sequence, TYPE_CHECKING,
+)
+from contextlib import asynccontextmanager, contextmanager
+from types import AsyncGeneratorType, GeneratorType
+from contextvars import ContextVar
+from threading import RLock
+from .lifetime import Lifetime
+from .scope import Scope, _current_scope
+from .pool import Pool, _current_lease
+from .graph import BuildPlan, PlanStep, check_acyclic, compile_plan, walk
+from .errors import (
+    AsyncDependencyError, ForkError, ResourceError, ScopeError,
+)
+from .fork import ForkPolicy, track
+from .instrumentation import current_recorder
+from .resources import (
+    ResourceStack, call_resources, current_resources, singleton_resources,
 )
-from contextlib import contextmanager
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
 
 
 T = TypeVar('T')
 T_co = TypeVar('T_co', covariant=True)
 
+_MISSING: Any = object()
+
+# code flags of generator functions, see `inspect.CO_GENERATOR`
+_CO_GENERATOR = 0x20
+_CO_ASYNC_GENERATOR = 0x200
+
+# Overrides active in the current thread or task, by composite id.
+# Resolving only reads it, so overrides never mutate shared composites.
+_overrides: ContextVar[dict[int, dict[str, Any]] | None] = ContextVar(
+    "wires_overrides", default=None
+)
+# objects built by the current resolve when it walks the graph instead
+# of running a plan (overrides and async resolves), by composite id
+_session: ContextVar["_Session | None"] = ContextVar(
+    "wires_session", default=None
+)
+# tasks building the async composites of the current async resolve,
+# by composite id, kept apart from the objects of `_session`
+_tasks: ContextVar["_Session | None"] = ContextVar(
+    "wires_tasks", default=None
+)
+
+
+class _Session(dict[int, Any]):
+    """
+    What a single resolve built, by composite id.
+
+    Tasks and threads started while resolving inherit the context
+    variables holding it, so it's closed when the resolve ends and
+    a closed session is ignored, their resolves build their own objects.
+    """
+    __slots__ = ("closed",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = False
+
+
+def _open(variable: ContextVar[_Session | None]) -> _Session | None:
+    session = variable.get()
+    if session is None or session.closed:
+        return None
+    return session
+
+
+class FrozenKwargs(Mapping[str, Any]):
+    """
+    The keyword arguments of a composite, a read-only mapping kept in two
+    tuples, smaller than a dict for the few arguments composites have.
+    """
+    __slots__ = ("_names", "_values")
+
+    def __init__(self, kwargs: Mapping[str, Any]):
+        self._names = tuple(kwargs)
+        self._values = tuple(kwargs.values())
+
+    @classmethod
+    def of(cls, kwargs: Mapping[str, Any]) -> "FrozenKwargs":
+        if not kwargs:
+            return _NO_KWARGS
+        return cls(kwargs)
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._values[self._names.index(name)]
+        except ValueError:
+            raise KeyError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def keys(self) -> tuple[str, ...]:  # type: ignore
+        return self._names
+
+    def values(self) -> tuple[Any, ...]:  # type: ignore
+        return self._values
+
+    def items(self) -> zip:  # type: ignore
+        return zip(self._names, self._values)
+
+    def __hash__(self) -> int:
+        # equal mappings hash alike whatever the order of their keys,
+        # raises TypeError if a value isn't hashable, like a tuple
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self) -> Any:
+        return FrozenKwargs.of, (dict(self.items()),)
+
+    def __repr__(self) -> str:
+        return f"FrozenKwargs({dict(self.items())!r})"
+
+
+# shared by the composites declared without keyword arguments
+_NO_KWARGS = FrozenKwargs({})
+
 
 class DependencyObject(Generic[T]):
+    __slots__ = ("dependency", "name")
+
     def __init__(self, name: str, dependency: T):
         self.dependency = dependency
         self.name = name
@@ -71,7 +190,80 @@ class Composite(Generic[T_co]):
     ):
         controller()
     ```
+
+    By default a composite builds a new object every time it is called,
+    expensive objects can be built once and reused by choosing a
+    different lifetime:
+
+    ```
+    pool = Composite.singleton(ConnectionPool, dsn="postgres://")
+    session = Composite.scoped(Session, pool=pool)
+
+    with Scope():
+        session() is session()  # True
+    ```
+
+    Within a single resolve, a transient composite reached through several
+    paths of the graph is built once and shared by every dependent,
+    `unshared()` builds one object per dependent instead:
+
+    ```
+    buffer = Composite(Buffer).unshared()
+    ```
+
+    Factories that return a context manager are declared as resources,
+    generator functions are resources without declaring them. Resources
+    are entered when built and exited when their owner, the active
+    scope or the resolving context, is closed:
+
+    ```
+    def open_file(path: str) -> Iterator[IO]:
+        with open(path) as file:
+            yield file
+
+    file = Composite(open_file, path="app.log")
+    connection = Composite.resource(engine.connect)
+    ```
+
+    Objects that are expensive to build but can't be shared by concurrent
+    requests can be pooled, they are checked out for an injected call or
+    a scope and returned afterwards:
+
+    ```
+    parser = Composite.pooled(Parser).with_pool(max_size=4, timeout=1.0)
+    ```
+
+    Singletons and pools are kept by the process, `on_fork` decides
+    what the child process of a fork does with them:
+
+    ```
+    client = Composite.singleton(HttpClient).on_fork(ForkPolicy.RESET)
+    ```
+
+    Graphs may have thousands of composites, so they have no instance
+    dict. The arguments are kept in a tuple and the keyword arguments in
+    a `FrozenKwargs`, the other slots hold the options set by the
+    builders (`unshared`, `with_pool`, `on_fork`) and cache what the
+    composite compiled or built.
     """
+    __slots__ = (
+        "model", "_args", "_kwargs", "_lifetime", "_instance", "_plan",
+        "_async", "_resources", "is_resource", "shared", "fork_policy",
+        # `_read_only` is set in a child process that shares the
+        # singleton of its parent, `_path` holds the module and qualified
+        # name of the class attribute holding the composite, composites
+        # are pickled by reference when it's known
+        "_read_only", "_path",
+        # only set for singletons and pooled composites
+        "_lock", "_pending", "pool",
+        "__weakref__",
+    )
+    # what the composite built or compiled, never pickled
+    _built_state = frozenset({
+        "_instance", "_plan", "_async", "_resources", "_lock", "_pending",
+        "_read_only", "__weakref__",
+    })
+
     def __init__(
         self,
         model: type[T_co],
@@ -80,12 +272,590 @@ class Composite(Generic[T_co]):
     ):
         self.model = model
         self._args = args
-        self._kwargs = kwargs
+        self._kwargs = FrozenKwargs.of(kwargs)
+        self._lifetime = Lifetime.TRANSIENT
+        self._instance = _MISSING
+        self._plan: BuildPlan | None = None
+        self._async: bool | None = None
+        self._resources: frozenset[int] | None = None
+        self.shared = True
+        self.fork_policy = ForkPolicy.INHERIT
+        self._read_only = False
+        self._path: tuple[str, str] | None = None
+        code = getattr(model, "__code__", None)
+        self.is_resource = code is not None and bool(
+            code.co_flags & (_CO_GENERATOR | _CO_ASYNC_GENERATOR)
+        )
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if self._path is None and "<locals>" not in owner.__qualname__:
+            self._path = (owner.__module__, f"{owner.__qualname__}.{name}")
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        """
+        Composites declared by a class are pickled as their import path,
+        so they are the same object in the process that loads them,
+        other composites are pickled without what they built.
+        """
+        path = self._path
+        if path is not None:
+            from .process import locate
+
+            try:
+                found = locate(*path) is self
+            except (ImportError, AttributeError):
+                found = False
+            if found:
+                return locate, path
+        return super().__reduce_ex__(protocol)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # subclasses declared without slots have a dict as well
+        state = dict(getattr(self, "__dict__", {}))
+        for klass in type(self).__mro__:
+            for name in getattr(klass, "__slots__", ()):
+                if name not in self._built_state and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._instance = _MISSING
+        self._plan = None
+        self._async = None
+        self._resources = None
+        self._read_only = False
+        # creates the lock of singletons and tracks forks
+        self.lifetime = self._lifetime
+        if self.fork_policy is not ForkPolicy.INHERIT:
+            track(self)
+
+    @classmethod
+    def transient(
+        cls, model: type[T_co], *args: Any, **kwargs: Any
+    ) -> "Composite[T_co]":
+        """
+        Builds a new object every time the composite is resolved.
+        """
+        return cls(model, *args, **kwargs)
+
+    @classmethod
+    def singleton(
+        cls, model: type[T_co], *args: Any, **kwargs: Any
+    ) -> "Composite[T_co]":
+        """
+        Builds the object once and shares it with every resolve.
+        """
+        composite = cls(model, *args, **kwargs)
+        composite.lifetime = Lifetime.SINGLETON
+        return composite
+
+    @classmethod
+    def scoped(
+        cls, model: type[T_co], *args: Any, **kwargs: Any
+    ) -> "Composite[T_co]":
+        """
+        Builds the object once per active `Scope`.
+        """
+        composite = cls(model, *args, **kwargs)
+        composite.lifetime = Lifetime.SCOPED
+        return composite
+
+    @classmethod
+    def pooled(
+        cls, model: type[T_co], *args: Any, **kwargs: Any
+    ) -> "Composite[T_co]":
+        """
+        Checks the object out of a bounded pool for the duration of an
+        injected call or a `Scope`, the pool is configured by `with_pool`.
+        """
+        composite = cls(model, *args, **kwargs)
+        composite.lifetime = Lifetime.POOLED
+        return composite
+
+    @classmethod
+    def resource(
+        cls, model: Any, *args: Any, **kwargs: Any
+    ) -> "Composite[T_co]":
+        """
+        Declares a factory that returns a context manager, the composite
+        resolves to the entered object, which is exited when its owner
+        is closed.
+        """
+        composite = cls(model, *args, **kwargs)
+        composite.is_resource = True
+        return composite
+
+    def unshared(self) -> Self:
+        """
+        Builds a new object for every composite that depends on this one,
+        instead of sharing one object per resolve.
+
+        By default a transient dependency reached through several paths
+        of the same resolve (a diamond) is built once and shared.
+        """
+        self.shared = False
+        return self
+
+    def with_pool(
+        self,
+        max_size: int = 8,
+        timeout: float | None = None,
+        block: bool = True,
+        reset: Callable[[Any], Any] | None = None,
+        validate: Callable[[Any], bool] | None = None,
+    ) -> Self:
+        """
+        Makes the composite pooled with the given pool options,
+        see `wires.pool.Pool`.
+        """
+        self.pool = Pool(
+            max_size=max_size,
+            timeout=timeout,
+            block=block,
+            reset=reset,
+            validate=validate,
+        )
+        self.lifetime = Lifetime.POOLED
+        return self
+
+    def on_fork(self, policy: ForkPolicy) -> Self:
+        """
+        Sets what the child process of a fork does with the objects kept
+        by the composite, see `ForkPolicy`.
+
+        ```
+        connection = Composite.singleton(connect).on_fork(ForkPolicy.RESET)
+        model = Composite.singleton(load_model).on_fork(ForkPolicy.SHARED)
+        ```
+        """
+        self.fork_policy = policy
+        track(self)
+        return self
+
+    @property
+    def lifetime(self) -> Lifetime:
+        return self._lifetime
+
+    @lifetime.setter
+    def lifetime(self, lifetime: Lifetime) -> None:
+        if lifetime is Lifetime.SINGLETON:
+            self._lock = RLock()
+            self._pending: Future | None = None
+            track(self)
+        elif lifetime is Lifetime.POOLED:
+            if not hasattr(self, "pool"):
+                self.pool = Pool()
+            track(self)
+        self._lifetime = lifetime
+
+    def reset(self) -> None:
+        """
+        Drops the object kept by a singleton composite,
+        the next resolve builds a new one.
+        Pooled composites drop their idle objects.
+        """
+        self._check_writable()
+        self._instance = _MISSING
+        if self._lifetime is Lifetime.POOLED:
+            self.pool.clear()
+
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise ForkError(
+                f"{getattr(self.model, '__qualname__', self.model)} is "
+                "shared with the parent process, it can't be reset"
+            )
+
+    def _after_fork(self) -> None:
+        """
+        Called in the child process of a fork.
+        """
+        lifetime = self._lifetime
+        policy = self.fork_policy
+        if lifetime is Lifetime.POOLED:
+            self.pool._after_fork(
+                keep=policy in (ForkPolicy.INHERIT, ForkPolicy.SHARED)
+            )
+            return
+        if lifetime is not Lifetime.SINGLETON:
+            return
+        # held by threads that don't exist in the child
+        self._lock = RLock()
+        self._pending = None
+        if policy in (ForkPolicy.RESET, ForkPolicy.REBUILD):
+            self.reset()
+        elif policy is ForkPolicy.SHARED:
+            self._read_only = self._kept()
+
+    def _kept(self) -> bool:
+        """
+        Whether the singleton holds an object.
+        """
+        return self._instance is not _MISSING
+
+    def _prepare_fork(self) -> None:
+        if self._lifetime is Lifetime.SINGLETON and not self.is_async():
+            self()
+
+    def _rebuild_after_fork(self) -> None:
+        if self._lifetime is Lifetime.SINGLETON and not self.is_async():
+            self()
 
     def __call__(self) -> T_co:
-        if self.args:
-            return self.model(*self.args, **self.kwargs)  # type: ignore
-        return self.model(**self.kwargs)  # type: ignore
+        lifetime = self._lifetime
+        if lifetime is Lifetime.TRANSIENT:
+            return self._build()
+        if lifetime is Lifetime.SINGLETON:
+            return self._singleton()
+        if lifetime is Lifetime.POOLED:
+            return self._pooled()
+        return Scope.current().get_or_build(  # type: ignore
+            self, self._build
+        )
+
+    def _pooled(self) -> T_co:
+        lease = _current_lease.get()
+        if lease is None:
+            scope = _current_scope.get()
+            if scope is None:
+                raise ScopeError(
+                    "A pooled dependency can only be resolved inside "
+                    "an injected call or an active Scope"
+                )
+            lease = scope.lease
+        return lease.get(self)  # type: ignore
+
+    def _singleton(self) -> T_co:
+        instance: T_co = self._instance
+        if instance is _MISSING:
+            with self._lock:
+                instance = self._instance
+                if instance is _MISSING:
+                    instance = self._instance = self._build()
+        return instance
+
+    async def __aresolve__(
+        self, resources: ResourceStack | None = None
+    ) -> T_co:
+        """
+        Resolves the composite inside an event loop, awaiting async
+        dependencies and building independent dependencies concurrently.
+
+        Async resources are entered into `resources`, the owner of the
+        resources is responsible for closing it.
+        """
+        if not self.is_async():
+            return self()
+
+        lifetime = self._lifetime
+        if lifetime is Lifetime.TRANSIENT:
+            return await self._abuild(resources)
+        if lifetime is Lifetime.SINGLETON:
+            return await self._asingleton(resources)
+        if lifetime is Lifetime.POOLED:
+            raise AsyncDependencyError(
+                "Pooled dependencies can't be built asynchronously"
+            )
+        return await Scope.current().aget_or_build(  # type: ignore
+            self, lambda: self._abuild(resources)
+        )
+
+    def is_async(self) -> bool:
+        """
+        Whether building the composite needs to await any dependency.
+        """
+        _async = self._async
+        if _async is None:
+            _async = self._async = any(
+                isinstance(node, AsyncComposite) for node in walk(self)
+            )
+        return _async
+
+    async def _asingleton(self, resources: ResourceStack | None) -> T_co:
+        # imported here, asyncio is only needed once something is async
+        # and importing it up front is most of the cost of `import wires`
+        import asyncio
+        from concurrent.futures import Future
+
+        instance: T_co = self._instance
+        if instance is not _MISSING:
+            return instance
+
+        with self._lock:
+            instance = self._instance
+            if instance is not _MISSING:
+                return instance
+            pending = self._pending
+            owner = pending is None
+            if pending is None:
+                pending = self._pending = Future()
+
+        if not owner:
+            return await asyncio.wrap_future(pending)
+
+        try:
+            instance = await self._abuild(resources)
+        except BaseException as error:
+            with self._lock:
+                self._pending = None
+            pending.set_exception(error)
+            raise
+
+        with self._lock:
+            self._instance = instance
+            self._pending = None
+        pending.set_result(instance)
+        return instance
+
+    async def _abuild(self, resources: ResourceStack | None) -> T_co:
+        import asyncio
+
+        tasks = _open(_tasks)
+        if tasks is None:
+            outer = _open(_session)
+            session = _Session() if outer is None else outer
+            tasks = _Session()
+            session_token = _session.set(session)
+            tasks_token = _tasks.set(tasks)
+            try:
+                return await self._abuild(resources)
+            finally:
+                tasks.closed = True
+                if outer is None:
+                    session.closed = True
+                _tasks.reset(tasks_token)
+                _session.reset(session_token)
+        session = _session.get()  # type: ignore
+
+        def build(dependency: Composite) -> Any:
+            if not dependency.shared:
+                return dependency.__aresolve__(resources)
+            # dependents built concurrently await the same task
+            task = tasks.get(id(dependency))
+            if task is None:
+                task = tasks[id(dependency)] = asyncio.ensure_future(
+                    dependency.__aresolve__(resources)
+                )
+            return task
+
+        _args, _kwargs = self._current_params()
+        dependencies = list({
+            id(value): value
+            for value in (*_args, *_kwargs.values())
+            if isinstance(value, Composite)
+        }.values())
+        # sync dependencies walk their graph sharing the objects of the
+        # session, so what they share with other dependencies is built once
+        built = {
+            id(dependency): self._resolve_shared(dependency, session)
+            for dependency in dependencies
+            if not dependency.is_async()
+        }
+        pending = [
+            dependency for dependency in dependencies
+            if id(dependency) not in built
+        ]
+        values = await asyncio.gather(*(
+            build(dependency) for dependency in pending
+        ))
+        built.update(
+            (id(dependency), value)
+            for dependency, value in zip(pending, values)
+        )
+
+        args = [
+            built[id(arg)] if isinstance(arg, Composite)
+            else self.resolve_composite(arg)
+            for arg in _args
+        ]
+        kwargs = {
+            key: built[id(value)] if isinstance(value, Composite)
+            else self.resolve_composite(value)
+            for key, value in _kwargs.items()
+        }
+        recorder = current_recorder.get()
+        if recorder is not None:
+            return await recorder.aconstruct(
+                self, lambda: self._acreate(args, kwargs, resources)
+            )
+        return await self._acreate(args, kwargs, resources)
+
+    async def _acreate(
+        self,
+        args: list[Any],
+        kwargs: dict[str, Any],
+        resources: ResourceStack | None,
+    ) -> T_co:
+        if self.is_resource:
+            token = current_resources.set(resources)
+            try:
+                return self._enter(*args, **kwargs)
+            finally:
+                current_resources.reset(token)
+        return self.model(*args, **kwargs)  # type: ignore
+
+    def _build(self) -> T_co:
+        if _overrides.get() is not None or _open(_session) is not None:
+            return self._build_overridden()
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        recorder = current_recorder.get()
+        if recorder is not None:
+            return plan.run(recorder)  # type: ignore
+        return plan()  # type: ignore
+
+    def _build_overridden(self) -> T_co:
+        """
+        Builds the composite walking its graph, so overrides of any
+        composite in the graph are applied and the objects of the
+        session are shared with the rest of the resolve.
+        """
+        session = _open(_session)
+        if session is None:
+            session = _Session()
+            token = _session.set(session)
+            try:
+                return self._build_overridden()
+            finally:
+                session.closed = True
+                _session.reset(token)
+
+        _args, _kwargs = self._current_params()
+        args = [self._resolve_shared(arg, session) for arg in _args]
+        kwargs = {
+            key: self._resolve_shared(value, session)
+            for key, value in _kwargs.items()
+        }
+        factory = self._enter if self.is_resource else self.model
+        recorder = current_recorder.get()
+        if recorder is not None:
+            return recorder.construct(self, factory, args, kwargs)
+        return factory(*args, **kwargs)  # type: ignore
+
+    def compile(self, check: bool = True) -> BuildPlan:
+        """
+        Flattens the dependency graph of the composite into a `BuildPlan`
+        that is used by every following resolve.
+
+        Raises `CircularDependencyError` if the graph has a cycle.
+        """
+        if check:
+            check_acyclic([self])
+        plan = self._plan = compile_plan(self)
+        return plan
+
+    def dependencies(self) -> Sequence["Composite"]:
+        """
+        The composites this composite depends on, in argument order.
+        """
+        return [
+            value
+            for value in (*self._args, *self._kwargs.values())
+            if isinstance(value, Composite)
+        ]
+
+    def resource_dependencies(self) -> frozenset[int]:
+        """
+        The ids of the resource composites this composite depends on,
+        directly or through other composites.
+        """
+        resources = self._resources
+        if resources is None:
+            resources = self._resources = frozenset(
+                id(node) for node in walk(self)
+                if node is not self and getattr(node, "is_resource", False)
+            ).union(*(
+                node._deferred_resources() for node in walk(self)
+                if isinstance(node, Composite)
+            ))
+        return resources
+
+    def _deferred_resources(self) -> frozenset[int]:
+        # resources entered after the composite is built, see `Lazy`
+        return frozenset()
+
+    def has_resources(self) -> bool:
+        """
+        Whether building the composite enters any resource.
+        """
+        return self.is_resource or bool(self.resource_dependencies())
+
+    def _enter(self, *args: Any, **kwargs: Any) -> T_co:
+        manager: Any = self.model(*args, **kwargs)  # type: ignore
+        if isinstance(manager, GeneratorType):
+            generator = manager
+            manager = contextmanager(lambda: generator)()
+        owner = self._owner()
+        if owner is None:
+            raise ResourceError(
+                f"{getattr(self.model, '__qualname__', self.model)} is a "
+                "resource, resolve it with a context or inside a Scope"
+            )
+        return owner.enter(self, manager)  # type: ignore
+
+    def _owner(
+        self, resources: ResourceStack | None = None
+    ) -> ResourceStack | None:
+        """
+        The stack that exits the resource: the stack of the process for
+        singletons, otherwise the active scope, the injected call or the
+        resolving context.
+        """
+        if self._lifetime is Lifetime.POOLED:
+            raise ResourceError(
+                "Pooled dependencies can't be resources, "
+                "their objects outlive the scope that checked them out"
+            )
+        if self._lifetime is Lifetime.SINGLETON:
+            return singleton_resources
+        scope = _current_scope.get()
+        if scope is not None:
+            return scope.resources
+        call = call_resources.get()
+        if call is not None:
+            return call
+        if resources is None:
+            resources = current_resources.get()
+        return resources
+
+    def _inlinable(self) -> bool:
+        return (
+            type(self) is Composite
+            and self._lifetime is Lifetime.TRANSIENT
+        )
+
+    def _plan_step(self, slots: dict[int, int]) -> PlanStep:
+        args = []
+        arg_slots = []
+        for position, arg in enumerate(self._args):
+            if isinstance(arg, Composite):
+                arg_slots.append((position, slots[id(arg)]))
+                arg = None
+            elif isinstance(arg, DependencyObject):
+                arg = arg.dependency
+            args.append(arg)
+
+        kwargs = {}
+        kwarg_slots = []
+        for name, value in self._kwargs.items():
+            if isinstance(value, Composite):
+                kwarg_slots.append((name, slots[id(value)]))
+                value = None
+            elif isinstance(value, DependencyObject):
+                value = value.dependency
+            kwargs[name] = value
+
+        return PlanStep(
+            self._enter if self.is_resource else self.model,
+            tuple(args),
+            tuple(arg_slots),
+            kwargs,
+            tuple(kwarg_slots),
+            self,
+        )
 
     def __resolve__(self) -> Any:
         """
@@ -101,18 +871,18 @@ class Composite(Generic[T_co]):
     ) -> Generator[T_co, Any, Any]:
         """
         Override the arguments of the composite.
+
+        The overrides are only seen by the current thread or task,
+        everything resolved inside the block uses them and nested
+        overrides are merged with the outer ones.
         # Usage example:
         ```
         with composite.overrides({"arg1": "value1"}):
             print(composite.args)
         ```
         """
-        try:
-            with self._params_overrides(_overrides):
-                yield self()
-        finally:
-            self._args = self.original_args
-            self._kwargs = self.original_kwargs
+        with self._params_overrides(_overrides):
+            yield self._build()
 
     @property
     def args(self) -> list[T_co | Any]:
@@ -124,8 +894,9 @@ class Composite(Generic[T_co]):
         print(composite.args)
         ```
         """
+        args, _ = self._current_params()
         return [
-            self.resolve_composite(arg) for arg in self._args  # type: ignore
+            self.resolve_composite(arg) for arg in args  # type: ignore
         ]
 
     @property
@@ -138,11 +909,21 @@ class Composite(Generic[T_co]):
         print(composite.kwargs)
         ```
         """
+        _, kwargs = self._current_params()
         return {
             key: self.resolve_composite(value)
-            for key, value in self._kwargs.items()  # type: ignore
+            for key, value in kwargs.items()  # type: ignore
         }
 
+    def _resolve_shared(self, arg: Any, session: dict[int, Any]) -> Any:
+        if isinstance(arg, Composite) and arg.shared:
+            try:
+                return session[id(arg)]
+            except KeyError:
+                instance = session[id(arg)] = arg()
+                return instance
+        return self.resolve_composite(arg)
+
     def resolve_composite(self, arg: Self | Any) -> T_co | Any:
         if isinstance(arg, Composite) or isinstance(arg, DependencyObject):
             return arg()
@@ -185,16 +966,105 @@ class Composite(Generic[T_co]):
     def _params_overrides(
         self, overrides: dict[str, Union[DependencyObject, Self]]
     ) -> Generator[
-        tuple[list[Any], dict[str, Any]], Any, Any
+        tuple[Any, Mapping[str, Any]], Any, Any
     ]:
+        overlay = _overrides.get() or {}
+        token = _overrides.set({
+            **overlay,
+            id(self): {**overlay.get(id(self), {}), **overrides},
+        })
         try:
-            self.original_args = self._args
-            self.original_kwargs = self._kwargs
+            yield self._current_params()
+        finally:
+            _overrides.reset(token)
 
-            self._args = self._override_args(overrides)  # type: ignore
-            self._kwargs = self._override_kwargs(overrides)
+    def _current_params(self) -> tuple[Any, Mapping[str, Any]]:
+        """
+        The arguments of the composite with the active overrides applied.
+        """
+        overlay = _overrides.get()
+        if overlay:
+            overrides = overlay.get(id(self))
+            if overrides:
+                return (
+                    self._override_args(overrides),
+                    self._override_kwargs(overrides),
+                )
+        return self._args, self._kwargs
 
-            yield self.args, self.kwargs
-        finally:
-            self._args = self.original_args
-            self._kwargs = self.original_kwargs
+
+class AsyncComposite(Composite[T_co]):
+    """
+    A composite built by an async factory.
+
+    The factory may be a coroutine function, or return an async context
+    manager when the composite is declared with `AsyncComposite.resource`,
+    in that case the object is entered when built and exited when its
+    owner (`Context.aclose`) is closed.
+    Async composites can only be resolved with `Context.aresolve`
+    or by an injected coroutine function.
+
+    # usage
+    ```
+    async def create_pool(dsn: str) -> Pool:
+        return await asyncpg.create_pool(dsn)
+
+    class ApplicationContext(Context):
+        pool: Composite[Pool] = AsyncComposite.singleton(
+            create_pool, dsn="postgres://"
+        )
+        connection: Composite[Connection] = AsyncComposite.resource(
+            acquire_connection, pool=pool
+        )
+
+    connection = await context.aresolve(Connection)
+    ```
+    """
+    __slots__ = ()
+
+    def __init__(self, model: Callable[..., Any], *args: Any, **kwargs: Any):
+        # the factory isn't the type it builds, it's awaited or entered
+        super().__init__(model, *args, **kwargs)  # type: ignore
+
+    def __call__(self) -> T_co:
+        raise AsyncDependencyError(
+            f"{getattr(self.model, '__qualname__', self.model)} is async, "
+            "resolve it with Context.aresolve"
+        )
+
+    async def _acreate(
+        self,
+        args: list[Any],
+        kwargs: dict[str, Any],
+        resources: ResourceStack | None,
+    ) -> T_co:
+        from inspect import isawaitable
+
+        instance: Any = self.model(*args, **kwargs)  # type: ignore
+        if isinstance(instance, AsyncGeneratorType):
+            generator = instance
+            instance = asynccontextmanager(lambda: generator)()
+        elif isawaitable(instance):
+            instance = await instance
+        if self.is_resource:
+            owner = self._owner(resources)
+            if owner is None:
+                raise AsyncDependencyError(
+                    "Async resources can only be built by a context, "
+                    "resolve them with Context.aresolve"
+                )
+            instance = await owner.aenter(self, instance)
+        return instance  # type: ignore
+
+
+async def aresolve(
+    value: Any, resources: ResourceStack | None = None
+) -> Any:
+    """
+    Resolves any argument or adapter inside an event loop.
+    """
+    if isinstance(value, Composite):
+        return await value.__aresolve__(resources)
+    if isinstance(value, DependencyObject):
+        return value()
+    return value
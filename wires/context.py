@@ -1,11 +1,19 @@
 from typing import (
-    TypeVar, Callable, Type, Any,
+    TypeVar, Callable, Type, Any, Iterable,
     Union, runtime_checkable,
     get_args, get_origin, Generic,
-    Protocol
+    Protocol, Self
 )
-from .composite import Composite, DependencyObject
-import inspect
+from functools import partial
+from threading import Lock
+import os
+from .composite import Composite, DependencyObject, _overrides, aresolve
+from .graph import BatchPlan, check_acyclic, compile_batch, walk
+from .keys import composite_key, port_type
+from .instrumentation import Instrumentation, current_recorder
+from .errors import ResourceError, ValidationError
+from .lifetime import Lifetime
+from .resources import ResourceStack, current_resources
 
 
 __all__ = [
@@ -18,6 +26,7 @@ __all__ = [
 T = TypeVar('T')
 T_co = TypeVar('T_co', covariant=True)
 T_contra = TypeVar('T_contra', contravariant=True)
+G = TypeVar('G')
 
 
 @runtime_checkable
@@ -31,33 +40,389 @@ class Resolvable(Protocol[T_co]):
         ...
 
 
+_tables_lock = Lock()
+
+
+def _reset_tables_lock() -> None:
+    # a table built by another thread while forking is never released
+    global _tables_lock
+    _tables_lock = Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_tables_lock)
+
+
 class Adapter(Generic[T_co]):
     """
     Adapter is an object that was resolved by the Context.
     """
 
+    __slots__ = ("adapter", "composite_key", "factory")
+
     adapter: Resolvable[T_co] | Any
 
     def __init__(self, adapter: type[T_co], composite_key: str):
         self.adapter = adapter
         self.composite_key = composite_key
+        # what resolving the adapter calls, a generated function
+        # when the context uses `codegen`
+        self.factory: Callable[[], T_co] = self.default_factory()
 
         def __resolve__(self) -> T_co | Any:
             if isinstance(self.adapter, Resolvable):
                 return self.adapter.__resolve__()
             return self.adapter
 
+    def default_factory(self) -> Callable[[], T_co]:
+        adapter: Any = self.adapter
+        factory: Callable[[], T_co] = getattr(
+            adapter, "__resolve__", lambda: adapter
+        )
+        return factory
+
+    def with_factory(self, factory: Callable[[], T_co]) -> "Adapter[T_co]":
+        """
+        A copy of the adapter resolved by `factory`.
+        """
+        adapter: Adapter[T_co] = Adapter(
+            self.adapter, self.composite_key  # type: ignore
+        )
+        adapter.factory = factory
+        return adapter
+
+
+class AdapterTable:
+    """
+    The adapters of a context class, computed the first time the class
+    is initialized and shared read-only by all its instances.
+
+    Ports are inherited, the table of a subclass starts from the table
+    of its base and only collects and compiles the ports the subclass
+    declares or overrides.
+
+    `owned` holds the keys of the adapters that build resources, their
+    factories resolve on behalf of a context instance, so each instance
+    gets its own copy of them, see `Context.close`.
+    """
+
+    def __init__(self):
+        self.adapters: dict[str, Adapter] = {}
+        self.ports: dict[Any, Adapter] = {}
+        self.names: dict[str, Adapter] = {}
+        self.owned: frozenset[str] = frozenset()
+        self.batches: dict[tuple, "Batch"] = {}
+        self.groups: dict[type, dict[str, Any]] = {}
+
+    @classmethod
+    def of(cls, context: "Context") -> "AdapterTable":
+        """
+        The table of the class of `context`, built on first use.
+        """
+        table = type(context).__dict__.get("_adapter_table")
+        if table is None:
+            with _tables_lock:
+                table = cls._of_class(type(context), context.composite_key)
+        return table
+
+    @classmethod
+    def _of_class(
+        cls,
+        context_type: type["Context"],
+        composite_key: Callable[[Any], str | None],
+    ) -> "AdapterTable":
+        # called holding `_tables_lock`
+        table: AdapterTable | None = context_type.__dict__.get(
+            "_adapter_table"
+        )
+        if table is not None:
+            return table
+
+        table = cls()
+        base = _derivable_base(context_type)
+        if base is None:
+            added = table.collect(
+                context_type, context_annotations(context_type), composite_key
+            )
+        else:
+            added = table.derive(
+                cls._of_class(base, composite_key), context_type, composite_key
+            )
+        table.compile(context_type.codegen, added)
+        context_type._adapter_table = table  # type: ignore
+        return table
+
+    def collect(
+        self,
+        context_type: type,
+        annotations: dict[str, Any],
+        composite_key: Callable[[Any], str | None],
+    ) -> list[Adapter]:
+        """
+        Adds an adapter for every port in `annotations`.
+        """
+        added = []
+        for name, value in annotations.items():
+            if isinstance(get_origin(value), Resolvable):
+                args = get_args(value)
+                port = args[0] if args else value
+                _composite_key = composite_key(port)
+                if _composite_key:
+                    adapter = Adapter(
+                        adapter=getattr(context_type, name),
+                        composite_key=_composite_key
+                    )
+                    self.adapters[str(_composite_key)] = adapter
+                    self.ports[port] = adapter
+                    self.ports[port_type(port)] = adapter
+                    self.names[name] = adapter
+                    added.append(adapter)
+        return added
+
+    def derive(
+        self,
+        base: "AdapterTable",
+        context_type: type,
+        composite_key: Callable[[Any], str | None],
+    ) -> list[Adapter]:
+        """
+        Starts from the table of the base class, collecting again only
+        the ports the class declares or whose value it overrides.
+        """
+        import inspect
+
+        own = inspect.get_annotations(context_type)
+        changed = set(own) | {
+            name for name in base.names if name in context_type.__dict__
+        }
+        replaced = {
+            id(base.names[name]) for name in changed if name in base.names
+        }
+        # inherited adapters are copied, so compiling this table never
+        # touches the factories of the base
+        copies = {
+            id(adapter): adapter.with_factory(adapter.factory)
+            for adapter in base.adapters.values()
+            if id(adapter) not in replaced
+        }
+        self.adapters = {
+            key: copies[id(adapter)]
+            for key, adapter in base.adapters.items()
+            if id(adapter) in copies
+        }
+        self.ports = {
+            port: copies[id(adapter)]
+            for port, adapter in base.ports.copy().items()
+            if id(adapter) in copies
+        }
+        self.names = {
+            name: copies[id(adapter)]
+            for name, adapter in base.names.items()
+            if id(adapter) in copies
+        }
+        annotations = context_annotations(context_type)
+        return self.collect(
+            context_type,
+            {
+                name: annotation for name, annotation in annotations.items()
+                if name in changed
+            },
+            composite_key,
+        )
+
+    def compile(
+        self, codegen: bool = False, adapters: list[Adapter] | None = None
+    ) -> None:
+        """
+        Compiles the build plan of every composite adapter, or only of
+        `adapters`, raises `CircularDependencyError` with the path of
+        the cycle if the graph has one, `StrategyKeyError` if the static
+        key of a strategy, nested or not, matches none of its strategies
+        and `ResourceError` if a singleton or a strategy depends on
+        a pooled composite, see `check_pooled`.
+
+        With `codegen` enabled, a function specialized in resolving
+        each adapter is also generated, see `wires.codegen`.
+        """
+        from .strategy import ContextStrategy
+
+        if adapters is None:
+            adapters = list(self.adapters.values())
+        composites = [
+            adapter.adapter for adapter in adapters
+            if isinstance(adapter.adapter, Composite)
+        ]
+        visited: set[int] = set()
+        check_acyclic(composites, visited)
+        seen: set[int] = set()
+        for composite in composites:
+            for node in walk(composite):
+                if id(node) not in seen and isinstance(node, Composite):
+                    seen.add(id(node))
+                    check_pooled(node)
+                    if isinstance(node, ContextStrategy):
+                        node.check_key()
+        for composite in composites:
+            composite.compile(check=False)
+        self.batches.clear()
+        self.groups.clear()
+        for adapter in adapters:
+            adapter.factory = adapter.default_factory()
+        if codegen:
+            from . import codegen as _codegen
+
+            _codegen.install(adapters)
+        self.owned = frozenset(
+            key for key, adapter in self.adapters.items()
+            if isinstance(adapter.adapter, Composite)
+            and adapter.adapter.has_resources()
+        )
+
+
+def context_annotations(context_type: type) -> dict[str, Any]:
+    """
+    The annotations of a context class merged across its MRO,
+    a class overrides the annotations of its bases.
+    """
+    import inspect
+
+    annotations: dict[str, Any] = {}
+    for klass in reversed(context_type.__mro__):
+        if klass is not object:
+            annotations.update(inspect.get_annotations(klass))
+    return annotations
+
+
+def check_pooled(composite: Composite) -> None:
+    """
+    Raises `ResourceError` if `composite` is a singleton or a strategy
+    that depends on a pooled composite, it would keep the checked out
+    object after the lease returns it to the pool.
+    """
+    from .strategy import ContextStrategy
+
+    if (
+        composite.lifetime is not Lifetime.SINGLETON
+        and not isinstance(composite, ContextStrategy)
+    ):
+        return
+    for node in walk(composite):
+        if isinstance(node, Composite) and node.lifetime is Lifetime.POOLED:
+            raise ResourceError(
+                "Pooled dependencies can't be used by singletons "
+                "or strategies, they'd keep the checked out object"
+            )
+
+
+def _derivable_base(
+    context_type: type["Context"],
+) -> type["Context"] | None:
+    """
+    The base whose table the table of `context_type` can start from,
+    None when it must be collected from the whole MRO.
+    """
+    bases = context_type.__bases__
+    if len(bases) != 1 or bases[0] is Context:
+        # mixins may declare ports too
+        return None
+    base = bases[0]
+    if (
+        not issubclass(base, Context)
+        or base.codegen != context_type.codegen  # type: ignore
+        or base.composite_key is not context_type.composite_key
+    ):
+        return None
+    return base
+
+
+class Batch:
+    """
+    The compiled resolution of a sequence of adapters,
+    see `Context.resolve_many`.
+
+    `plan` builds the composite adapters sharing their dependencies,
+    `picks` maps each adapter to its output of the plan, or to its
+    factory when it isn't a composite. Batches of adapters that don't
+    share any dependency have no plan, each adapter is resolved by
+    its own factory.
+    """
+    __slots__ = ("plan", "picks", "resources")
+
+    def __init__(
+        self,
+        plan: BatchPlan | None,
+        picks: tuple[tuple[int | None, Callable[[], Any]], ...],
+        resources: ResourceStack | None,
+    ):
+        self.plan = plan
+        self.picks = picks
+        self.resources = resources
+
+    def __call__(self) -> list[Any]:
+        plan = self.plan
+        if (
+            plan is None
+            or _overrides.get() is not None
+            or current_recorder.get() is not None
+        ):
+            # walked adapter by adapter, so every construction is
+            # recorded and overrides apply to the whole graph
+            return [factory() for _, factory in self.picks]
+
+        resources = self.resources
+        if resources is None:
+            built = plan()
+        else:
+            token = current_resources.set(resources)
+            try:
+                built = plan()
+            finally:
+                current_resources.reset(token)
+        return [
+            factory() if index is None else built[index]
+            for index, factory in self.picks
+        ]
+
 
 class Context:
+    """
+    Declares the adapters of the ports of an application.
+
+    Resources built while resolving, like open files or connections,
+    are owned by the context unless a `Scope` is active or they're
+    built for an injected call, which exits them when it returns, `close`
+    (or `aclose` for async resources) exits them, also done when the
+    context is used as a context manager:
+
+    ```
+    async with ApplicationContext() as context:
+        connection = await context.aresolve(Connection)
+    ```
+    """
+    instrumentation: Instrumentation | None = None
+    codegen: bool = False
+
     def __init__(self, autoinject: bool = True):
         self.adapters: dict[str, Adapter] = {}
+        self.ports: dict[Any, Adapter] = {}
         self.adapters_initialized = False
         self.autoinject = autoinject
+        self.resources = ResourceStack()
+        self._batches: dict[tuple, Batch] = {}
+        self._groups: dict[type, dict[str, Any]] = {}
+
+    def __reduce__(self) -> Any:
+        # the definition of the context, the class, not what it built
+        from .process import restore_context
+
+        return restore_context, (type(self), self.adapters_initialized)
 
     def resolve_dependencies(
         self,
         model: Callable,
     ) -> dict[str, Any]:
+        import inspect
+
         signature = inspect.signature(model)
         solved_dependencies = {}
 
@@ -71,22 +436,85 @@ class Context:
         return solved_dependencies
 
     def initialize_adapters(self):
-        data = inspect.get_annotations(self.__class__)
-        for key, value in data.items():
-            if isinstance(get_origin(value), Resolvable):
-                args = get_args(value)
-                if args:
-                    composite_key = self.composite_key(args[0])
-                else:
-                    composite_key = self.composite_key(value)
-                if composite_key:
-                    self.adapters[str(composite_key)] = Adapter(
-                        adapter=getattr(self, key),
-                        composite_key=composite_key
-                    )
-
+        """
+        Binds the context to the adapters of its class, the adapters are
+        collected and compiled once per class, see `AdapterTable`.
+        """
+        self._bind(AdapterTable.of(self))
         self.adapters_initialized = True
 
+    def _bind(self, table: AdapterTable) -> None:
+        self._groups = table.groups
+        if not table.owned:
+            self.adapters = table.adapters
+            self.ports = table.ports
+            self._batches = table.batches
+            return
+
+        # adapters that build resources are resolved on behalf of this
+        # instance, everything else is shared with the class
+        copies = {
+            id(adapter): adapter.with_factory(
+                partial(self._owned, adapter.factory)
+            )
+            for key, adapter in table.adapters.items()
+            if key in table.owned
+        }
+        self.adapters = {
+            key: copies.get(id(adapter), adapter)
+            for key, adapter in table.adapters.items()
+        }
+        self.ports = {
+            port: copies.get(id(adapter), adapter)
+            for port, adapter in table.ports.copy().items()
+        }
+        self._batches = {}
+
+    def validate(self) -> None:
+        """
+        Checks the declaration of the context without building anything,
+        raises `ValidationError` with every problem found.
+        """
+        from . import validation
+
+        problems = validation.validate(self)
+        if problems:
+            raise ValidationError(problems)
+
+    def warmup(self, max_workers: int | None = None) -> None:
+        """
+        Validates the context and builds all its singletons, so a broken
+        or slow to build context fails at startup instead of on the
+        first request. Independent singletons are built in parallel.
+        """
+        from . import validation
+
+        validation.warmup(self, max_workers=max_workers)
+
+    async def awarmup(self) -> None:
+        """
+        Like `warmup`, also building async singletons.
+        """
+        from . import validation
+
+        await validation.awarmup(self)
+
+    def compile_adapters(self) -> None:
+        """
+        Compiles the adapters of the class of the context again,
+        see `AdapterTable.compile`.
+        """
+        table = AdapterTable.of(self)
+        table.compile(type(self).codegen)
+        self._bind(table)
+
+    def _owned(self, factory: Callable[[], T]) -> T:
+        token = current_resources.set(self.resources)
+        try:
+            return factory()
+        finally:
+            current_resources.reset(token)
+
     def composite_key(self, port: Type[T]) -> str | None:
         """
         Builds a composite key that represents the type of the dependency
@@ -94,32 +522,227 @@ class Context:
         Some types may have annotations, in that case, the first argument
         is the always the main dependency
         """
+        return composite_key(port)
 
-        args = get_args(port)
-        if args:
-            _port = args[0]
+    def resolve(
+        self,
+        dependency: Type[T_co],
+    ) -> Union[T_co, Any]:
+        adapter: Adapter | None = self.get_adapter(dependency)
+        if adapter is None:
+            return None
+
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            return instrumentation.resolve(
+                self, dependency, adapter.factory
+            )
+        return adapter.factory()
+
+    def resolve_many(self, ports: Iterable[Any]) -> list[Any]:
+        """
+        Resolves several ports at once, returning their objects in order.
+
+        The composites of the ports are built by a single plan, so a
+        dependency shared by several of them is built once per call
+        instead of once per port. Singleton, scoped and pooled
+        dependencies keep their lifetime. The plan of each sequence of
+        ports is compiled on first use.
+
+        ```
+        users, orders = context.resolve_many([UserService, OrderService])
+        ```
+        """
+        ports = tuple(ports)
+        if self.instrumentation is not None:
+            # resolved port by port, so each one is traced
+            return [self.resolve(port) for port in ports]
+
+        try:
+            batch = self._batches.get(ports)
+        except TypeError:
+            batch = self._compile_ports(ports)
         else:
-            _port = port
+            if batch is None:
+                batch = self._batches[ports] = self._compile_ports(ports)
+        return batch()
 
-        if isinstance(_port, type):
-            return f"{_port.__module__}.{_port.__name__}"
-        return None
+    def resolve_adapters(self, adapters: tuple[Adapter, ...]) -> list[Any]:
+        """
+        Resolves several adapters at once, like `resolve_many`.
+        """
+        batch = self._batches.get(adapters)
+        if batch is None:
+            batch = self._batches[adapters] = self.compile_batch(adapters)
+        return batch()
 
-    def resolve(
+    def _compile_ports(self, ports: tuple[Any, ...]) -> Batch:
+        if not self.adapters_initialized:
+            self.initialize_adapters()
+        return self.compile_batch(self.get_adapter(port) for port in ports)
+
+    def resolve_into(self, group: type[G]) -> G:
+        """
+        Resolves the ports annotated in the fields of a named tuple or
+        a dataclass and builds it, like `resolve_many`. Fields whose
+        port has no adapter keep their default value.
+
+        ```
+        class Services(NamedTuple):
+            users: UserService
+            orders: OrderService
+
+        services = context.resolve_into(Services)
+        ```
+        """
+        fields = self._groups.get(group)
+        if fields is None:
+            if not self.adapters_initialized:
+                self.initialize_adapters()
+            fields = self._groups[group] = {
+                name: port for name, port in _group_fields(group).items()
+                if self.get_adapter(port) is not None
+            }
+        values = self.resolve_many(fields.values())
+        return group(**dict(zip(fields, values)))
+
+    def compile_batch(self, adapters: Iterable[Adapter | None]) -> Batch:
+        """
+        Compiles the resolution of a sequence of adapters,
+        see `resolve_many`.
+        """
+        composites: list[Composite] = []
+        outputs: dict[int, int] = {}
+        picks: list[tuple[int | None, Callable[[], Any]]] = []
+        for adapter in adapters:
+            if adapter is None:
+                picks.append((None, _none))
+            elif isinstance(adapter.adapter, Composite):
+                composite = adapter.adapter
+                index = outputs.setdefault(id(composite), len(composites))
+                if index == len(composites):
+                    composites.append(composite)
+                picks.append((index, adapter.factory))
+            else:
+                picks.append((None, adapter.factory))
+
+        plan: BatchPlan | None = compile_batch(composites)
+        separate = sum(
+            len(compile_batch([composite])) for composite in composites
+        )
+        if len(plan) == separate:  # type: ignore
+            # nothing is shared, the factories of the adapters
+            # are faster than a plan (see `codegen`)
+            plan = None
+        return Batch(
+            plan,
+            tuple(picks),
+            self.resources if any(
+                composite.has_resources() for composite in composites
+            ) else None,
+        )
+
+    async def aresolve(
         self,
         dependency: Type[T_co],
     ) -> Union[T_co, Any]:
+        """
+        Resolves a dependency inside an event loop, async factories are
+        awaited and independent dependencies are built concurrently.
+
+        Async resources are owned by the context and exited by `aclose`.
+        """
         adapter: Adapter | None = self.get_adapter(dependency)
         if adapter is None:
             return None
 
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            return await instrumentation.aresolve(
+                self, dependency, lambda: self.aresolve_adapter(adapter)
+            )
+        return await self.aresolve_adapter(adapter)
+
+    async def aresolve_adapter(self, adapter: "Adapter") -> Any:
+        if isinstance(adapter.adapter, (Composite, DependencyObject)):
+            token = current_resources.set(self.resources)
+            try:
+                return await aresolve(adapter.adapter, self.resources)
+            finally:
+                current_resources.reset(token)
         return adapter.adapter.__resolve__()
 
+    def close(self) -> None:
+        """
+        Exits every resource owned by this context, each one after the
+        resources that depend on it.
+
+        Raises `ResourceError` if async resources are left, those can
+        only be exited by `aclose`.
+        """
+        self.resources.close()
+
+    async def aclose(self) -> None:
+        """
+        Exits every resource owned by this context, sync or async,
+        resources that don't depend on each other are exited concurrently.
+        """
+        await self.resources.aclose()
+
+    def __enter__(self) -> Self:
+        if not self.adapters_initialized:
+            self.initialize_adapters()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
     def get_adapter(
         self, port: type[T]
     ) -> Adapter[T] | None:
-        composite_key = self.composite_key(port)
-        if composite_key in self.adapters:
-            return self.adapters[composite_key]
-        return None
+        """
+        Finds the adapter of a port, ports are looked up by identity
+        first and by their composite key as a fallback.
+        """
+        try:
+            return self.ports[port]
+        except KeyError:
+            pass
+        except TypeError:
+            return self.adapters.get(self.composite_key(port))  # type: ignore
+
+        adapter = self.adapters.get(self.composite_key(port))  # type: ignore
+        if adapter is not None:
+            self.ports[port] = adapter
+        return adapter
+
+
+def _none() -> None:
+    return None
+
+
+def _group_fields(group: type) -> dict[str, Any]:
+    """
+    The ports of the fields of a named tuple or a dataclass, by name.
+    """
+    import dataclasses
+    from typing import get_type_hints
 
+    if dataclasses.is_dataclass(group):
+        names = [
+            field.name for field in dataclasses.fields(group) if field.init
+        ]
+    elif issubclass(group, tuple) and hasattr(group, "_fields"):
+        names = list(group._fields)
+    else:
+        raise TypeError(
+            f"{group.__qualname__} is not a named tuple or a dataclass"
+        )
+    hints = get_type_hints(group, include_extras=True)
+    return {name: hints[name] for name in names}
@@ -1,22 +1,497 @@
-from threading import current_thread
-from typing import Generic, TypeVar
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from threading import Lock, current_thread, local
+from typing import Any, Callable, Generic, Hashable, Protocol, TypeVar
+import time
+
+from .fork import track
 
 
 T = TypeVar('T')
 
+_MISSING: Any = object()
+
+
+class RegistryScope:
+    """
+    Isolates the contexts created while the scope is active.
+
+    Contexts created inside the scope are closed and discarded when it
+    exits, contexts with async resources need `async with`.
+
+    # usage
+    ```
+    async def handle(request):
+        async with ContextRegistry.scope():
+            return await handler(request)
+    ```
+    """
+
+    def __init__(self, registry: "ContextVarRegistry"):
+        self.registry = registry
+        self._tokens: list[tuple[ContextVar, Token]] = []
+
+    def __enter__(self) -> "RegistryScope":
+        contexts = self.registry.contexts
+        self._tokens.append((contexts, contexts.set({})))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        for context in self._exit():
+            close = getattr(context, "close", None)
+            if close is not None:
+                close()
+
+    async def __aenter__(self) -> "RegistryScope":
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        for context in self._exit():
+            aclose = getattr(context, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def _exit(self) -> list[Any]:
+        # the registry replaces its variable in the child of a fork
+        variable, token = self._tokens.pop()
+        contexts = variable.get() or {}
+        variable.reset(token)
+        return list(contexts.values())
+
+
+class RegistryBackend(Protocol):
+    """
+    Storage used by `ContextRegistry` to keep the context instances.
+    """
+    def get_instance(self, context: type[T]) -> T:
+        ...
+
+    def scope(self) -> Any:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class ContextVarRegistry:
+    """
+    Keeps one context per `contextvars` context, which means one per
+    asyncio task and one per thread.
+
+    Tasks inherit the contexts that already existed when they were
+    created and the contexts they create are only seen by themselves,
+    contexts are released together with the task or thread that
+    created them.
+    """
+
+    def __init__(self):
+        self.contexts: ContextVar[dict[type, Any] | None] = ContextVar(
+            "wires_contexts", default=None
+        )
+        track(self)
+
+    def get_instance(self, context: type[T]) -> T:
+        contexts = self.contexts.get()
+        if contexts is not None:
+            instance: T | None = contexts.get(context)
+            if instance is not None:
+                return instance
+
+        instance = context()
+        # copy on write, the dict may be shared with a parent task
+        self.contexts.set({**(contexts or {}), context: instance})
+        return instance
+
+    def scope(self) -> RegistryScope:
+        return RegistryScope(self)
+
+    def clear(self) -> None:
+        self.contexts.set(None)
+
+    def _after_fork(self) -> None:
+        # a new variable hides the contexts of the parent in every
+        # contextvars context, setting the old one only clears one
+        self.contexts = ContextVar("wires_contexts", default=None)
+
+
+class ThreadRegistry:
+    """
+    Keeps one context per thread.
+
+    Contexts are stored in thread local storage, so they are released
+    when their thread exits and reused thread idents never see the
+    context of a previous thread.
+    """
+
+    def __init__(self):
+        self.local = local()
+        track(self)
+
+    def get_instance(self, context: type[T]) -> T:
+        contexts = getattr(self.local, "contexts", None)
+        if contexts is None:
+            contexts = self.local.contexts = {}
+
+        instance = contexts.get(context)
+        if instance is None:
+            instance = contexts[context] = context()
+        return instance
+
+    def scope(self) -> "ThreadRegistryScope":
+        return ThreadRegistryScope(self)
+
+    def clear(self) -> None:
+        self.local.contexts = {}
+
+    def _after_fork(self) -> None:
+        self.local = local()
+
+
+class ThreadRegistryScope:
+    """
+    Discards the contexts of the current thread when the scope exits.
+    """
+
+    def __init__(self, registry: ThreadRegistry):
+        self.registry = registry
+
+    def __enter__(self) -> "ThreadRegistryScope":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.registry.clear()
+
+
+class RegistryStats:
+    """
+    What happened to the contexts of a `BoundedRegistry`.
+
+    `hits` counts lookups served by an existing context, `misses` the
+    ones that built a new context, `evictions` the contexts dropped to
+    respect the bound and `expired` the ones dropped by their ttl.
+    Hits are counted without locking, so they may be slightly
+    undercounted when many threads look contexts up at once.
+    """
+    __slots__ = ("hits", "misses", "evictions", "expired", "teardown_errors")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.teardown_errors = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.lookups
+        return self.hits / lookups if lookups else 0.0
+
+    def merge(self, other: "RegistryStats") -> None:
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "teardown_errors": self.teardown_errors,
+        }
+
+
+class _Entry:
+    __slots__ = ("instance", "created", "lock", "used", "dropped")
+
+    def __init__(self):
+        self.instance: Any = _MISSING
+        self.created = 0.0
+        self.lock = Lock()
+        # set by every hit, gives the entry a second chance on eviction
+        self.used = False
+        # set when building the context failed, callers waiting for
+        # the entry look the context up again
+        self.dropped = False
+
+
+class _Stripe:
+    __slots__ = ("lock", "entries", "capacity", "stats")
+
+    def __init__(self, capacity: int):
+        self.lock = Lock()
+        self.entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.capacity = capacity
+        self.stats = RegistryStats()
+
+
+class BoundedRegistry:
+    """
+    Keeps one context per partition, by default per thread, in a shared
+    table of at most `max_size` contexts.
+
+    Each context is built once per partition even when threads race for
+    it. Lookups of existing contexts don't take any lock, the rest
+    only lock one of the `stripes` the table is split in. When a stripe
+    is full its least recently used context is evicted, contexts older
+    than `ttl` seconds are evicted when looked up, evicted contexts are
+    closed with `teardown` (`Context.close` by default).
+
+    ```
+    ContextRegistry.use(BoundedRegistry(max_size=256, ttl=600))
+    ```
+
+    Recency is tracked like a clock cache, a used context is moved to the
+    end of its stripe instead of being evicted, and the bound is split
+    evenly between the stripes, so eviction only approximates the least
+    recently used context of the whole table. A context
+    is closed when evicted even if its partition still uses it, the
+    bound should be above the number of partitions used at once.
+    `partition` computes the partition of the caller, like the id of a
+    tenant, contexts of every partition share the same bound.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float | None = None,
+        stripes: int = 16,
+        partition: Callable[[], Hashable] | None = None,
+        teardown: Callable[[Any], Any] | None = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        stripes = min(stripes, max_size)
+        size, remainder = divmod(max_size, stripes)
+        self.max_size = max_size
+        self.ttl = ttl
+        # unlike thread idents, thread objects are never reused,
+        # the key of a context holds the thread object of its partition
+        self.partition = partition or current_thread
+        self.teardown = teardown or _close
+        self._stripes = tuple(
+            _Stripe(size + (index < remainder))
+            for index in range(stripes)
+        )
+        self._created: ContextVar[list[Hashable] | None] = ContextVar(
+            "wires_bounded_registry_scope", default=None
+        )
+        track(self)
+
+    def get_instance(self, context: type[T]) -> T:
+        key = (context, self.partition())
+        stripes = self._stripes
+        stripe = stripes[hash(key) % len(stripes)]
+        entry = stripe.entries.get(key)
+        if entry is not None:
+            instance: T = entry.instance
+            if instance is not _MISSING and (
+                self.ttl is None
+                or time.monotonic() - entry.created <= self.ttl
+            ):
+                entry.used = True
+                stripe.stats.hits += 1
+                return instance
+        return self._lookup(stripe, key, context)
+
+    def _lookup(self, stripe: _Stripe, key: Hashable, context: type[T]) -> T:
+        expired = None
+        with stripe.lock:
+            entries = stripe.entries
+            entry = entries.get(key)
+            if entry is not None:
+                instance: T = entry.instance
+                if instance is _MISSING:
+                    # being built by another thread
+                    stripe.stats.hits += 1
+                elif (
+                    self.ttl is not None
+                    and time.monotonic() - entry.created > self.ttl
+                ):
+                    del entries[key]
+                    stripe.stats.expired += 1
+                    expired = instance
+                    entry = None
+                else:
+                    stripe.stats.hits += 1
+                    return instance
+            if entry is None:
+                entry = entries[key] = _Entry()
+                stripe.stats.misses += 1
+
+        if expired is not None:
+            self._teardown(stripe, [expired])
+        return self._build(stripe, key, entry, context)
+
+    def _build(
+        self,
+        stripe: _Stripe,
+        key: Hashable,
+        entry: _Entry,
+        context: type[T],
+    ) -> T:
+        with entry.lock:
+            instance: T = entry.instance
+            if instance is not _MISSING:
+                return instance
+            if entry.dropped:
+                return self.get_instance(context)
+            try:
+                instance = context()
+            except BaseException:
+                entry.dropped = True
+                with stripe.lock:
+                    if stripe.entries.get(key) is entry:
+                        del stripe.entries[key]
+                raise
+            entry.created = time.monotonic()
+            entry.instance = instance
+
+        created = self._created.get()
+        if created is not None:
+            created.append(key)
+
+        evicted = []
+        with stripe.lock:
+            entries = stripe.entries
+            # every entry gets a second chance at most once,
+            # contexts still being built are never evicted
+            for _ in range(2 * len(entries)):
+                if len(entries) <= stripe.capacity:
+                    break
+                candidate, oldest = next(iter(entries.items()))
+                if oldest.used or oldest.instance is _MISSING:
+                    oldest.used = False
+                    entries.move_to_end(candidate)
+                else:
+                    del entries[candidate]
+                    evicted.append(oldest.instance)
+                    stripe.stats.evictions += 1
+        self._teardown(stripe, evicted)
+        return instance
+
+    def _teardown(self, stripe: _Stripe, instances: list[Any]) -> None:
+        # called without holding the lock of the stripe,
+        # closing a context may take long
+        for instance in instances:
+            try:
+                self.teardown(instance)
+            except Exception:
+                with stripe.lock:
+                    stripe.stats.teardown_errors += 1
+
+    def discard(self, keys: list[Hashable]) -> None:
+        """
+        Evicts the contexts of the given `(context type, partition)` keys.
+        """
+        for key in keys:
+            stripe = self._stripes[hash(key) % len(self._stripes)]
+            with stripe.lock:
+                entry = stripe.entries.pop(key, None)
+            if entry is not None and entry.instance is not _MISSING:
+                self._teardown(stripe, [entry.instance])
+
+    @property
+    def stats(self) -> RegistryStats:
+        """
+        The stats of every stripe merged.
+        """
+        stats = RegistryStats()
+        for stripe in self._stripes:
+            with stripe.lock:
+                stats.merge(stripe.stats)
+        return stats
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def scope(self) -> "BoundedRegistryScope":
+        return BoundedRegistryScope(self)
+
+    def clear(self) -> None:
+        """
+        Evicts every context.
+        """
+        for stripe in self._stripes:
+            with stripe.lock:
+                entries, stripe.entries = stripe.entries, OrderedDict()
+            self._teardown(stripe, [
+                entry.instance for entry in entries.values()
+                if entry.instance is not _MISSING
+            ])
+
+    def _after_fork(self) -> None:
+        # the locks of the stripes may be held by threads that don't
+        # exist in the child, the contexts are dropped without closing
+        # them, their resources still belong to the parent
+        self._stripes = tuple(
+            _Stripe(stripe.capacity) for stripe in self._stripes
+        )
+
+
+class BoundedRegistryScope:
+    """
+    Evicts the contexts created while the scope is active when it exits.
+    """
+
+    def __init__(self, registry: BoundedRegistry):
+        self.registry = registry
+        self._tokens: list[Token] = []
+
+    def __enter__(self) -> "BoundedRegistryScope":
+        self._tokens.append(self.registry._created.set([]))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        created = self.registry._created.get() or []
+        self.registry._created.reset(self._tokens.pop())
+        self.registry.discard(created)
+
+
+def _close(context: Any) -> None:
+    close = getattr(context, "close", None)
+    if close is not None:
+        close()
+
 
 class ContextRegistry(Generic[T]):
-    instance_registry: dict[str, T] = {}
+    """
+    Gives each thread or asyncio task its own instance of a context.
+
+    The storage is pluggable, by default contexts are kept per
+    `contextvars` context (`ContextVarRegistry`), `ThreadRegistry`
+    keeps them per thread and `BoundedRegistry` in a bounded table
+    shared by every thread:
+
+    ```
+    ContextRegistry.use(ThreadRegistry())
+    ```
+    """
+    backend: RegistryBackend = ContextVarRegistry()
 
     @classmethod
     def get_instance(cls, context: type[T]) -> T:
-        _current_thread = current_thread()
-        thread_ident = _current_thread.ident if _current_thread else 0
-        ctx_name = context.__name__ if context else "default"
-        ctx_mod = context.__module__ if context else "default"
+        return cls.backend.get_instance(context)
 
-        key = f"{ctx_mod}.{ctx_name}-{thread_ident}"
+    @classmethod
+    def use(cls, backend: RegistryBackend) -> None:
+        cls.backend = backend
 
-        if key not in cls.instance_registry:
-            cls.instance_registry[key] = context()
-        return cls.instance_registry[key]  # type: ignore
+    @classmethod
+    def scope(cls) -> Any:
+        """
+        Opens a scope of the current backend, contexts created inside
+        the scope are discarded when it exits.
+        """
+        return cls.backend.scope()
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.backend.clear()
@@ -0,0 +1,81 @@
+class WiresError(Exception):
+    """
+    Base class for every error raised by wires.
+    """
+
+
+class ScopeError(WiresError):
+    """
+    Raised when a scoped dependency is resolved outside of a `Scope`.
+    """
+
+
+class CircularDependencyError(WiresError):
+    """
+    Raised when the dependency graph of a composite has a cycle.
+
+    `path` holds the composites that form the cycle, the first and
+    the last elements are the same composite.
+    """
+
+    def __init__(self, path: list):
+        self.path = path
+        super().__init__(
+            "Circular dependency: " + " -> ".join(
+                getattr(
+                    getattr(node, "model", node), "__qualname__", repr(node)
+                )
+                for node in path
+            )
+        )
+
+
+class AsyncDependencyError(WiresError):
+    """
+    Raised when a dependency that must be awaited is resolved
+    synchronously, or an async resource is built without an owner.
+    """
+
+
+class StrategyKeyError(WiresError, KeyError):
+    """
+    Raised when the key of a `ContextStrategy` matches none of its
+    strategies.
+    """
+
+
+class ValidationError(WiresError):
+    """
+    Raised by `Context.validate` and `Context.warmup` with every
+    problem found in the context, see `wires.validation.Problem`.
+    """
+
+    def __init__(self, problems: list):
+        self.problems = problems
+        super().__init__(
+            f"{len(problems)} problem(s) found:\n" + "\n".join(
+                f"  - {problem}" for problem in problems
+            )
+        )
+
+
+class PoolExhaustedError(WiresError):
+    """
+    Raised when every object of a pool is checked out and none is
+    returned before the timeout, or right away for non blocking pools.
+    """
+
+
+class ResourceError(WiresError):
+    """
+    Raised when a resource is built without an owner to close it,
+    an async resource is closed synchronously, or a singleton or
+    a strategy depends on a pooled composite.
+    """
+
+
+class ForkError(WiresError):
+    """
+    Raised when the child process of a fork resets an object it shares
+    read-only with its parent, see `ForkPolicy.SHARED`.
+    """
@@ -0,0 +1,101 @@
+"""
+Keeps wires usable in the child processes of `os.fork`, like the workers
+of a pre-fork server or of a `ProcessPoolExecutor` using the fork start
+method.
+
+A child process only has the thread that forked, locks held by other
+threads are never released and objects like sockets or connections are
+shared with the parent. After a fork the child:
+
+- replaces the locks of singleton and pooled composites,
+- drops every context kept by the registries, without closing them,
+  closing a connection in the child would close it for the parent too,
+- drops or rebuilds what composites keep, following their `ForkPolicy`.
+"""
+from enum import Enum
+from typing import Any
+from weakref import WeakSet
+import os
+
+
+class ForkPolicy(Enum):
+    """
+    What the child process of a fork does with the objects a composite
+    keeps, its singleton or its idle pooled objects.
+
+    INHERIT: the child uses the objects of the parent.
+    RESET: the child drops them, the next resolve builds new ones.
+        For sockets, connections, or clients that hold threads or locks.
+    REBUILD: like RESET, and singletons are rebuilt right after the fork,
+        so the first request of a worker doesn't pay for them.
+    SHARED: the singleton is built in the parent before forking and
+        children use it read-only, resetting it in a child raises
+        `ForkError`. For expensive immutable objects, like a loaded model
+        or the configuration, whose memory stays shared copy-on-write.
+    """
+    INHERIT = "inherit"
+    RESET = "reset"
+    REBUILD = "rebuild"
+    SHARED = "shared"
+
+
+# composites and registries that keep state of the process, anything
+# with `_after_fork`, they are dropped from the set with their last use
+_tracked: WeakSet = WeakSet()
+
+
+def track(value: Any) -> None:
+    """
+    Calls `value._after_fork()` in the child process of every fork.
+    """
+    _tracked.add(value)
+
+
+def prepare(freeze: bool = False) -> None:
+    """
+    Builds the singletons with `ForkPolicy.SHARED` that weren't built
+    yet, so children share the objects of the parent.
+
+    It runs before every fork, a pre-fork server can call it once the
+    application is loaded to fail early. With `freeze`, every object is
+    moved to the permanent generation of the garbage collector
+    (`gc.freeze`), so collections in the children don't write to the
+    memory they share with the parent.
+    """
+    for value in list(_tracked):
+        if getattr(value, "fork_policy", None) is ForkPolicy.SHARED:
+            value._prepare_fork()
+    if freeze:
+        import gc
+        gc.freeze()
+
+
+def _before_fork() -> None:
+    for value in list(_tracked):
+        if getattr(value, "fork_policy", None) is ForkPolicy.SHARED:
+            try:
+                value._prepare_fork()
+            except Exception:
+                # built by the children instead, on their first resolve
+                pass
+
+
+def _after_fork_in_child() -> None:
+    tracked = list(_tracked)
+    for value in tracked:
+        value._after_fork()
+    # once everything is reset, a rebuilt singleton may depend
+    # on singletons reset by the loop above
+    for value in tracked:
+        if getattr(value, "fork_policy", None) is ForkPolicy.REBUILD:
+            try:
+                value._rebuild_after_fork()
+            except Exception:
+                # built again by the next resolve, which raises
+                pass
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_before_fork, after_in_child=_after_fork_in_child
+    )
@@ -0,0 +1,260 @@
+from typing import (
+    Any, Callable, Iterable, Iterator, NamedTuple, Protocol, Sequence,
+)
+from .errors import CircularDependencyError
+
+
+class Node(Protocol):
+    """
+    A node of the dependency graph, implemented by `Composite`.
+    """
+    shared: bool
+
+    def dependencies(self) -> Sequence["Node"]:
+        ...
+
+    def _inlinable(self) -> bool:
+        ...
+
+    def _plan_step(self, slots: dict[int, int]) -> "PlanStep":
+        ...
+
+
+class PlanStep(NamedTuple):
+    """
+    A single constructor call of a `BuildPlan`.
+
+    `args` and `kwargs` hold the constant arguments of the call,
+    `arg_slots` and `kwarg_slots` point to the results of previous
+    steps that must be placed at the given position or keyword.
+    `node` is the composite constructed by the step, None when the step
+    resolves a dependency that constructs its own objects.
+    """
+    factory: Callable[..., Any]
+    args: tuple[Any, ...]
+    arg_slots: tuple[tuple[int, int], ...]
+    kwargs: dict[str, Any]
+    kwarg_slots: tuple[tuple[str, int], ...]
+    node: Any = None
+
+
+class BuildPlan:
+    """
+    The dependency graph of a composite flattened in topological order.
+
+    Running the plan calls every step in order, so each dependency
+    is built before the objects that depend on it and resolving a
+    composite doesn't need to walk its graph recursively.
+    """
+
+    def __init__(self, steps: Sequence[PlanStep]):
+        self.steps = tuple(steps)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __call__(self) -> Any:
+        values: list[Any] = []
+        append = values.append
+
+        for factory, args, arg_slots, kwargs, kwarg_slots, _ in self.steps:
+            if arg_slots:
+                _args = list(args)
+                for position, slot in arg_slots:
+                    _args[position] = values[slot]
+                args = _args  # type: ignore
+            if kwarg_slots:
+                kwargs = kwargs.copy()
+                for name, slot in kwarg_slots:
+                    kwargs[name] = values[slot]
+            append(factory(*args, **kwargs))
+
+        return values[-1]
+
+    def run(self, recorder: Any) -> Any:
+        """
+        Runs the plan reporting every construction to `recorder`.
+        """
+        return self.execute(recorder)[-1]
+
+    def execute(self, recorder: Any = None) -> list[Any]:
+        """
+        Runs the plan and returns the result of every step,
+        constructions are reported to `recorder` if given.
+        """
+        values: list[Any] = []
+        append = values.append
+
+        for factory, args, arg_slots, kwargs, kwarg_slots, node in self.steps:
+            if arg_slots:
+                _args = list(args)
+                for position, slot in arg_slots:
+                    _args[position] = values[slot]
+                args = _args  # type: ignore
+            if kwarg_slots:
+                kwargs = kwargs.copy()
+                for name, slot in kwarg_slots:
+                    kwargs[name] = values[slot]
+            if node is None or recorder is None:
+                append(factory(*args, **kwargs))
+            else:
+                append(recorder.construct(node, factory, args, kwargs))
+
+        return values
+
+
+class BatchPlan(BuildPlan):
+    """
+    The graphs of several composites flattened into a single plan.
+
+    Dependencies shared by the composites are built once and passed to
+    every composite that needs them, `outputs` are the steps that build
+    each composite, in the order they were given.
+    """
+
+    def __init__(self, steps: Sequence[PlanStep], outputs: Sequence[int]):
+        super().__init__(steps)
+        self.outputs = tuple(outputs)
+
+    def __call__(self) -> list[Any]:  # type: ignore[override]
+        values = self.execute()
+        return [values[slot] for slot in self.outputs]
+
+
+def find_cycle(
+    roots: Iterable[Node],
+    visited: set[int] | None = None,
+) -> list[Node] | None:
+    """
+    Walks the graph from the given roots and returns the first
+    dependency cycle found, as the path that closes it.
+
+    `visited` can be shared between calls so nodes that were
+    already checked are not walked again.
+    """
+    done = visited if visited is not None else set()
+
+    for root in roots:
+        if id(root) in done:
+            continue
+
+        path: list[Node] = [root]
+        visiting = {id(root)}
+        stack = [iter(root.dependencies())]
+
+        while stack:
+            for child in stack[-1]:
+                key = id(child)
+                if key in visiting:
+                    start = next(
+                        index for index, node in enumerate(path)
+                        if node is child
+                    )
+                    return path[start:] + [child]
+                if key not in done:
+                    path.append(child)
+                    visiting.add(key)
+                    stack.append(iter(child.dependencies()))
+                    break
+            else:
+                node = path.pop()
+                visiting.discard(id(node))
+                done.add(id(node))
+                stack.pop()
+
+    return None
+
+
+def check_acyclic(
+    roots: Iterable[Node],
+    visited: set[int] | None = None,
+) -> None:
+    cycle = find_cycle(roots, visited)
+    if cycle is not None:
+        raise CircularDependencyError(cycle)
+
+
+def compile_plan(root: Node) -> BuildPlan:
+    """
+    Flattens the graph of `root` into a `BuildPlan`.
+
+    Dependencies that can be inlined are turned into steps of the plan,
+    any other dependency (singletons, scoped objects, strategies)
+    becomes a single step that resolves it by calling it. A node reached
+    through several paths gets a single step shared by every dependent,
+    unless it's not `shared`.
+    The graph must be acyclic, see `check_acyclic`.
+    """
+    steps: list[PlanStep] = []
+    _extend_plan(root, steps, {}, expand_root=True)
+    return BuildPlan(steps)
+
+
+def compile_batch(roots: Sequence[Node]) -> BatchPlan:
+    """
+    Flattens the graphs of `roots` into a single `BatchPlan`,
+    every node reachable from more than one root gets a single step.
+
+    Unlike `compile_plan`, roots that can't be inlined are resolved
+    by calling them, so their lifetime is respected.
+    """
+    steps: list[PlanStep] = []
+    slots: dict[int, int] = {}
+    outputs = []
+    for root in roots:
+        _extend_plan(root, steps, slots, expand_root=root._inlinable())
+        outputs.append(slots[id(root)])
+    return BatchPlan(steps, outputs)
+
+
+def _extend_plan(
+    root: Node,
+    steps: list[PlanStep],
+    slots: dict[int, int],
+    expand_root: bool,
+) -> None:
+    stack: list[tuple[Node, bool]] = [(root, False)]
+
+    while stack:
+        node, expanded = stack.pop()
+        key = id(node)
+        if key in slots:
+            continue
+
+        if not node._inlinable() and (node is not root or not expand_root):
+            steps.append(PlanStep(node, (), (), {}, ()))  # type: ignore
+        elif expanded:
+            # unshared dependencies get a new step for every dependent,
+            # the step of a previous dependent can't be reused
+            for child in node.dependencies():
+                if id(child) not in slots:
+                    _extend_plan(child, steps, slots, expand_root=False)
+            steps.append(node._plan_step(slots))
+            for child in node.dependencies():
+                if not child.shared:
+                    slots.pop(id(child), None)
+        else:
+            stack.append((node, True))
+            stack.extend(
+                (child, False)
+                for child in reversed(node.dependencies())
+                if id(child) not in slots
+            )
+            continue
+
+        slots[key] = len(steps) - 1
+
+
+def walk(root: Node) -> Iterator[Node]:
+    """
+    Yields every node reachable from `root`, each one once.
+    """
+    seen = {id(root)}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in node.dependencies():
+            if id(child) not in seen:
+                seen.add(id(child))
+                stack.append(child)
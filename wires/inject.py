@@ -1,33 +1,320 @@
-from .context import Context
 from .context_registry import ContextRegistry
-from .parameters import ParameterOverrider
-from typing import Callable, Any
+from typing import Callable, Any, Mapping, TYPE_CHECKING, get_origin
 import functools
 
+if TYPE_CHECKING:
+    from .context import Context, Adapter
+    from .parameters import ArgumentBinder
+
+# `wires` imports this module eagerly, so everything else is imported
+# when a function is decorated or a plan compiled, not at import time.
+
+
+class InjectionPlan:
+    """
+    Everything `inject` needs to know about a decorated function,
+    computed once instead of on every call.
+
+    The signature is read when the plan is created and the composite
+    keys of the parameters are computed the first time the plan is
+    bound to a context, after that, a call only has to resolve
+    the adapters the caller didn't supply and bind them.
+    """
+
+    def __init__(self, func: Callable):
+        import inspect
+        from .lazy import LazyProxy
+
+        self.func = func
+        self.proxy = LazyProxy
+        # `inspect.Parameter` by name
+        self.parameters: Mapping[str, Any] = (
+            inspect.signature(func).parameters
+        )
+        self.keys: dict[str, str | None] | None = None
+        self.dependencies: list[str] = []
+        self.lazy: frozenset[str] = frozenset()
+        self.binder: ArgumentBinder | None = None
+        self.pooled = False
+        # pooled composites by the key of the dependency reaching them
+        self.pooled_nodes: dict[str, list[Any]] = {}
+        self.resources = False
+        self.batched = False
+
+    def compile(self, context: "Context") -> None:
+        from .composite import Composite
+        from .graph import walk
+        from .lazy import Lazy
+        from .lifetime import Lifetime
+        from .parameters import ArgumentBinder
+
+        keys = {
+            name: context.composite_key(parameter.annotation)
+            for name, parameter in self.parameters.items()
+        }
+        self.dependencies = list({
+            key for key in keys.values()
+            if key is not None and key in context.adapters
+        })
+        # a dependency is only lazy if every parameter asks for it lazily
+        wanted = {
+            keys[name] for name, parameter in self.parameters.items()
+            if get_origin(parameter.annotation) is not Lazy
+        }
+        self.lazy = frozenset(
+            key for key in self.dependencies if key not in wanted
+        )
+        self.binder = ArgumentBinder(self.func, self.parameters, {
+            name: key for name, key in keys.items()
+            if key is not None and key in context.adapters
+        })
+        # calls only open a lease when they may check out pooled objects,
+        # adapters that aren't composites (a `DependencyObject`) never do
+        adapters = [context.adapters[key].adapter for key in self.dependencies]
+        self.pooled_nodes = {}
+        for key, adapter in zip(self.dependencies, adapters):
+            if not isinstance(adapter, Composite):
+                continue
+            nodes = [
+                node for node in walk(adapter)
+                if isinstance(node, Composite)
+                and node.lifetime is Lifetime.POOLED
+            ]
+            if nodes:
+                self.pooled_nodes[key] = nodes
+        self.pooled = bool(self.pooled_nodes)
+        # calls that may build resources exit them when they return
+        self.resources = any(
+            isinstance(adapter, Composite) and adapter.has_resources()
+            for adapter in adapters
+        )
+        # dependencies sharing part of their graph are resolved together,
+        # so what they share is built once per call
+        eager = [key for key in self.dependencies if key not in self.lazy]
+        self.batched = len(eager) > 1 and context.compile_batch(
+            [context.adapters[key] for key in eager]
+        ).plan is not None
+        self.keys = keys
+
+    def unbound_pooled(
+        self, args: tuple, kwargs: dict[str, Any]
+    ) -> list[Any]:
+        """
+        The pooled composites reachable from the dependencies
+        the caller didn't supply, each one once.
+        """
+        binder: ArgumentBinder = self.binder  # type: ignore
+        pooled_nodes = self.pooled_nodes
+        return list({
+            id(node): node
+            for slot in binder.unbound(args, kwargs)
+            for node in pooled_nodes.get(slot.key, ())
+        }.values())
+
+    def bind(
+        self, context: "Context", args: tuple, kwargs: dict[str, Any]
+    ) -> tuple[tuple, dict[str, Any]]:
+        """
+        Resolves the dependencies the caller didn't supply
+        and binds them to the arguments of the call.
+        """
+        if self.keys is None:
+            self.compile(context)
+        binder: ArgumentBinder = self.binder  # type: ignore
+        slots = binder.unbound(args, kwargs)
+        if not slots:
+            return args, kwargs
+        values = self.resolve(
+            context, list(dict.fromkeys(slot.key for slot in slots))
+        )
+        return binder.bind(args, kwargs, slots, values)
+
+    async def abind(
+        self, context: "Context", args: tuple, kwargs: dict[str, Any]
+    ) -> tuple[tuple, dict[str, Any]]:
+        if self.keys is None:
+            self.compile(context)
+        binder: ArgumentBinder = self.binder  # type: ignore
+        slots = binder.unbound(args, kwargs)
+        if not slots:
+            return args, kwargs
+        values = await self.aresolve(
+            context, list(dict.fromkeys(slot.key for slot in slots))
+        )
+        return binder.bind(args, kwargs, slots, values)
+
+    def resolve(
+        self, context: "Context", keys: list[str] | None = None
+    ) -> dict[str, Any]:
+        if self.keys is None:
+            self.compile(context)
+        if keys is None:
+            keys = self.dependencies
+
+        adapters: dict[str, "Adapter"] = context.adapters
+        lazy = self.lazy
+        instrumentation = context.instrumentation
+        if instrumentation is not None:
+            return {
+                key: self.proxy(adapters[key].factory)
+                if key in lazy else instrumentation.resolve(
+                    context, key, adapters[key].factory
+                )
+                for key in keys
+            }
+        if self.batched and len(keys) > 1:
+            eager = [key for key in keys if key not in lazy]
+            resolved = dict(zip(eager, context.resolve_adapters(
+                tuple(adapters[key] for key in eager)
+            )))
+            for key in lazy.intersection(keys):
+                resolved[key] = self.proxy(adapters[key].factory)
+            return resolved
+        return {
+            key: self.proxy(adapters[key].factory)
+            if key in lazy else adapters[key].factory()
+            for key in keys
+        }
+
+    async def aresolve(
+        self, context: "Context", keys: list[str] | None = None
+    ) -> dict[str, Any]:
+        from .composite import _Session, _session, _tasks
+
+        # dependencies shared by several parameters are built once
+        session, tasks = _Session(), _Session()
+        session_token = _session.set(session)
+        tasks_token = _tasks.set(tasks)
+        try:
+            return await self._aresolve(context, keys)
+        finally:
+            tasks.closed = session.closed = True
+            _tasks.reset(tasks_token)
+            _session.reset(session_token)
+
+    async def _aresolve(
+        self, context: "Context", keys: list[str] | None
+    ) -> dict[str, Any]:
+        import asyncio
+
+        if self.keys is None:
+            self.compile(context)
+        if keys is None:
+            keys = self.dependencies
+
+        adapters: dict[str, "Adapter"] = context.adapters
+        lazy = self.lazy
+        dependencies = [key for key in keys if key not in lazy]
+        instrumentation = context.instrumentation
+        if instrumentation is not None:
+            values = await asyncio.gather(*(
+                instrumentation.aresolve(
+                    context,
+                    key,
+                    functools.partial(
+                        context.aresolve_adapter, adapters[key]
+                    ),
+                )
+                for key in dependencies
+            ))
+        else:
+            values = await asyncio.gather(*(
+                context.aresolve_adapter(adapters[key])
+                for key in dependencies
+            ))
+        resolved = dict(zip(dependencies, values))
+        for key in lazy.intersection(keys):
+            resolved[key] = self.proxy(adapters[key].factory)
+        return resolved
+
 
 def inject(
-    context: type[Context]
+    context: type["Context"]
 ):
     def wrapper(
         func: Callable
     ):
-        @functools.wraps(func)
-        def inner(*args, **kwargs) -> Any:
+        import inspect
+        from .pool import Lease
+        from .resources import ResourceStack, call_resources
+
+        plan = InjectionPlan(func)
+
+        def get_context() -> "Context":
             _context = ContextRegistry.get_instance(context)
-            _context.initialize_adapters()
+            if not _context.adapters_initialized:
+                _context.initialize_adapters()
+            if plan.keys is None:
+                plan.compile(_context)
+            return _context
 
-            dependencies = _context.resolve_dependencies(func)
-            parameters = ParameterOverrider(
-                func,
-                default_args=list(args),
-                default_kwargs=kwargs
-            )
-            _args = parameters.override_args(dependencies)
-            _kwargs = parameters.override_kwargs(dependencies)
+        if inspect.iscoroutinefunction(func):
+            async def acall(
+                _context: "Context", args: tuple, kwargs: dict[str, Any]
+            ) -> Any:
+                if plan.resources:
+                    resources = ResourceStack()
+                    token = call_resources.set(resources)
+                    try:
+                        _args, _kwargs = await plan.abind(
+                            _context, args, kwargs
+                        )
+                        return await func(*_args, **_kwargs)
+                    finally:
+                        call_resources.reset(token)
+                        await resources.aclose()
+
+                _args, _kwargs = await plan.abind(_context, args, kwargs)
+
+                return await func(
+                    *_args,
+                    **_kwargs
+                )
+
+            @functools.wraps(func)
+            async def ainner(*args, **kwargs) -> Any:
+                _context = get_context()
+                if plan.pooled:
+                    # arguments supplied by the caller don't take a slot
+                    pooled = plan.unbound_pooled(args, kwargs)
+                    if pooled:
+                        with Lease() as lease:
+                            # waiting for a pool mustn't block the event loop
+                            await lease.acheckout(pooled)
+                            return await acall(_context, args, kwargs)
+                return await acall(_context, args, kwargs)
+            ainner.__injection_plan__ = plan  # type: ignore
+            return ainner
+
+        def call(
+            _context: "Context", args: tuple, kwargs: dict[str, Any]
+        ) -> Any:
+            # resources built for the call are exited when it returns,
+            # before its pooled objects are returned
+            if plan.resources:
+                resources = ResourceStack()
+                token = call_resources.set(resources)
+                try:
+                    _args, _kwargs = plan.bind(_context, args, kwargs)
+                    return func(*_args, **_kwargs)
+                finally:
+                    call_resources.reset(token)
+                    resources.close()
+
+            _args, _kwargs = plan.bind(_context, args, kwargs)
 
             return func(
                 *_args,
                 **_kwargs
             )
+
+        @functools.wraps(func)
+        def inner(*args, **kwargs) -> Any:
+            _context = get_context()
+            if plan.pooled:
+                with Lease():
+                    return call(_context, args, kwargs)
+            return call(_context, args, kwargs)
+        inner.__injection_plan__ = plan  # type: ignore
         return inner
     return wrapper
@@ -0,0 +1,263 @@
+from collections import deque
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Awaitable, Callable, TypeVar
+import time
+
+
+T = TypeVar('T')
+
+BeforeResolve = Callable[[Any, Any], None]
+AfterResolve = Callable[[Any, Any, Any, float], None]
+
+
+class Span:
+    """
+    Time spent resolving a port or constructing one object,
+    `children` holds the spans that happened inside of it.
+    """
+    # a plain slotted class, `dataclasses` would import `inspect`
+    # and this module is imported by every composite
+    __slots__ = ("name", "start_ns", "duration_ns", "children")
+
+    def __init__(
+        self,
+        name: str,
+        start_ns: int,
+        duration_ns: int = 0,
+        children: list["Span"] | None = None,
+    ):
+        self.name = name
+        self.start_ns = start_ns
+        self.duration_ns = duration_ns
+        self.children: list[Span] = [] if children is None else children
+
+    def __repr__(self) -> str:
+        return (
+            f"Span(name={self.name!r}, start_ns={self.start_ns}, "
+            f"duration_ns={self.duration_ns}, "
+            f"children={len(self.children)})"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ns": self.duration_ns,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class AdapterStats:
+    """
+    How many objects of a composite were constructed
+    and the time spent constructing them.
+    """
+    __slots__ = ("constructions", "total_ns")
+
+    def __init__(self, constructions: int = 0, total_ns: int = 0):
+        self.constructions = constructions
+        self.total_ns = total_ns
+
+    def __repr__(self) -> str:
+        return (
+            f"AdapterStats(constructions={self.constructions}, "
+            f"total_ns={self.total_ns})"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "constructions": self.constructions,
+            "total_ns": self.total_ns,
+        }
+
+
+def label(node: Any) -> str:
+    model = getattr(node, "model", node)
+    name = getattr(model, "__qualname__", None)
+    if name is None:
+        return repr(model)
+    return f"{getattr(model, '__module__', '')}.{name}"
+
+
+class Recorder:
+    """
+    Records constructions while an instrumented resolve is running,
+    it's only visible to the thread or task that is resolving.
+    """
+    __slots__ = ("instrumentation",)
+
+    def __init__(self, instrumentation: "Instrumentation"):
+        self.instrumentation = instrumentation
+
+    def construct(
+        self,
+        node: Any,
+        factory: Callable[..., T],
+        args: Any,
+        kwargs: dict[str, Any],
+    ) -> T:
+        name = label(node)
+        token = self.instrumentation._open_span(name)
+        start = time.perf_counter_ns()
+        try:
+            return factory(*args, **kwargs)
+        finally:
+            self.instrumentation._close(name, start, token)
+
+    async def aconstruct(
+        self, node: Any, construct: Callable[[], Awaitable[T]]
+    ) -> T:
+        name = label(node)
+        token = self.instrumentation._open_span(name)
+        start = time.perf_counter_ns()
+        try:
+            return await construct()
+        finally:
+            self.instrumentation._close(name, start, token)
+
+
+# Recorder of the resolve running in the current thread or task,
+# None when nothing is instrumented so composites only pay one lookup.
+current_recorder: ContextVar[Recorder | None] = ContextVar(
+    "wires_recorder", default=None
+)
+_current_span: ContextVar[Span | None] = ContextVar(
+    "wires_span", default=None
+)
+
+
+class Instrumentation:
+    """
+    Observes how a context resolves its dependencies.
+
+    - `before_resolve` hooks are called with `(context, port)` before
+      a port is resolved and `after_resolve` hooks with
+      `(context, port, instance, duration_ns)` after it.
+    - `stats` counts the objects constructed by each composite and the
+      time spent constructing them.
+    - with `spans=True`, every resolve records a tree of spans, the last
+      `max_traces` trees are kept in `traces`.
+
+    Instrumentation is disabled by default and costs a single attribute
+    check per resolve, it's enabled for every instance of a context
+    or for a single instance:
+
+    ```
+    ApplicationContext.instrumentation = Instrumentation(spans=True)
+    context.resolve(Controller)
+    tracer.export(ApplicationContext.instrumentation.export())
+    ```
+    """
+
+    def __init__(self, spans: bool = False, max_traces: int = 100):
+        self.spans = spans
+        self.before_resolve: list[BeforeResolve] = []
+        self.after_resolve: list[AfterResolve] = []
+        self.stats: dict[str, AdapterStats] = {}
+        self.traces: deque[Span] = deque(maxlen=max_traces)
+        self.recorder = Recorder(self)
+        self._lock = Lock()
+
+    def resolve(
+        self, context: Any, port: Any, resolve: Callable[[], T]
+    ) -> T:
+        for hook in self.before_resolve:
+            hook(context, port)
+
+        token = current_recorder.set(self.recorder)
+        span_token = self._open_trace(port)
+        start = time.perf_counter_ns()
+        try:
+            instance = resolve()
+        finally:
+            duration = time.perf_counter_ns() - start
+            self._close_trace(duration, span_token)
+            current_recorder.reset(token)
+
+        for after in self.after_resolve:
+            after(context, port, instance, duration)
+        return instance
+
+    async def aresolve(
+        self,
+        context: Any,
+        port: Any,
+        resolve: Callable[[], Awaitable[T]],
+    ) -> T:
+        for hook in self.before_resolve:
+            hook(context, port)
+
+        token = current_recorder.set(self.recorder)
+        span_token = self._open_trace(port)
+        start = time.perf_counter_ns()
+        try:
+            instance = await resolve()
+        finally:
+            duration = time.perf_counter_ns() - start
+            self._close_trace(duration, span_token)
+            current_recorder.reset(token)
+
+        for after in self.after_resolve:
+            after(context, port, instance, duration)
+        return instance
+
+    def export(self) -> dict[str, Any]:
+        """
+        The stats and traces as plain data.
+        """
+        with self._lock:
+            return {
+                "stats": {
+                    name: stats.to_dict()
+                    for name, stats in self.stats.items()
+                },
+                "traces": [trace.to_dict() for trace in self.traces],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.traces.clear()
+
+    def _open_trace(self, port: Any) -> Any:
+        if not self.spans:
+            return None
+        name = port if isinstance(port, str) else label(port)
+        span = Span(name, time.perf_counter_ns())
+        return _current_span.set(span), span
+
+    def _close_trace(self, duration: int, token: Any) -> None:
+        if token is None:
+            return
+        span_token, span = token
+        span.duration_ns = duration
+        _current_span.reset(span_token)
+        parent = _current_span.get()
+        if parent is not None:
+            parent.children.append(span)
+        else:
+            self.traces.append(span)
+
+    def _open_span(self, name: str) -> Any:
+        if not self.spans:
+            return None
+        span = Span(name, time.perf_counter_ns())
+        parent = _current_span.get()
+        if parent is not None:
+            parent.children.append(span)
+        return _current_span.set(span), span
+
+    def _close(self, name: str, start: int, token: Any) -> None:
+        duration = time.perf_counter_ns() - start
+        if token is not None:
+            span_token, span = token
+            span.duration_ns = duration
+            _current_span.reset(span_token)
+
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = AdapterStats()
+            stats.constructions += 1
+            stats.total_ns += duration
@@ -0,0 +1,42 @@
+from typing import Any, get_args
+
+
+_composite_keys: dict[Any, str | None] = {}
+
+
+def port_type(port: Any) -> type | None:
+    """
+    The type a port annotation stands for.
+
+    Some types may have annotations (`Composite[Port]`, `type[Port]`,
+    `Annotated[Port, ...]`), in that case, the first argument
+    is the always the main dependency
+    """
+    args = get_args(port)
+    _port = args[0] if args else port
+
+    if isinstance(_port, type):
+        return _port
+    return None
+
+
+def _composite_key(port: Any) -> str | None:
+    _port = port_type(port)
+    if _port is None:
+        return None
+    return f"{_port.__module__}.{_port.__name__}"
+
+
+def composite_key(port: Any) -> str | None:
+    """
+    Builds a composite key that represents the type of the dependency,
+    keys are cached by annotation.
+    """
+    try:
+        return _composite_keys[port]
+    except KeyError:
+        key = _composite_keys[port] = _composite_key(port)
+        return key
+    except TypeError:
+        # unhashable annotations, e.g. Annotated with a dict
+        return _composite_key(port)
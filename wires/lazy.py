@@ -0,0 +1,171 @@
+from typing import Any, Callable, Generic, Iterator, Sequence, TypeVar
+from .composite import Composite, DependencyObject
+from .resources import ResourceStack, call_resources, current_resources
+from .scope import Scope, _current_scope
+
+
+T = TypeVar('T')
+
+_MISSING: Any = object()
+
+
+class LazyProxy(Generic[T]):
+    """
+    Stands in for an object that is only built on first use.
+
+    Attribute access, calls and the common operators are forwarded to the
+    object, which is built the first time any of them is used.
+    If two threads use the proxy for the first time at the same moment,
+    both may build the object and only one of them is kept.
+    """
+    __slots__ = ("_factory", "_instance")
+
+    def __init__(self, factory: Callable[[], T]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", _MISSING)
+
+    def __resolve__(self) -> T:
+        instance: T = object.__getattribute__(self, "_instance")
+        if instance is _MISSING:
+            instance = object.__getattribute__(self, "_factory")()
+            object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property  # type: ignore
+    def __class__(self) -> type:  # type: ignore
+        return self.__resolve__().__class__
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__resolve__(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.__resolve__(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self.__resolve__(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.__resolve__()(*args, **kwargs)  # type: ignore
+
+    def __repr__(self) -> str:
+        instance = object.__getattribute__(self, "_instance")
+        if instance is _MISSING:
+            factory = object.__getattribute__(self, "_factory")
+            return f"<LazyProxy of {factory!r}>"
+        return repr(instance)
+
+    def __str__(self) -> str:
+        return str(self.__resolve__())
+
+    def __bool__(self) -> bool:
+        return bool(self.__resolve__())
+
+    def __eq__(self, other: Any) -> bool:
+        return self.__resolve__() == unwrap(other)  # type: ignore
+
+    def __ne__(self, other: Any) -> bool:
+        return self.__resolve__() != unwrap(other)  # type: ignore
+
+    def __hash__(self) -> int:
+        return hash(self.__resolve__())
+
+    def __len__(self) -> int:
+        return len(self.__resolve__())  # type: ignore
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__resolve__())  # type: ignore
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.__resolve__()  # type: ignore
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.__resolve__()[key]  # type: ignore
+
+    def __enter__(self) -> Any:
+        return self.__resolve__().__enter__()  # type: ignore
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        return self.__resolve__().__exit__(*exc_info)  # type: ignore
+
+
+class Lazy(Composite[T], Generic[T]):
+    """
+    Defers building a dependency until it's used.
+
+    As an argument of a composite, the dependency is passed as a
+    `LazyProxy` that builds it on first use, or never if it isn't used.
+    As an annotation of an injected function, `Lazy[Port]` injects
+    a proxy of the adapter of `Port`.
+
+    # usage
+    ```
+    class ApplicationContext(Context):
+        logger: Composite[Logger] = Composite(FileLogger)
+        service: Composite[Service] = Composite(
+            Service, logger=Lazy(logger)
+        )
+
+    @inject(ApplicationContext)
+    def handler(user_id: int, logger: Lazy[Logger]):
+        ...
+    ```
+    """
+
+    __slots__ = ("dependency",)
+
+    def __init__(self, dependency: Composite[T] | DependencyObject[T]):
+        self.dependency = dependency
+        super().__init__(LazyProxy, dependency)  # type: ignore
+
+    def __call__(self) -> T:
+        # the proxy builds the dependency for the scope and the context
+        # that resolved it, which are usually gone on first use
+        scope = _current_scope.get()
+        call = call_resources.get()
+        resources = current_resources.get()
+        if scope is None and call is None and resources is None:
+            return LazyProxy(self.dependency)  # type: ignore
+        return LazyProxy(  # type: ignore
+            lambda: _build_in(self.dependency, scope, call, resources)
+        )
+
+    def dependencies(self) -> Sequence[Composite]:
+        """
+        A lazy dependency isn't built with its dependent,
+        so it doesn't take part in the build order.
+        """
+        return []
+
+    def _deferred_resources(self) -> frozenset[int]:
+        dependency = self.dependency
+        if not isinstance(dependency, Composite):
+            return frozenset()
+        if dependency.is_resource:
+            return dependency.resource_dependencies() | {id(dependency)}
+        return dependency.resource_dependencies()
+
+
+def _build_in(
+    dependency: Callable[[], T],
+    scope: Scope | None,
+    call: ResourceStack | None,
+    resources: ResourceStack | None,
+) -> T:
+    scope_token = _current_scope.set(scope)
+    call_token = call_resources.set(call)
+    resources_token = current_resources.set(resources)
+    try:
+        return dependency()
+    finally:
+        current_resources.reset(resources_token)
+        call_resources.reset(call_token)
+        _current_scope.reset(scope_token)
+
+
+def unwrap(value: Any) -> Any:
+    """
+    Returns the object behind a `LazyProxy`, building it if needed.
+    """
+    if type(value) is LazyProxy:
+        return value.__resolve__()
+    return value
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class Lifetime(Enum):
+    """
+    Defines how long an object built by a `Composite` lives.
+
+    TRANSIENT: a new object is built every time the composite is resolved.
+    SINGLETON: the object is built once and shared by every resolve.
+    SCOPED: the object is built once per active `Scope`.
+    POOLED: the object is checked out of a bounded `Pool` for the duration
+        of an injected call or a `Scope` and returned afterwards.
+    """
+    TRANSIENT = "transient"
+    SINGLETON = "singleton"
+    SCOPED = "scoped"
+    POOLED = "pooled"
@@ -1,78 +1,129 @@
-from typing import Callable, Any, get_args, TypeVar
+from typing import Any, Callable, Mapping, NamedTuple, Sequence
 import inspect
 
 
-T = TypeVar('T')
+POSITIONAL = (
+    inspect.Parameter.POSITIONAL_ONLY,
+    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+)
 
 
-class ParameterOverrider:
+class InjectableSlot(NamedTuple):
+    """
+    A parameter of an injected function that can receive a dependency.
+
+    `position` is its index among the positional parameters, None for
+    keyword only parameters.
+    """
+    name: str
+    key: str
+    position: int | None
+    positional_only: bool
+
+
+class ArgumentBinder:
+    """
+    Binds injected dependencies to the arguments of a call.
+
+    The signature is walked once when the binder is created, a call only
+    checks which injectable parameters the caller left unbound and fills
+    them. Arguments supplied by the caller always take precedence over
+    injected ones, `*args` and `**kwargs` are passed through untouched
+    and never injected.
+
+    # usage
+    ```
+    binder = ArgumentBinder(func, parameters, {"service": "app.Service"})
+    slots = binder.unbound(args, kwargs)
+    args, kwargs = binder.bind(args, kwargs, slots, {"app.Service": ...})
+    ```
+    """
+    __slots__ = ("func", "slots", "positional")
+
     def __init__(
         self,
         func: Callable,
-        default_args: list[Any],
-        default_kwargs: dict[str, Any],
+        parameters: Mapping[str, inspect.Parameter],
+        keys: Mapping[str, str],
     ):
         self.func = func
-        self.default_args = default_args
-        self.default_kwargs = default_kwargs
-        self.parameters = inspect.signature(func).parameters
-
-    def is_positional(self, parameter: inspect.Parameter) -> bool:
-        return (
-            parameter.kind == inspect.Parameter.POSITIONAL_ONLY
-            or parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
-        )
-
-    def is_keyword_parameter(self, parameter: inspect.Parameter) -> bool:
-        return (
-            parameter.kind == inspect.Parameter.KEYWORD_ONLY
-            or parameter.kind == inspect.Parameter.VAR_KEYWORD
-        )
-
-    def composite_key(self, port: type[T]) -> str | None:
+        positional: list[inspect.Parameter] = []
+        slots: list[InjectableSlot] = []
+
+        for name, parameter in parameters.items():
+            position = None
+            if parameter.kind in POSITIONAL:
+                position = len(positional)
+                positional.append(parameter)
+            elif parameter.kind is not inspect.Parameter.KEYWORD_ONLY:
+                continue
+
+            key = keys.get(name)
+            if key is not None:
+                slots.append(InjectableSlot(
+                    name,
+                    key,
+                    position,
+                    parameter.kind is inspect.Parameter.POSITIONAL_ONLY,
+                ))
+
+        self.slots = tuple(slots)
+        self.positional = tuple(positional)
+
+    def unbound(
+        self, args: Sequence[Any], kwargs: Mapping[str, Any]
+    ) -> list[InjectableSlot]:
         """
-        Builds a composite key that represents the type of the dependency
-
-        Some types may have annotations, in that case, the first argument
-        is the always the main dependency
+        The injectable parameters the caller didn't supply.
         """
+        count = len(args)
+        return [
+            slot for slot in self.slots
+            if (slot.position is None or slot.position >= count)
+            and (slot.positional_only or slot.name not in kwargs)
+        ]
+
+    def bind(
+        self,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        slots: Sequence[InjectableSlot],
+        values: Mapping[str, Any],
+    ) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        """
+        Fills `slots` with the resolved `values`, by composite key.
 
-        args = get_args(port)
-        if args:
-            _port = args[0]
-        else:
-            _port = port
-
-        if isinstance(_port, type):
-            return f"{_port.__module__}.{_port.__name__}"
-        return None
-
-    def override_args(self, new_args: dict[str, Any]) -> list[Any]:
-        args = []
-        for index, (name, parameter) in enumerate(self.parameters.items()):
-            if self.is_positional(parameter):
-                if parameter.annotation:
-                    key = self.composite_key(parameter.annotation)
-                    if key and new_args.get(key):
-                        args.append(new_args[key])
-                        continue
-
-                    args.append(
-                        self.default_args[index]
-                    )
-
-        return args
-
-    def override_kwargs(self, new_kwargs: dict[str, Any]) -> dict[str, Any]:
-        kwargs = {}
-
-        for name, parameter in self.parameters.items():
-            if self.is_keyword_parameter(parameter):
-                if parameter.annotation:
-                    key = self.composite_key(parameter.annotation)
-                    if key and new_kwargs.get(key):
-                        kwargs[name] = new_kwargs[key]
-                        continue
-
-                kwargs[name] = self.default_kwargs.get(name)
-        return kwargs
+        `kwargs` must be owned by the call, it's filled in place, `args`
+        is only copied when a positional only parameter is injected.
+        """
+        positional: dict[int, Any] | None = None
+        for slot in slots:
+            if slot.positional_only:
+                if positional is None:
+                    positional = {}
+                positional[slot.position] = values[slot.key]  # type: ignore
+            else:
+                kwargs[slot.name] = values[slot.key]
+
+        if positional:
+            args = self._fill_positional(args, positional)
+        return args, kwargs
+
+    def _fill_positional(
+        self, args: tuple[Any, ...], values: dict[int, Any]
+    ) -> tuple[Any, ...]:
+        # positional only parameters can't be skipped, the ones between
+        # the caller's arguments and an injected one take their defaults
+        filled = list(args)
+        for index in range(len(args), max(values) + 1):
+            if index in values:
+                filled.append(values[index])
+                continue
+            parameter = self.positional[index]
+            if parameter.default is inspect.Parameter.empty:
+                raise TypeError(
+                    f"{self.func.__qualname__}() missing required "
+                    f"argument: '{parameter.name}'"
+                )
+            filled.append(parameter.default)
+        return tuple(filled)
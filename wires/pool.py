@@ -0,0 +1,347 @@
+from collections import deque
+from contextvars import ContextVar, Token
+from threading import Condition
+from typing import Any, Callable, Generic, Iterable, TypeVar
+import time
+
+from .errors import PoolExhaustedError
+
+
+T = TypeVar('T')
+
+
+class PoolStats:
+    """
+    What happened to the objects of a pool.
+
+    `hits` counts checkouts served by an idle object, `misses` the ones
+    that had to build a new object, `waits` and `wait_ns` the checkouts
+    that found the pool exhausted and how long they waited.
+    """
+    __slots__ = (
+        "hits", "misses", "waits", "wait_ns", "timeouts", "discarded",
+    )
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.wait_ns = 0
+        self.timeouts = 0
+        self.discarded = 0
+
+    @property
+    def checkouts(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        checkouts = self.checkouts
+        return self.hits / checkouts if checkouts else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "waits": self.waits,
+            "wait_ns": self.wait_ns,
+            "timeouts": self.timeouts,
+            "discarded": self.discarded,
+        }
+
+
+class Pool(Generic[T]):
+    """
+    A bounded pool of reusable objects, used by `Lifetime.POOLED`.
+
+    At most `max_size` objects exist at the same time. When all of them
+    are checked out, a checkout waits for one to be returned, up to
+    `timeout` seconds, or fails right away with `block=False`, raising
+    `PoolExhaustedError`.
+
+    `reset` is called with every returned object and `validate` with
+    every idle object before it's reused, objects whose reset raises or
+    that don't validate are discarded and replaced by new ones.
+
+    Coroutines check objects out with `aacquire`, which waits for a
+    returned object without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 8,
+        timeout: float | None = None,
+        block: bool = True,
+        reset: Callable[[T], Any] | None = None,
+        validate: Callable[[T], bool] | None = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.timeout = timeout
+        self.block = block
+        self.reset = reset
+        self.validate = validate
+        self.stats = PoolStats()
+        self.size = 0
+        self._idle: list[T] = []
+        self._condition = Condition()
+        # futures of the coroutines waiting for an object, with their loop
+        self._waiters: deque[tuple[Any, Any]] = deque()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the options of the pool, without its objects
+        return {
+            "max_size": self.max_size,
+            "timeout": self.timeout,
+            "block": self.block,
+            "reset": self.reset,
+            "validate": self.validate,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore
+
+    def acquire(self, build: Callable[[], T]) -> T:
+        """
+        Checks out an idle object, or a new one built with `build`.
+        """
+        while True:
+            instance = self._take(build)
+            if self.validate is None or self._valid(instance):
+                return instance
+            self._discard()
+
+    async def aacquire(self, build: Callable[[], T]) -> T:
+        """
+        Like `acquire`, waiting for a returned object without blocking
+        the event loop.
+        """
+        while True:
+            instance = await self._atake(build)
+            if self.validate is None or self._valid(instance):
+                return instance
+            self._discard()
+
+    def release(self, instance: T) -> None:
+        """
+        Returns a checked out object to the pool.
+        """
+        if self.reset is not None:
+            try:
+                self.reset(instance)
+            except Exception:
+                self._discard()
+                return
+        with self._condition:
+            self._idle.append(instance)
+            self._notify()
+
+    def clear(self) -> None:
+        """
+        Drops the idle objects, checked out objects are still returned.
+        """
+        with self._condition:
+            self.size -= len(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+            for _ in range(len(self._waiters)):
+                self._wake()
+
+    def _notify(self) -> None:
+        # called holding the condition, wakes a waiting thread and a
+        # waiting coroutine, the one that loses the race waits again
+        self._condition.notify()
+        self._wake()
+
+    def _wake(self) -> None:
+        # called holding the condition
+        while self._waiters:
+            loop, waiter = self._waiters.popleft()
+            if not waiter.done():
+                loop.call_soon_threadsafe(_wake_waiter, waiter)
+                return
+
+    def _after_fork(self, keep: bool) -> None:
+        """
+        Called in the child process of a fork, the condition may be held
+        by threads that don't exist in the child and the objects they
+        checked out are never returned.
+        """
+        self._condition = Condition()
+        self._waiters = deque()
+        if not keep:
+            self._idle = []
+        self.size = len(self._idle)
+
+    def _take(self, build: Callable[[], T]) -> T:
+        stats = self.stats
+        with self._condition:
+            if not self._idle and self.size >= self.max_size:
+                self._wait()
+            if self._idle:
+                stats.hits += 1
+                return self._idle.pop()
+            self.size += 1
+            stats.misses += 1
+
+        try:
+            return build()
+        except BaseException:
+            self._discard(count=False)
+            raise
+
+    async def _atake(self, build: Callable[[], T]) -> T:
+        import asyncio
+
+        stats = self.stats
+        deadline = (
+            None if self.timeout is None
+            else time.monotonic() + self.timeout
+        )
+        start = None
+        while True:
+            with self._condition:
+                if self._idle:
+                    stats.hits += 1
+                    self._waited(start)
+                    return self._idle.pop()
+                if self.size < self.max_size:
+                    self.size += 1
+                    stats.misses += 1
+                    self._waited(start)
+                    break
+                if not self.block:
+                    stats.timeouts += 1
+                    raise PoolExhaustedError(
+                        f"All {self.max_size} objects of the pool are "
+                        "checked out"
+                    )
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            if start is None:
+                start = time.perf_counter_ns()
+
+            remaining = (
+                None if deadline is None else deadline - time.monotonic()
+            )
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+                with self._condition:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                    elif waiter.done() and not waiter.cancelled():
+                        # woken while timing out, pass the wake up on
+                        self._wake()
+                if isinstance(error, asyncio.CancelledError):
+                    raise
+                with self._condition:
+                    self._waited(start)
+                    stats.timeouts += 1
+                raise PoolExhaustedError(
+                    f"No object of the pool was returned in {self.timeout}s"
+                ) from None
+
+        try:
+            return build()
+        except BaseException:
+            self._discard(count=False)
+            raise
+
+    def _waited(self, start: int | None) -> None:
+        # called holding the condition
+        if start is not None:
+            self.stats.waits += 1
+            self.stats.wait_ns += time.perf_counter_ns() - start
+
+    def _wait(self) -> None:
+        # called holding the condition
+        stats = self.stats
+        if not self.block:
+            stats.timeouts += 1
+            raise PoolExhaustedError(
+                f"All {self.max_size} objects of the pool are checked out"
+            )
+        start = time.perf_counter_ns()
+        available = self._condition.wait_for(
+            lambda: self._idle or self.size < self.max_size,
+            timeout=self.timeout,
+        )
+        stats.waits += 1
+        stats.wait_ns += time.perf_counter_ns() - start
+        if not available:
+            stats.timeouts += 1
+            raise PoolExhaustedError(
+                f"No object of the pool was returned in {self.timeout}s"
+            )
+
+    def _valid(self, instance: T) -> bool:
+        try:
+            return bool(self.validate(instance))  # type: ignore
+        except Exception:
+            return False
+
+    def _discard(self, count: bool = True) -> None:
+        with self._condition:
+            self.size -= 1
+            if count:
+                self.stats.discarded += 1
+            self._notify()
+
+
+class Lease:
+    """
+    The pooled objects checked out by an injected call or a scope,
+    each pooled composite is checked out at most once per lease and
+    every object is returned to its pool when the lease is released.
+    """
+
+    def __init__(self) -> None:
+        self.instances: dict[int, tuple[Any, Any]] = {}
+        self._tokens: list[Token] = []
+
+    def __enter__(self) -> "Lease":
+        self._tokens.append(_current_lease.set(self))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _current_lease.reset(self._tokens.pop())
+        if not self._tokens:
+            self.release()
+
+    def get(self, composite: Any) -> Any:
+        entry = self.instances.get(id(composite))
+        if entry is not None:
+            return entry[1]
+        instance = composite.pool.acquire(composite._build)
+        self.instances[id(composite)] = (composite, instance)
+        return instance
+
+    async def acheckout(self, composites: Iterable[Any]) -> None:
+        """
+        Checks the objects of `composites` out without blocking the event
+        loop, so resolving them afterwards doesn't wait for their pools.
+        """
+        for composite in composites:
+            if id(composite) not in self.instances:
+                instance = await composite.pool.aacquire(composite._build)
+                self.instances[id(composite)] = (composite, instance)
+
+    def release(self) -> None:
+        instances, self.instances = self.instances, {}
+        for composite, instance in reversed(instances.values()):
+            composite.pool.release(instance)
+
+
+def _wake_waiter(waiter: Any) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_current_lease: ContextVar[Lease | None] = ContextVar(
+    "wires_lease", default=None
+)
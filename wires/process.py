@@ -0,0 +1,111 @@
+"""
+Runs injected functions in worker processes.
+
+Definitions are sent to workers by import path: context classes,
+composites declared by a context class and injected functions are
+pickled as a reference that the worker imports, so every worker uses the
+same graph as the parent without rebuilding it for each task. Other
+composites are pickled with their arguments, never with the objects
+they built.
+
+```
+pool = ProcessPool(ApplicationContext, max_workers=4)
+future = pool.submit(render_report, report_id)  # an injected function
+```
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TYPE_CHECKING
+import importlib
+
+if TYPE_CHECKING:
+    from .context import Context
+
+
+def locate(module: str, qualname: str) -> Any:
+    """
+    The object named `qualname` in `module`, importing the module.
+    """
+    value: Any = importlib.import_module(module)
+    for name in qualname.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def restore_context(
+    context_type: type["Context"], initialized: bool
+) -> "Context":
+    """
+    A new instance of a pickled context.
+    """
+    context = context_type()
+    if initialized:
+        context.initialize_adapters()
+    return context
+
+
+def initialize_worker(
+    contexts: tuple[type["Context"], ...], warmup: bool = False
+) -> None:
+    """
+    Builds the contexts used by the injected functions of a worker once,
+    when the worker starts, instead of on its first task.
+
+    With `warmup` the singletons of the contexts are built as well,
+    see `Context.warmup`.
+
+    ```
+    ProcessPoolExecutor(
+        initializer=initialize_worker, initargs=((ApplicationContext,),)
+    )
+    ```
+    """
+    from .context_registry import ContextRegistry
+
+    for context_type in contexts:
+        context = ContextRegistry.get_instance(context_type)
+        if not context.adapters_initialized:
+            context.initialize_adapters()
+        if warmup:
+            context.warmup()
+
+
+def _initialize(
+    contexts: tuple[type["Context"], ...],
+    warmup: bool,
+    initializer: Callable[..., Any] | None,
+    initargs: tuple,
+) -> None:
+    initialize_worker(contexts, warmup)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class ProcessPool(ProcessPoolExecutor):
+    """
+    A `ProcessPoolExecutor` whose workers initialize `contexts` when
+    they start, see `initialize_worker`.
+
+    Injected functions are submitted like any other function, arguments
+    the caller doesn't pass are resolved in the worker by the context of
+    the worker. Submitted functions must be importable, defined at the
+    top level of a module.
+    """
+
+    def __init__(
+        self,
+        *contexts: type["Context"],
+        warmup: bool = False,
+        max_workers: int | None = None,
+        mp_context: Any = None,
+        initializer: Callable[..., Any] | None = None,
+        initargs: tuple = (),
+        **kwargs: Any,
+    ):
+        self.contexts = contexts
+        super().__init__(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_initialize,
+            initargs=(contexts, warmup, initializer, initargs),
+            **kwargs,
+        )
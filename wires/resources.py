@@ -0,0 +1,205 @@
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Callable, NamedTuple
+
+from .errors import ResourceError
+from .fork import track
+from .lifetime import Lifetime
+
+
+class ResourceEntry(NamedTuple):
+    """
+    A resource entered by a `ResourceStack`.
+
+    `depends_on` holds the ids of the resource composites the composite
+    of the entry depends on, those resources are exited after it.
+    """
+    composite: Any
+    exit: Callable[..., Any]
+    is_async: bool
+    depends_on: frozenset[int]
+
+
+class ResourceStack:
+    """
+    Exits the resources built for an owner, a context or a scope.
+
+    Resources are exited in reverse dependency order, a resource is only
+    exited once every resource that depends on it has been exited.
+    `aclose` exits resources that don't depend on each other concurrently.
+    Singleton composites are reset when their resource is exited,
+    so a closed object is never reused.
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[ResourceEntry] = []
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def enter(self, composite: Any, manager: Any) -> Any:
+        instance = manager.__enter__()
+        self._push(composite, manager.__exit__, False)
+        return instance
+
+    async def aenter(self, composite: Any, manager: Any) -> Any:
+        instance = await manager.__aenter__()
+        self._push(composite, manager.__aexit__, True)
+        return instance
+
+    def close(self) -> None:
+        """
+        Exits every resource, raises `ResourceError` if any of them
+        is async, those are left for `aclose`.
+        """
+        with self._lock:
+            entries, self.entries = self.entries, []
+
+        errors: list[BaseException] = []
+        pending = [entry for entry in entries if entry.is_async]
+        # dependencies are entered before their dependents,
+        # so the reverse order of entering is a valid exit order
+        for entry in reversed(entries):
+            if not entry.is_async:
+                self._exit(entry, errors)
+
+        if pending:
+            with self._lock:
+                self.entries[:0] = pending
+            errors.append(ResourceError(
+                f"{len(pending)} async resource(s) can only be closed "
+                "with aclose"
+            ))
+        _raise(errors)
+
+    async def aclose(self) -> None:
+        """
+        Exits every resource, resources that don't depend on each other
+        are exited concurrently.
+        """
+        import asyncio
+
+        with self._lock:
+            entries, self.entries = self.entries, []
+
+        errors: list[BaseException] = []
+        for level in exit_levels(entries):
+            results = await asyncio.gather(
+                *(self._aexit(entry) for entry in level),
+                return_exceptions=True,
+            )
+            errors.extend(
+                result for result in results
+                if isinstance(result, BaseException)
+            )
+        _raise(errors)
+
+    def _push(self, composite: Any, exit: Callable, is_async: bool) -> None:
+        entry = ResourceEntry(
+            composite, exit, is_async, composite.resource_dependencies()
+        )
+        with self._lock:
+            self.entries.append(entry)
+
+    def _exit(self, entry: ResourceEntry, errors: list) -> None:
+        try:
+            entry.exit(None, None, None)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            _forget(entry.composite)
+
+    async def _aexit(self, entry: ResourceEntry) -> None:
+        try:
+            if entry.is_async:
+                await entry.exit(None, None, None)
+            else:
+                entry.exit(None, None, None)
+        finally:
+            _forget(entry.composite)
+
+
+def exit_levels(entries: list[ResourceEntry]) -> list[list[ResourceEntry]]:
+    """
+    Groups entries in the order they must be exited, no entry of a level
+    depends on another entry of the same or a following level.
+    """
+    levels = []
+    remaining = list(entries)
+    while remaining:
+        needed = {
+            dependency
+            for entry in remaining
+            for dependency in entry.depends_on
+        }
+        level = [
+            entry for entry in remaining
+            if id(entry.composite) not in needed
+        ]
+        if not level:
+            # only possible with inconsistent entries, fall back
+            # to the reverse order they were entered
+            level = [remaining[-1]]
+        levels.append(level)
+        exited = {id(entry) for entry in level}
+        remaining = [
+            entry for entry in remaining if id(entry) not in exited
+        ]
+    return levels
+
+
+def close_singletons() -> None:
+    """
+    Exits the resources of every singleton composite, see `ResourceStack`.
+
+    Singleton resources are kept by the process, like the singletons,
+    closing the context that built them doesn't exit them. Call it when
+    the application shuts down, the singletons are built again by the
+    next resolve.
+    """
+    singleton_resources.close()
+
+
+async def aclose_singletons() -> None:
+    """
+    Like `close_singletons`, also exiting async resources.
+    """
+    await singleton_resources.aclose()
+
+
+class _SingletonResources(ResourceStack):
+    def _after_fork(self) -> None:
+        # the resources belong to the parent, exiting them in the child
+        # would close them for the parent too
+        self.entries = []
+        self._lock = Lock()
+
+
+def _forget(composite: Any) -> None:
+    if composite.lifetime is Lifetime.SINGLETON:
+        composite.reset()
+
+
+def _raise(errors: list[BaseException]) -> None:
+    if len(errors) == 1:
+        raise errors[0]
+    if errors:
+        raise BaseExceptionGroup("Errors closing resources", errors)
+
+
+# Resources of singleton composites, shared by every context
+singleton_resources: ResourceStack = _SingletonResources()
+track(singleton_resources)
+
+# Resources of the injected call running in the current thread or task,
+# exited when the call returns.
+call_resources: ContextVar[ResourceStack | None] = ContextVar(
+    "wires_call_resources", default=None
+)
+
+# Resources of the context resolving in the current thread or task,
+# only set while resolving adapters that build resources.
+current_resources: ContextVar[ResourceStack | None] = ContextVar(
+    "wires_resources", default=None
+)
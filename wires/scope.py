@@ -0,0 +1,164 @@
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, Hashable, TYPE_CHECKING
+from .errors import ScopeError
+from .pool import Lease
+from .resources import ResourceStack
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+_current_scope: ContextVar["Scope | None"] = ContextVar(
+    "wires_current_scope", default=None
+)
+
+
+class Scope:
+    """
+    Holds the objects of `Lifetime.SCOPED` composites.
+
+    While a scope is active, every scoped composite is built at most once
+    and the same object is returned for the rest of the scope.
+    Pooled composites are checked out once per scope and returned to
+    their pool when the scope exits, resources built inside the scope
+    are exited (use `async with` if any of them is async).
+    A scope may also carry values that describe it, like the tenant
+    of a request, they can be read with `ScopeValue`.
+
+    # usage
+    ```
+    with Scope(tenant="acme"):
+        repository = context.resolve(RepositoryProtocol)
+        assert repository is context.resolve(RepositoryProtocol)
+    ```
+    """
+
+    def __init__(self, **values: Any):
+        self.values = values
+        self.instances: dict[Hashable, Any] = {}
+        self._pending: dict[Hashable, "asyncio.Future"] = {}
+        self._tokens: list[Token] = []
+        self._lease: Lease | None = None
+        self._resources: ResourceStack | None = None
+
+    def __enter__(self) -> "Scope":
+        self._tokens.append(_current_scope.set(self))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _current_scope.reset(self._tokens.pop())
+        if not self._tokens:
+            try:
+                if self._resources is not None:
+                    self._resources.close()
+            finally:
+                self._release()
+
+    async def __aenter__(self) -> "Scope":
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        _current_scope.reset(self._tokens.pop())
+        if not self._tokens:
+            try:
+                if self._resources is not None:
+                    await self._resources.aclose()
+            finally:
+                self._release()
+
+    def _release(self) -> None:
+        if self._lease is not None:
+            lease, self._lease = self._lease, None
+            lease.release()
+
+    @property
+    def resources(self) -> ResourceStack:
+        """
+        The resources built inside the scope.
+        """
+        resources = self._resources
+        if resources is None:
+            resources = self._resources = ResourceStack()
+        return resources
+
+    @property
+    def lease(self) -> Lease:
+        """
+        The pooled objects checked out by the scope.
+        """
+        lease = self._lease
+        if lease is None:
+            lease = self._lease = Lease()
+        return lease
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        try:
+            return self.instances[key]
+        except KeyError:
+            return self.instances.setdefault(key, build())
+
+    async def aget_or_build(
+        self, key: Hashable, build: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        import asyncio
+
+        try:
+            return self.instances[key]
+        except KeyError:
+            pass
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        pending = self._pending[key] = (
+            asyncio.get_running_loop().create_future()
+        )
+        pending.add_done_callback(_retrieve_exception)
+        try:
+            instance = self.instances.setdefault(key, await build())
+        except BaseException as error:
+            pending.set_exception(error)
+            raise
+        else:
+            pending.set_result(instance)
+        finally:
+            del self._pending[key]
+        return instance
+
+    @staticmethod
+    def current() -> "Scope":
+        scope = _current_scope.get()
+        if scope is None:
+            raise ScopeError(
+                "A scoped dependency can only be resolved "
+                "inside an active Scope"
+            )
+        return scope
+
+
+class ScopeValue:
+    """
+    Reads a value of the current scope when called,
+    used as the key of a `ContextStrategy` to pick a strategy per scope.
+
+    ```
+    storage = ContextStrategy(ScopeValue("tenant"), {...})
+    ```
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self) -> Any:
+        try:
+            return Scope.current().values[self.name]
+        except KeyError:
+            raise ScopeError(
+                f"The current scope has no value named '{self.name}'"
+            ) from None
+
+
+def _retrieve_exception(future: "asyncio.Future") -> None:
+    if not future.cancelled():
+        future.exception()
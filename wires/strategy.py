@@ -1,22 +1,61 @@
-from typing import Generic, TypeVar, Union
-from wires.composite import Composite, DependencyObject
+from typing import Any, Callable, Generic, TypeVar, Union, Sequence
+from wires.composite import Composite, DependencyObject, aresolve, _MISSING
+from wires.errors import StrategyKeyError
+from wires.graph import BuildPlan, check_acyclic
+from wires.lifetime import Lifetime
+from wires.resources import ResourceStack
+from wires.scope import Scope
 
 
 T = TypeVar("T", covariant=True)
 
 
 class ContextStrategy(Composite[T], Generic[T]):
+    """
+    Picks one of several composites by a key.
+
+    The key can be a string, a `DependencyObject` or a `Composite`,
+    or a callable (like `ScopeValue`) that computes it on every resolve.
+    Static keys are checked when the context is initialized.
+
+    Like any composite, a strategy can cache what it builds, in that case
+    one object is kept per key:
+
+    ```
+    storage = ContextStrategy.singleton(
+        ScopeValue("tenant"),
+        {
+            "acme": Composite(S3Storage, bucket="acme"),
+            "globex": Composite(DiskStorage, path="/data/globex"),
+        }
+    )
+
+    with Scope(tenant="acme"):
+        context.resolve(Storage)
+    ```
+    """
+
     def __init__(
         self,
-        key: Union[str, DependencyObject[str]],
+        key: Union[
+            str, DependencyObject[str], Composite[str], Callable[[], str]
+        ],
         strategies: dict[str, Composite[T]],
         *args,
         **kwargs
     ) -> None:
         self.key = key
         self.strategies = strategies
+        self._instances: dict[str, Any] = {}
         super().__init__(self, *args, **kwargs)  # type: ignore
 
+    __slots__ = ("key", "strategies", "_instances")
+    _built_state = Composite._built_state | {"_instances"}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._instances = {}
+        super().__setstate__(state)
+
     def __resolve__(self) -> T:
         """
         Indicates to context that this object can be
@@ -24,9 +63,106 @@ class ContextStrategy(Composite[T], Generic[T]):
         """
         return self()
 
+    def current_key(self) -> str:
+        """
+        The key of the strategy used by the current resolve.
+        """
+        key = self.key
+        if isinstance(key, str):
+            return key
+        return str(key())
+
+    def strategy(self, key: str) -> Composite[T]:
+        try:
+            return self.strategies[key]
+        except KeyError:
+            raise StrategyKeyError(
+                f"No strategy for key '{key}', "
+                f"expected one of {sorted(self.strategies)}"
+            ) from None
+
     def __call__(self) -> T:
         """
         Indicates to context that this object can be
         resolved without any additional information
         """
-        return self.strategies[str(self.key)]()
+        key = self.current_key()
+        strategy = self.strategy(key)
+
+        lifetime = self._lifetime
+        if lifetime is Lifetime.TRANSIENT:
+            return strategy()
+        if lifetime is Lifetime.SINGLETON:
+            instance: T = self._instances.get(key, _MISSING)
+            if instance is _MISSING:
+                with self._lock:
+                    instance = self._instances.get(key, _MISSING)
+                    if instance is _MISSING:
+                        instance = self._instances[key] = strategy()
+            return instance
+        return Scope.current().get_or_build(  # type: ignore
+            (id(self), key), strategy
+        )
+
+    async def __aresolve__(
+        self, resources: ResourceStack | None = None
+    ) -> T:
+        key = self.current_key()
+        strategy = self.strategy(key)
+
+        lifetime = self._lifetime
+        if lifetime is Lifetime.TRANSIENT:
+            return await aresolve(strategy, resources)  # type: ignore
+        if lifetime is Lifetime.SINGLETON:
+            instance: T = self._instances.get(key, _MISSING)
+            if instance is _MISSING:
+                instance = await aresolve(strategy, resources)
+                with self._lock:
+                    instance = self._instances.setdefault(key, instance)
+            return instance
+        return await Scope.current().aget_or_build(  # type: ignore
+            (id(self), key), lambda: aresolve(strategy, resources)
+        )
+
+    def reset(self) -> None:
+        """
+        Drops the objects kept for every key.
+        """
+        self._check_writable()
+        self._instances = {}
+
+    def _kept(self) -> bool:
+        return bool(self._instances)
+
+    def _prepare_fork(self) -> None:
+        # the key of a strategy may only be known by a resolve,
+        # only static keys are built before forking
+        if isinstance(self.key, (str, DependencyObject)):
+            super()._prepare_fork()
+
+    def dependencies(self) -> Sequence[Composite]:
+        return [
+            value
+            for value in (self.key, *self.strategies.values())
+            if isinstance(value, Composite)
+        ]
+
+    def check_key(self) -> None:
+        """
+        Raises `StrategyKeyError` if the key is static and matches
+        none of the strategies, computed keys are checked on resolve.
+        """
+        if isinstance(self.key, (str, DependencyObject)):
+            self.strategy(self.current_key())
+
+    def compile(self, check: bool = True) -> BuildPlan | None:  # type: ignore
+        """
+        Compiles the build plan of every strategy and checks that
+        a static key matches one of them.
+        """
+        if check:
+            check_acyclic([self])
+        self.check_key()
+        for strategy in self.strategies.values():
+            strategy.compile(check=False)
+        return None
@@ -1,4 +1,10 @@
+import pickle
+
+import pytest
+
 from wires import Composite
+from wires.composite import DependencyObject, FrozenKwargs
+from wires.context import Adapter
 from .conftest import Dependency01, Dependency02
 
 
@@ -36,3 +42,44 @@ class TestComposite:
                 data="composite test 01")
             )
 
+
+class TestCompactNodes:
+    def test_nodes_have_no_instance_dict(self):
+        composite = Composite.singleton(Dependency01, data="compact")
+
+        for node in (
+            composite,
+            DependencyObject("data", "compact"),
+            Adapter(composite, "Dependency01"),
+        ):
+            assert not hasattr(node, "__dict__")
+
+    def test_arguments_are_compact(self):
+        composite = Composite(Dependency01, "compact", data="compact")
+
+        assert isinstance(composite._args, tuple)
+        assert isinstance(composite._kwargs, FrozenKwargs)
+        with pytest.raises(TypeError):
+            composite._kwargs["data"] = "changed"  # type: ignore
+
+    def test_frozen_kwargs_behave_like_a_mapping(self):
+        kwargs = FrozenKwargs({"first": 1, "second": 2})
+
+        assert dict(**kwargs) == {"first": 1, "second": 2}
+        assert kwargs == {"first": 1, "second": 2}
+        assert kwargs["second"] == 2
+        assert "first" in kwargs and "third" not in kwargs
+        with pytest.raises(KeyError):
+            kwargs["third"]
+        assert pickle.loads(pickle.dumps(kwargs)) == kwargs
+
+    def test_frozen_kwargs_are_hashable(self):
+        kwargs = FrozenKwargs({"first": 1, "second": 2})
+
+        assert hash(kwargs) == hash(FrozenKwargs({"second": 2, "first": 1}))
+        assert {kwargs: True}[FrozenKwargs({"first": 1, "second": 2})]
+        with pytest.raises(TypeError):
+            hash(FrozenKwargs({"values": []}))
+
+    def test_composites_without_kwargs_share_them(self):
+        assert Composite(int)._kwargs is Composite(str)._kwargs
@@ -0,0 +1,196 @@
+from threading import Thread, Event
+from typing import Any, Callable
+import os
+import pickle
+
+import pytest
+
+from wires import (
+    BoundedRegistry, Composite, Context, ContextStrategy, ContextVarRegistry,
+    ForkPolicy, ThreadRegistry, close_singletons,
+)
+from wires.errors import ForkError
+from wires.fork import prepare
+
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "register_at_fork"), reason="needs os.fork"
+)
+
+
+def in_child(function: Callable[[], Any]) -> Any:
+    """
+    Runs `function` in a forked child process and returns its result,
+    or raises what it raised.
+    """
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        try:
+            result = ("ok", function())
+        except BaseException as error:
+            result = ("error", error)
+        with os.fdopen(write, "wb") as output:
+            pickle.dump(result, output)
+        os._exit(0)
+
+    os.close(write)
+    with os.fdopen(read, "rb") as output:
+        status, value = pickle.load(output)
+    os.waitpid(pid, 0)
+    if status == "error":
+        raise value
+    return value
+
+
+class Connection:
+    def __init__(self):
+        self.pid = os.getpid()
+
+
+class TestForkPolicy:
+    def test_singletons_are_inherited_by_default(self):
+        connection = Composite.singleton(Connection)
+        pid = connection().pid
+
+        assert in_child(lambda: connection().pid) == pid
+
+    def test_reset_singletons_are_built_by_the_child(self):
+        connection = Composite.singleton(Connection).on_fork(
+            ForkPolicy.RESET
+        )
+        connection()
+
+        assert in_child(lambda: connection().pid) != os.getpid()
+        assert connection().pid == os.getpid()
+
+    def test_rebuilt_singletons_are_built_right_after_fork(self):
+        connection = Composite.singleton(Connection).on_fork(
+            ForkPolicy.REBUILD
+        )
+        connection()
+
+        def child():
+            return connection._instance.pid
+
+        assert in_child(child) != os.getpid()
+
+    def test_shared_singletons_are_built_before_forking(self):
+        built = []
+
+        def load() -> Connection:
+            built.append(os.getpid())
+            return Connection()
+
+        model = Composite.singleton(load).on_fork(ForkPolicy.SHARED)
+
+        assert in_child(lambda: model().pid) == os.getpid()
+        assert built == [os.getpid()]
+
+    def test_shared_singletons_are_read_only_in_children(self):
+        model = Composite.singleton(Connection).on_fork(ForkPolicy.SHARED)
+        prepare()
+
+        with pytest.raises(ForkError):
+            in_child(model.reset)
+        model.reset()
+
+    def test_strategies_follow_the_policy(self):
+        strategy = ContextStrategy.singleton(
+            "primary", {"primary": Composite(Connection)}
+        ).on_fork(ForkPolicy.RESET)
+        strategy()
+
+        assert in_child(lambda: strategy().pid) != os.getpid()
+
+    def test_locks_held_by_other_threads_are_replaced(self):
+        started = Event()
+        release = Event()
+
+        def slow() -> Connection:
+            started.set()
+            release.wait()
+            return Connection()
+
+        connection = Composite.singleton(slow)
+        thread = Thread(target=connection)
+        thread.start()
+        started.wait()
+        try:
+            # the thread building the singleton doesn't exist in the child
+            release_in_child = in_child(
+                lambda: (release.set(), connection().pid)[1]
+            )
+        finally:
+            release.set()
+            thread.join()
+
+        assert release_in_child != os.getpid()
+
+    def test_pooled_objects_are_dropped(self):
+        connection = Composite.pooled(Connection).with_pool(
+            max_size=1, block=False
+        ).on_fork(ForkPolicy.RESET)
+        # checked out and never returned in the child
+        connection.pool.acquire(connection._build)
+
+        def child():
+            return connection.pool.acquire(connection._build).pid
+
+        assert in_child(child) != os.getpid()
+
+    def test_singleton_resources_are_exited_by_the_parent(self):
+        exited = []
+
+        def open_connection():
+            yield Connection()
+            exited.append(os.getpid())
+
+        connection = Composite.singleton(open_connection)
+        connection()
+
+        def child():
+            close_singletons()
+            return exited
+
+        assert in_child(child) == []
+        close_singletons()
+        assert exited == [os.getpid()]
+
+
+class ForkedContext(Context):
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestForkedRegistries:
+    @pytest.mark.parametrize(
+        "registry", [ContextVarRegistry, ThreadRegistry, BoundedRegistry]
+    )
+    def test_children_build_their_own_contexts(self, registry):
+        registry = registry()
+        instance = registry.get_instance(ForkedContext)
+
+        def child():
+            return (
+                registry.get_instance(ForkedContext) is not instance,
+                instance.closed,
+            )
+
+        # the contexts of the parent are dropped without closing them
+        assert in_child(child) == (True, False)
+        assert registry.get_instance(ForkedContext) is instance
+
+    def test_registry_scope_exits_in_the_child(self):
+        registry = ContextVarRegistry()
+
+        def child():
+            with registry.scope():
+                registry.get_instance(ForkedContext)
+            return True
+
+        with registry.scope():
+            assert in_child(child)
@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from wires import Composite, Context
+from wires.composite import FrozenKwargs
+from wires.errors import CircularDependencyError
+from .conftest import Dependency01, Dependency02, Dependency03
+
+
+@dataclass
+class Counted:
+    built: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.built.append(self)
+
+
+@dataclass
+class Node:
+    child: object = None
+
+
+class TestBuildPlan:
+    def test_plan_is_in_topological_order(self):
+        dependency_01 = Composite(Dependency01)
+        dependency_02 = Composite(Dependency02, dependency_01)
+        dependency_03 = Composite(
+            Dependency03, dependency_02=dependency_02
+        )
+
+        plan = dependency_03.compile()
+
+        assert [step.factory for step in plan.steps] == [
+            Dependency01, Dependency02, Dependency03
+        ]
+        assert dependency_03() == Dependency03(
+            Dependency02(Dependency01())
+        )
+
+    def test_positional_dependencies_are_built_once(self):
+        built: list = []
+        counted = Composite(Counted, built=built)
+        composite = Composite(Node, counted)
+
+        instance = composite()
+
+        assert built == [instance.child]
+
+    def test_non_transient_dependencies_are_resolved_by_call(self):
+        singleton = Composite.singleton(Dependency01)
+        composite = Composite(Dependency02, singleton)
+
+        plan = composite.compile()
+
+        assert plan.steps[0].factory is singleton
+        assert composite().dependency_01 is composite().dependency_01
+
+    def test_deep_graph_does_not_recurse(self):
+        composite = Composite(Node)
+        for _ in range(5000):
+            composite = Composite(Node, composite)
+
+        instance = composite()
+        depth = 0
+        while instance.child is not None:
+            instance = instance.child
+            depth += 1
+
+        assert depth == 5000
+
+
+class TestCircularDependency:
+    def test_cycle_is_reported_with_its_path(self):
+        first = Composite(Dependency01)
+        second = Composite(Dependency02, first)
+        third = Composite(Dependency03, second)
+        first._kwargs = FrozenKwargs({"data": third})
+
+        with pytest.raises(CircularDependencyError) as error:
+            third.compile()
+
+        assert error.value.path == [third, second, first, third]
+        assert "Dependency03 -> Dependency02 -> Dependency01" in str(
+            error.value
+        )
+
+    def test_cycle_is_found_when_initializing_the_context(self):
+        first = Composite(Node)
+        second = Composite(Node, first)
+        first._args = (second,)
+
+        class CircularContext(Context):
+            node: Composite[Node] = second
+
+        with pytest.raises(CircularDependencyError):
+            CircularContext().initialize_adapters()
@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from wires import Composite, Context, Lazy, inject
+from wires.lazy import LazyProxy, unwrap
+from .conftest import Dependency01
+
+
+@dataclass
+class Logger:
+    built: list = field(default_factory=list)
+    messages: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.built.append(self)
+
+    def error(self, message: str):
+        self.messages.append(message)
+
+
+@dataclass
+class Service:
+    logger: Logger
+
+
+built: list = []
+
+
+class LazyContext(Context):
+    logger: Composite[Logger] = Composite(Logger, built=built)
+    service: Composite[Service] = Composite(Service, logger=Lazy(logger))
+
+
+@inject(LazyContext)
+def handler(fail: bool, logger: Lazy[Logger]):
+    if fail:
+        logger.error("failed")  # type: ignore  # a proxy of a Logger
+    return logger
+
+
+class TestLazy:
+    def setup_method(self):
+        built.clear()
+
+    def test_lazy_dependency_is_not_built_until_used(self):
+        service = Composite(Service, logger=Lazy(Composite(Logger)))()
+
+        assert type(service.logger) is LazyProxy
+        assert "LazyProxy" in repr(service.logger)
+
+    def test_lazy_dependency_is_built_once_on_first_use(self):
+        _built: list = []
+        service = Composite(
+            Service, logger=Lazy(Composite(Logger, built=_built))
+        )()
+
+        service.logger.error("first")
+        service.logger.error("second")
+
+        assert len(_built) == 1
+        assert _built[0].messages == ["first", "second"]
+        assert isinstance(service.logger, Logger)
+        assert unwrap(service.logger) is _built[0]
+
+    def test_lazy_dependency_in_a_context(self):
+        context = LazyContext()
+        context.initialize_adapters()
+
+        service = context.resolve(Service)
+
+        assert built == []
+        service.logger.error("message")
+        assert len(built) == 1
+
+    def test_lazy_dependency_keeps_the_lifetime(self):
+        singleton = Composite.singleton(Dependency01)
+        proxy = Lazy(singleton)()
+
+        assert unwrap(proxy) is singleton()
+
+    def test_lazy_injected_parameter(self):
+        handler(False)
+        assert built == []
+
+        logger = handler(True)
+        assert len(built) == 1
+        assert logger.messages == ["failed"]
+
+    def test_lazy_resource_is_owned_by_the_resolving_context(self):
+        opened: list = []
+
+        def open_logger() -> Iterator[Logger]:
+            logger = Logger()
+            opened.append(logger)
+            yield logger
+            logger.error("closed")
+
+        class ResourceContext(Context):
+            service: Composite[Service] = Composite(
+                Service, logger=Lazy(Composite(open_logger))
+            )
+
+        assert ResourceContext.service.has_resources()
+        with ResourceContext() as context:
+            service = context.resolve(Service)
+            assert opened == []
+            service.logger.error("used")
+
+        assert opened[0].messages == ["used", "closed"]
+        assert len(context.resources) == 0
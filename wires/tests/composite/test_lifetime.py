@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from threading import Barrier, Thread
+import time
+
+import pytest
+
+from wires import Composite, Lifetime, Scope
+from wires.errors import ScopeError
+from .conftest import Dependency01, Dependency02
+
+
+@dataclass
+class SlowDependency:
+    built: list = field(default_factory=list)
+
+    def __post_init__(self):
+        time.sleep(0.01)
+        self.built.append(self)
+
+
+class TestLifetime:
+    def test_transient_is_the_default(self):
+        composite = Composite(Dependency01)
+
+        assert composite.lifetime is Lifetime.TRANSIENT
+        assert composite() is not composite()
+
+    def test_singleton_builds_once(self):
+        composite = Composite.singleton(Dependency01)
+
+        assert composite.lifetime is Lifetime.SINGLETON
+        assert composite() is composite()
+
+    def test_singleton_reset(self):
+        composite = Composite.singleton(Dependency01)
+        first = composite()
+        composite.reset()
+
+        assert composite() is not first
+
+    def test_singleton_is_built_once_across_threads(self):
+        built: list = []
+        composite = Composite.singleton(SlowDependency, built=built)
+        barrier = Barrier(8)
+        results = []
+
+        def resolve():
+            barrier.wait()
+            results.append(composite())
+
+        threads = [Thread(target=resolve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(built) == 1
+        assert all(result is built[0] for result in results)
+
+    def test_scoped_without_scope(self):
+        composite = Composite.scoped(Dependency01)
+
+        with pytest.raises(ScopeError):
+            composite()
+
+    def test_scoped_is_shared_within_a_scope(self):
+        composite = Composite.scoped(Dependency01)
+
+        with Scope():
+            first = composite()
+            assert composite() is first
+
+        with Scope():
+            assert composite() is not first
+
+    def test_scoped_graph_reuses_singletons(self):
+        built: list = []
+        dependency = Composite.singleton(SlowDependency, built=built)
+        composite = Composite.scoped(Dependency02, dependency_01=dependency)
+
+        with Scope():
+            first = composite()
+        with Scope():
+            second = composite()
+
+        assert first is not second
+        assert first.dependency_01 is second.dependency_01
+        assert len(built) == 1
+
+    def test_overrides_bypass_the_singleton(self):
+        composite = Composite.singleton(Dependency01)
+        instance = composite()
+
+        with composite.overrides({}) as overridden:
+            assert overridden is not instance
+
+        assert composite() is instance
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from threading import Barrier, Thread
+
+from wires import Composite
+from wires.composite import DependencyObject
+
+
+@dataclass
+class Connection:
+    dsn: str
+    timeout: int = 0
+
+
+@dataclass
+class Repository:
+    connection: Connection
+
+
+dsn = DependencyObject("dsn", "sqlite://")
+timeout = DependencyObject("timeout", 10)
+connection = Composite(Connection, dsn, timeout=timeout)
+repository = Composite(Repository, connection=connection)
+
+
+class TestOverrides:
+    def test_overrides_yield_the_overridden_object(self):
+        with connection.overrides(
+            {"dsn": DependencyObject("dsn", "postgres://")}
+        ) as overridden:
+            assert overridden == Connection("postgres://", 10)
+
+        assert connection() == Connection("sqlite://", 10)
+
+    def test_overrides_do_not_mutate_the_composite(self):
+        args, kwargs = connection._args, connection._kwargs
+
+        with connection.overrides(
+            {"dsn": DependencyObject("dsn", "postgres://")}
+        ):
+            assert connection._args is args
+            assert connection._kwargs is kwargs
+
+    def test_overrides_apply_to_dependents(self):
+        with connection.overrides(
+            {"dsn": DependencyObject("dsn", "postgres://")}
+        ):
+            assert repository().connection.dsn == "postgres://"
+
+        assert repository().connection.dsn == "sqlite://"
+
+    def test_nested_overrides_keep_the_outer_overrides(self):
+        with connection.overrides(
+            {"dsn": DependencyObject("dsn", "postgres://")}
+        ):
+            with connection.overrides(
+                {"timeout": DependencyObject("timeout", 30)}
+            ) as inner:
+                assert inner == Connection("postgres://", 30)
+
+            assert connection() == Connection("postgres://", 10)
+
+        assert connection() == Connection("sqlite://", 10)
+
+    def test_concurrent_overrides_are_isolated(self):
+        barrier = Barrier(8)
+        errors = []
+
+        def override(index: int):
+            value = f"db-{index}"
+            with connection.overrides(
+                {"dsn": DependencyObject("dsn", value)}
+            ):
+                barrier.wait()
+                for _ in range(100):
+                    if repository().connection.dsn != value:
+                        errors.append(index)
+
+        threads = [
+            Thread(target=override, args=(index,)) for index in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert repository().connection.dsn == "sqlite://"
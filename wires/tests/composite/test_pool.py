@@ -0,0 +1,315 @@
+from collections import deque
+from threading import Event, Thread
+import asyncio
+import time
+
+import pytest
+
+from wires import (
+    Composite, Context, ContextStrategy, Lifetime, Scope, inject,
+)
+from wires.errors import (
+    PoolExhaustedError, ResourceError, ScopeError, ValidationError,
+)
+from wires.pool import Lease, Pool
+
+
+class Parser:
+    def __init__(self):
+        self.used = 0
+        self.valid = True
+
+
+class Document:
+    def __init__(self, parser: Parser):
+        self.parser = parser
+
+
+class TestPooledLifetime:
+    def test_pooled(self):
+        parser = Composite.pooled(Parser)
+
+        assert parser.lifetime is Lifetime.POOLED
+        assert isinstance(parser.pool, Pool)
+
+    def test_requires_a_lease_or_scope(self):
+        with pytest.raises(ScopeError):
+            Composite.pooled(Parser)()
+
+    def test_checked_out_once_per_scope(self):
+        parser = Composite.pooled(Parser)
+
+        with Scope():
+            first = parser()
+            assert parser() is first
+            with Scope():
+                assert parser() is not first
+
+        with Scope():
+            assert parser() is first
+
+        assert parser.pool.stats.hits == 1
+        assert parser.pool.stats.misses == 2
+
+    def test_reentrant_scope_returns_on_last_exit(self):
+        parser = Composite.pooled(Parser)
+        scope = Scope()
+
+        with scope:
+            with scope:
+                first = parser()
+            assert parser() is first
+            assert parser.pool.size == 1
+            assert parser.pool._idle == []
+
+        assert parser.pool._idle == [first]
+
+    def test_dependency_of_a_transient_composite(self):
+        parser = Composite.pooled(Parser)
+        document = Composite(Document, parser)
+
+        with Lease():
+            assert document().parser is document().parser
+
+    def test_checked_out_for_injected_calls(self):
+        parser = Composite.pooled(Parser)
+
+        class PoolContext(Context):
+            pooled: Composite[Parser] = parser
+
+        @inject(PoolContext)
+        def handler(parser: Parser) -> Parser:
+            parser.used += 1
+            return parser
+
+        first = handler()
+
+        assert handler() is first
+        assert first.used == 2
+        assert parser.pool.stats.to_dict() == {
+            "checkouts": 2,
+            "hits": 1,
+            "misses": 1,
+            "hit_rate": 0.5,
+            "waits": 0,
+            "wait_ns": 0,
+            "timeouts": 0,
+            "discarded": 0,
+        }
+        assert parser.pool._idle == [first]
+
+    def test_reset_hook(self):
+        resets = []
+        parser = Composite.pooled(Parser).with_pool(reset=resets.append)
+
+        with Scope():
+            instance = parser()
+
+        assert resets == [instance]
+
+    def test_failing_reset_discards_the_object(self):
+        def reset(parser: Parser) -> None:
+            raise RuntimeError("broken")
+
+        parser = Composite.pooled(Parser).with_pool(reset=reset)
+
+        with Scope():
+            first = parser()
+        with Scope():
+            assert parser() is not first
+
+        assert parser.pool.stats.discarded == 2
+        assert parser.pool.size == 0
+
+    def test_validate_hook(self):
+        parser = Composite.pooled(Parser).with_pool(
+            validate=lambda parser: parser.valid
+        )
+
+        with Scope():
+            first = parser()
+            first.valid = False
+        with Scope():
+            assert parser() is not first
+
+        assert parser.pool.stats.discarded == 1
+        assert parser.pool.size == 1
+
+    def test_reset_drops_idle_objects(self):
+        parser = Composite.pooled(Parser)
+        with Scope():
+            first = parser()
+
+        parser.reset()
+
+        with Scope():
+            assert parser() is not first
+
+
+class TestPooledDependencies:
+    def test_rejected_under_a_singleton(self):
+        class PoolContext(Context):
+            document: Composite[Document] = Composite.singleton(
+                Document, Composite(Parser).with_pool()
+            )
+
+        with pytest.raises(ResourceError):
+            PoolContext().initialize_adapters()
+
+    def test_rejected_under_a_strategy(self):
+        class PoolContext(Context):
+            document: Composite[Document] = Composite(
+                Document,
+                ContextStrategy("fast", {
+                    "fast": Composite.pooled(Parser),
+                }),
+            )
+
+        with pytest.raises(ResourceError):
+            PoolContext().initialize_adapters()
+
+    def test_reported_by_validate(self):
+        class PoolContext(Context):
+            document: Composite[Document] = Composite.singleton(
+                Document, Composite.pooled(Parser)
+            )
+
+        with pytest.raises(ValidationError) as info:
+            PoolContext().validate()
+
+        [problem] = info.value.problems
+        assert problem.port == "document"
+        assert isinstance(problem.error, ResourceError)
+
+
+class TestPoolExhaustion:
+    def test_non_blocking(self):
+        parser = Composite.pooled(Parser).with_pool(max_size=1, block=False)
+
+        with Scope():
+            parser()
+            with Scope():
+                with pytest.raises(PoolExhaustedError):
+                    parser()
+
+        assert parser.pool.stats.timeouts == 1
+
+    def test_timeout(self):
+        parser = Composite.pooled(Parser).with_pool(
+            max_size=1, timeout=0.01
+        )
+
+        with Scope():
+            parser()
+            with Scope():
+                with pytest.raises(PoolExhaustedError):
+                    parser()
+
+        assert parser.pool.stats.waits == 1
+        assert parser.pool.stats.wait_ns > 0
+
+    def test_waits_for_a_returned_object(self):
+        parser = Composite.pooled(Parser).with_pool(max_size=1)
+        checked_out = Event()
+        results = []
+
+        def hold():
+            with Scope():
+                results.append(parser())
+                checked_out.set()
+                time.sleep(0.05)
+
+        thread = Thread(target=hold)
+        thread.start()
+        checked_out.wait()
+        with Scope():
+            results.append(parser())
+        thread.join()
+
+        assert results[0] is results[1]
+        assert parser.pool.stats.waits == 1
+        assert parser.pool.stats.wait_ns > 0
+
+    def test_failed_build_frees_its_slot(self):
+        calls = []
+
+        def build() -> Parser:
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("broken")
+            return Parser()
+
+        parser = Composite.pooled(build).with_pool(max_size=1, block=False)
+
+        with Scope():
+            with pytest.raises(RuntimeError):
+                parser()
+            assert isinstance(parser(), Parser)
+
+
+class TestAsyncCheckout:
+    @pytest.mark.asyncio()
+    async def test_waits_without_blocking_the_loop(self):
+        parser = Composite.pooled(Parser).with_pool(max_size=1)
+
+        class PoolContext(Context):
+            pooled: Composite[Parser] = parser
+
+        @inject(PoolContext)
+        async def handler(parser: Parser) -> Parser:
+            await asyncio.sleep(0.01)
+            return parser
+
+        first, second = await asyncio.wait_for(
+            asyncio.gather(handler(), handler()), 1
+        )
+
+        assert first is second
+        assert parser.pool.stats.waits == 1
+        assert parser.pool._idle == [first]
+
+    @pytest.mark.asyncio()
+    async def test_supplied_arguments_take_no_slot(self):
+        parser = Composite.pooled(Parser).with_pool(
+            max_size=1, block=False
+        )
+
+        class PoolContext(Context):
+            pooled: Composite[Parser] = parser
+
+        @inject(PoolContext)
+        async def handler(parser: Parser) -> Parser:
+            return parser
+
+        supplied = Parser()
+        with Lease():
+            parser()
+            assert await handler(parser=supplied) is supplied
+            with pytest.raises(PoolExhaustedError):
+                await handler()
+
+        assert parser.pool.stats.checkouts == 1
+
+    @pytest.mark.asyncio()
+    async def test_timeout_lets_the_loop_run(self):
+        parser = Composite.pooled(Parser).with_pool(
+            max_size=1, timeout=0.05
+        )
+        ticks = []
+
+        async def tick():
+            for _ in range(3):
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        with Lease():
+            parser()
+            with Lease() as lease:
+                with pytest.raises(PoolExhaustedError):
+                    await asyncio.gather(
+                        lease.acheckout([parser]), tick()
+                    )
+
+        assert ticks == [1, 1, 1]
+        assert parser.pool.stats.timeouts == 1
+        assert parser.pool._waiters == deque()
@@ -0,0 +1,239 @@
+from typing import Any
+import asyncio
+
+import pytest
+
+from wires import AsyncComposite, Composite, Context, inject
+from wires.composite import DependencyObject
+
+
+class Counted:
+    built: list[Any] = []
+
+    def __init__(self, *dependencies: Any, **named: Any):
+        self.dependencies = dependencies
+        self.named = named
+        Counted.built.append(self)
+
+
+class Left(Counted):
+    pass
+
+
+class Right(Counted):
+    pass
+
+
+class Top(Counted):
+    pass
+
+
+def diamond(bottom: Composite) -> Composite[Top]:
+    return Composite(
+        Top, Composite(Left, bottom), Composite(Right, bottom)
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_counts():
+    Counted.built = []
+
+
+def bottoms() -> list[Any]:
+    return [
+        instance for instance in Counted.built
+        if type(instance) is Counted
+    ]
+
+
+class TestSharing:
+    def test_diamond_is_built_once_per_resolve(self):
+        top = diamond(Composite(Counted))
+        instance = top()
+
+        left, right = instance.dependencies
+        assert left.dependencies[0] is right.dependencies[0]
+        assert len(bottoms()) == 1
+
+        top()
+        assert len(bottoms()) == 2
+
+    def test_unshared_dependency_is_built_per_dependent(self):
+        top = diamond(Composite(Counted).unshared())
+        instance = top()
+
+        left, right = instance.dependencies
+        assert left.dependencies[0] is not right.dependencies[0]
+        assert len(bottoms()) == 2
+
+    def test_unshared_dependency_used_directly_and_through_another(self):
+        bottom = Composite(Counted).unshared()
+        top = Composite(Top, bottom, Composite(Left, bottom))
+        instance = top()
+
+        assert instance.dependencies[0] is not (
+            instance.dependencies[1].dependencies[0]
+        )
+        assert len(bottoms()) == 2
+
+    def test_diamond_with_overrides_is_built_once(self):
+        bottom = Composite(Counted, value=DependencyObject("value", 1))
+        top = diamond(bottom)
+
+        with bottom.overrides({"value": DependencyObject("value", 2)}):
+            instance = top()
+
+        left, right = instance.dependencies
+        assert left.dependencies[0] is right.dependencies[0]
+        assert left.dependencies[0].named == {"value": 2}
+
+    def test_unshared_with_overrides(self):
+        bottom = Composite(
+            Counted, value=DependencyObject("value", 1)
+        ).unshared()
+        top = diamond(bottom)
+
+        with bottom.overrides({"value": DependencyObject("value", 2)}):
+            Counted.built = []  # `overrides` builds the composite itself
+            top()
+
+        assert len(bottoms()) == 2
+
+
+class TestAsyncSharing:
+    @pytest.mark.asyncio()
+    async def test_async_diamond_is_built_once(self):
+        async def build() -> Counted:
+            return Counted()
+
+        top = diamond(AsyncComposite(build))
+        instance = await top.__aresolve__()
+
+        left, right = instance.dependencies
+        assert left.dependencies[0] is right.dependencies[0]
+        assert len(bottoms()) == 1
+
+    @pytest.mark.asyncio()
+    async def test_async_unshared(self):
+        async def build() -> Counted:
+            return Counted()
+
+        await diamond(AsyncComposite(build).unshared()).__aresolve__()
+
+        assert len(bottoms()) == 2
+
+    @pytest.mark.asyncio()
+    async def test_sync_dependencies_of_an_async_composite_are_shared(self):
+        async def build(*dependencies: Any) -> Top:
+            return Top(*dependencies)
+
+        bottom = Composite(Counted)
+        top = AsyncComposite(build, bottom, Composite(Left, bottom))
+        instance = await top.__aresolve__()
+
+        direct, left = instance.dependencies
+        assert left.dependencies[0] is direct
+        assert len(bottoms()) == 1
+
+    @pytest.mark.asyncio()
+    async def test_async_resolve_with_overrides(self):
+        async def build(*dependencies: Any) -> Top:
+            return Top(*dependencies)
+
+        bottom = Composite(Counted, value=DependencyObject("value", 1))
+        top = AsyncComposite(build, bottom, Composite(Left, bottom))
+
+        with bottom.overrides({"value": DependencyObject("value", 2)}):
+            instance = await top.__aresolve__()
+
+        direct, left = instance.dependencies
+        assert type(direct) is Counted
+        assert left.dependencies[0] is direct
+        assert direct.named == {"value": 2}
+
+    @pytest.mark.asyncio()
+    async def test_tasks_started_while_resolving_build_their_own(self):
+        bottom = Composite(Counted)
+        left = Composite(Left, bottom)
+        resolved = asyncio.Event()
+        background = []
+
+        async def resolve_later() -> list[Left]:
+            await resolved.wait()
+            return [left() for _ in range(3)]
+
+        async def build(*dependencies: Any) -> Top:
+            background.append(asyncio.create_task(resolve_later()))
+            return Top(*dependencies)
+
+        instance = await AsyncComposite(build, bottom).__aresolve__()
+        resolved.set()
+        lefts = await background[0]
+
+        built = [instance.dependencies[0]] + [
+            left.dependencies[0] for left in lefts
+        ]
+        assert len({id(value) for value in built}) == 4
+
+
+shared = Composite(Counted)
+
+
+class SharingContext(Context):
+    left: Composite[Left] = Composite(Left, shared)
+    right: Composite[Right] = Composite(Right, shared)
+
+
+class TestInjectedSharing:
+    def test_parameters_share_dependencies(self):
+        @inject(SharingContext)
+        def handler(left: Left, right: Right) -> tuple[Left, Right]:
+            return left, right
+
+        left, right = handler()
+
+        assert left.dependencies[0] is right.dependencies[0]
+        assert len(bottoms()) == 1
+
+        handler()
+        assert len(bottoms()) == 2
+
+    def test_supplied_parameters_are_not_built(self):
+        @inject(SharingContext)
+        def handler(left: Left, right: Right) -> Right:
+            return right
+
+        handler(Left())
+
+        assert len(bottoms()) == 1
+
+    @pytest.mark.asyncio()
+    async def test_async_parameters_share_async_dependencies(self):
+        async def build() -> Counted:
+            return Counted()
+
+        bottom = AsyncComposite(build)
+
+        class AsyncSharingContext(Context):
+            left: Composite[Left] = Composite(Left, bottom)
+            right: Composite[Right] = Composite(Right, bottom)
+
+        @inject(AsyncSharingContext)
+        async def handler(left: Left, right: Right) -> tuple[Left, Right]:
+            return left, right
+
+        left, right = await handler()
+
+        assert left.dependencies[0] is right.dependencies[0]
+        assert len(bottoms()) == 1
+
+    @pytest.mark.asyncio()
+    async def test_async_parameters_share_sync_dependencies(self):
+        @inject(SharingContext)
+        async def handler(left: Left, right: Right) -> tuple[Left, Right]:
+            return left, right
+
+        left, right = await handler()
+
+        assert left.dependencies[0] is right.dependencies[0]
+        assert len(bottoms()) == 1
@@ -0,0 +1,201 @@
+from threading import Barrier, Thread
+from typing import Iterator
+
+from wires import Composite, Context
+from wires.context import AdapterTable
+from .conftest import Dependency01, Dependency02
+
+
+class TableContext(Context):
+    dependency_01: Composite[Dependency01] = Composite(Dependency01)
+    dependency_02: Composite[Dependency02] = Composite(
+        Dependency02, dependency_01
+    )
+
+
+class Handle:
+    def __init__(self):
+        self.closed = False
+
+
+def open_handle() -> Iterator[Handle]:
+    handle = Handle()
+    yield handle
+    handle.closed = True
+
+
+class ResourceTableContext(Context):
+    handle: Composite[Handle] = Composite(open_handle)  # type: ignore
+    dependency_01: Composite[Dependency01] = Composite(Dependency01)
+
+
+class TestAdapterTable:
+    def test_instances_share_the_adapters_of_their_class(self):
+        first = TableContext()
+        first.initialize_adapters()
+        second = TableContext()
+        second.initialize_adapters()
+
+        table = AdapterTable.of(first)
+        assert first.adapters is table.adapters
+        assert second.adapters is table.adapters
+        assert second.get_adapter(Dependency02) is (
+            first.get_adapter(Dependency02)
+        )
+        assert isinstance(second.resolve(Dependency02), Dependency02)
+
+    def test_built_once_by_concurrent_instances(self):
+        class ConcurrentContext(Context):
+            dependency_01: Composite[Dependency01] = Composite(Dependency01)
+
+        barrier = Barrier(8)
+        adapters = []
+
+        def initialize():
+            context = ConcurrentContext()
+            barrier.wait()
+            context.initialize_adapters()
+            adapters.append(context.get_adapter(Dependency01))
+
+        threads = [Thread(target=initialize) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(adapter is adapters[0] for adapter in adapters)
+
+    def test_each_class_has_its_own_table(self):
+        class OtherContext(Context):
+            dependency_01: Composite[Dependency01] = Composite(Dependency01)
+
+        context = OtherContext()
+        context.initialize_adapters()
+
+        assert AdapterTable.of(context) is not AdapterTable.of(TableContext())
+        assert context.get_adapter(Dependency02) is None
+
+    def test_resources_are_owned_by_each_instance(self):
+        first = ResourceTableContext()
+        first.initialize_adapters()
+        second = ResourceTableContext()
+        second.initialize_adapters()
+
+        first_handle = first.resolve(Handle)
+        second_handle = second.resolve(Handle)
+        first.close()
+
+        assert first_handle.closed is True
+        assert second_handle.closed is False
+        # only the adapters that build resources are copied
+        assert first.get_adapter(Dependency01) is (
+            second.get_adapter(Dependency01)
+        )
+        assert first.get_adapter(Handle) is not second.get_adapter(Handle)
+
+
+class VariantDependency(Dependency01):
+    pass
+
+
+class BaseContext(Context):
+    dependency_01: Composite[Dependency01] = Composite(Dependency01)
+    dependency_02: Composite[Dependency02] = Composite(
+        Dependency02, dependency_01
+    )
+    handle: Composite[Handle] = Composite(Handle)
+
+
+class TestInheritance:
+    def test_ports_are_inherited(self):
+        class ProductionContext(BaseContext):
+            pass
+
+        context = ProductionContext()
+        context.initialize_adapters()
+
+        assert isinstance(context.resolve(Dependency02), Dependency02)
+        assert isinstance(context.resolve(Handle), Handle)
+
+    def test_overriding_a_port(self):
+        class VariantContext(BaseContext):
+            dependency_01: Composite[Dependency01] = Composite(
+                VariantDependency
+            )
+
+        context = VariantContext()
+        context.initialize_adapters()
+        base = BaseContext()
+        base.initialize_adapters()
+
+        assert isinstance(context.resolve(Dependency01), VariantDependency)
+        assert type(base.resolve(Dependency01)) is Dependency01
+        # the graph of dependency_02 was declared with the base port
+        assert type(
+            context.resolve(Dependency02).dependency_01
+        ) is Dependency01
+
+    def test_overriding_a_value_without_annotation(self):
+        class VariantContext(BaseContext):
+            dependency_01 = Composite(VariantDependency)
+
+        context = VariantContext()
+        context.initialize_adapters()
+
+        assert isinstance(context.resolve(Dependency01), VariantDependency)
+
+    def test_only_overridden_ports_are_compiled(self):
+        base = AdapterTable.of(BaseContext())
+        plan = BaseContext.dependency_02._plan
+
+        class VariantContext(BaseContext):
+            handle: Composite[Handle] = Composite.singleton(Handle)
+
+        table = AdapterTable.of(VariantContext())
+
+        assert BaseContext.dependency_02._plan is plan
+        assert table.adapters is not base.adapters
+        assert table.names["dependency_02"] is not (
+            base.names["dependency_02"]
+        )
+        assert table.names["dependency_02"].factory is (
+            base.names["dependency_02"].factory
+        )
+        assert table.names["handle"].adapter is VariantContext.handle
+
+    def test_ports_of_mixins(self):
+        class HandleMixin:
+            handle: Composite[Handle] = Composite.singleton(Handle)
+
+        class MixedContext(HandleMixin, BaseContext):
+            pass
+
+        context = MixedContext()
+        context.initialize_adapters()
+
+        assert context.resolve(Handle) is context.resolve(Handle)
+        assert isinstance(context.resolve(Dependency02), Dependency02)
+
+    def test_generated_subclass(self):
+        class GeneratedContext(BaseContext):
+            codegen = True
+
+        context = GeneratedContext()
+        context.initialize_adapters()
+        base = BaseContext()
+        base.initialize_adapters()
+
+        assert hasattr(
+            context.get_adapter(Dependency02).factory,
+            "__generated_source__",
+        )
+        assert not hasattr(
+            base.get_adapter(Dependency02).factory, "__generated_source__"
+        )
+        assert isinstance(context.resolve(Dependency02), Dependency02)
+
+    def test_validation_sees_inherited_ports(self):
+        class ProductionContext(BaseContext):
+            pass
+
+        ProductionContext().validate()
@@ -0,0 +1,160 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import asyncio
+import time
+
+import pytest
+
+from wires import AsyncComposite, Composite, Context, Scope
+from wires.errors import AsyncDependencyError
+from .conftest import Dependency01, Dependency02
+
+
+@dataclass
+class Connection:
+    dsn: str
+    closed: bool = False
+
+
+@dataclass
+class Repository:
+    first: Connection
+    second: Dependency01
+
+
+async def connect(dsn: str) -> Connection:
+    await asyncio.sleep(0.05)
+    return Connection(dsn)
+
+
+@asynccontextmanager
+async def open_connection(dsn: str):
+    connection = Connection(dsn)
+    yield connection
+    connection.closed = True
+
+
+class AsyncContext(Context):
+    connection: Composite[Connection] = AsyncComposite(
+        connect, dsn="postgres://"
+    )
+    dependency_01: Composite[Dependency01] = Composite(Dependency01)
+    dependency_02: Composite[Dependency02] = Composite(
+        Dependency02, dependency_01
+    )
+    repository: Composite[Repository] = Composite(
+        Repository,
+        first=connection,
+        second=dependency_01,
+    )
+
+
+@pytest.fixture()
+def async_context():
+    _context = AsyncContext()
+    _context.initialize_adapters()
+
+    return _context
+
+
+class TestAResolve:
+    @pytest.mark.asyncio()
+    async def test_aresolve_async_factory(self, async_context):
+        connection = await async_context.aresolve(Connection)
+
+        assert connection == Connection("postgres://")
+
+    @pytest.mark.asyncio()
+    async def test_aresolve_sync_graph(self, async_context):
+        dependency_02 = await async_context.aresolve(Dependency02)
+
+        assert dependency_02 == Dependency02(Dependency01())
+
+    @pytest.mark.asyncio()
+    async def test_aresolve_dependencies_of_sync_model(self, async_context):
+        repository = await async_context.aresolve(Repository)
+
+        assert repository == Repository(
+            Connection("postgres://"), Dependency01()
+        )
+
+    @pytest.mark.asyncio()
+    async def test_siblings_are_built_concurrently(self):
+        first = AsyncComposite(connect, dsn="first")
+        second = AsyncComposite(connect, dsn="second")
+        composite = Composite(Repository, first, second)
+
+        start = time.perf_counter()
+        repository = await composite.__aresolve__()
+        elapsed = time.perf_counter() - start
+
+        assert repository.first.dsn == "first"
+        assert repository.second.dsn == "second"
+        assert elapsed < 0.09
+
+    @pytest.mark.asyncio()
+    async def test_async_singleton_is_built_once(self):
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return Dependency01()
+
+        composite = AsyncComposite.singleton(factory)
+        results = await asyncio.gather(*(
+            composite.__aresolve__() for _ in range(5)
+        ))
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio()
+    async def test_resources_are_exited_by_aclose(self):
+        class ResourceContext(Context):
+            connection: Composite[Connection] = AsyncComposite.resource(
+                open_connection, dsn="postgres://"
+            )
+
+        context = ResourceContext()
+        context.initialize_adapters()
+
+        connection = await context.aresolve(Connection)
+        assert connection.closed is False
+
+        await context.aclose()
+        assert connection.closed is True
+
+    @pytest.mark.asyncio()
+    async def test_resources_need_an_owner(self):
+        composite = AsyncComposite.resource(open_connection, dsn="")
+
+        with pytest.raises(AsyncDependencyError):
+            await composite.__aresolve__()
+
+    def test_async_composite_cannot_be_resolved_synchronously(
+        self, async_context
+    ):
+        with pytest.raises(AsyncDependencyError):
+            async_context.resolve(Repository)
+
+    @pytest.mark.asyncio()
+    async def test_async_scoped_is_built_once_per_scope(self):
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return Dependency01()
+
+        composite = AsyncComposite.scoped(factory)
+        with Scope():
+            results = await asyncio.gather(*(
+                composite.__aresolve__() for _ in range(5)
+            ))
+        with Scope():
+            other = await composite.__aresolve__()
+
+        assert len(calls) == 2
+        assert all(result is results[0] for result in results)
+        assert other is not results[0]
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+import inspect
+
+import pytest
+
+from wires import Composite, Context, Instrumentation
+from wires.codegen import generate
+from wires.composite import DependencyObject
+from .conftest import Dependency01, Dependency02, Dependency03
+
+
+@dataclass
+class Settings:
+    dsn: str
+    options: dict
+
+
+@dataclass
+class Pair:
+    first: Dependency02
+    second: Dependency02
+
+
+class GeneratedContext(Context):
+    codegen = True
+
+    dependency_01: Composite[Dependency01] = Composite(Dependency01)
+    dependency_02: Composite[Dependency02] = Composite(
+        Dependency02, dependency_01
+    )
+    dependency_03: Composite[Dependency03] = Composite(
+        Dependency03, dependency_02=dependency_02
+    )
+    settings: Composite[Settings] = Composite.singleton(
+        Settings,
+        DependencyObject("dsn", "sqlite://"),
+        options={"timeout": 10},
+    )
+    pair: Composite[Pair] = Composite(
+        Pair, first=dependency_02, second=dependency_02
+    )
+
+
+@pytest.fixture()
+def generated():
+    context = GeneratedContext()
+    context.initialize_adapters()
+    yield context
+    GeneratedContext.settings.reset()
+
+
+class TestCodegen:
+    def test_disabled_by_default(self, context):
+        adapter = context.get_adapter(Dependency03)
+
+        assert not hasattr(adapter.factory, "__generated_source__")
+
+    def test_generated_factory_builds_the_graph(self, generated):
+        assert generated.resolve(Dependency03) == Dependency03(
+            Dependency02(Dependency01())
+        )
+        adapter = generated.get_adapter(Dependency03)
+        assert hasattr(adapter.factory, "__generated_source__")
+
+    def test_source_is_inspectable(self, generated):
+        factory = generated.get_adapter(Dependency03).factory
+
+        source = inspect.getsource(factory)
+
+        assert source == factory.__generated_source__
+        assert "def resolve_Dependency03(" in source
+        assert "_v2 = _f2(dependency_02=_v1)" in source
+
+    def test_shared_dependencies_are_built_once(self, generated):
+        pair = generated.resolve(Pair)
+
+        assert pair.first is pair.second
+
+    def test_constants_and_singletons(self, generated):
+        settings = generated.resolve(Settings)
+
+        assert settings == Settings("sqlite://", {"timeout": 10})
+        assert generated.resolve(Settings) is settings
+
+    def test_singleton_reset(self, generated):
+        settings = generated.resolve(Settings)
+
+        GeneratedContext.settings.reset()
+
+        assert generated.resolve(Settings) is not settings
+
+    def test_overrides_are_applied(self):
+        dependency_01 = Composite(Dependency01, DependencyObject("data", ""))
+        dependency_02 = Composite(Dependency02, dependency_01)
+        function = generate(dependency_02)
+        with dependency_01.overrides(
+            {"data": DependencyObject("data", "overridden")}
+        ):
+            assert function().dependency_01 == Dependency01("overridden")
+
+    def test_instrumentation_counts_constructions(self, generated):
+        generated.instrumentation = Instrumentation()
+
+        generated.resolve(Dependency03)
+
+        stats = generated.instrumentation.export()["stats"]
+        assert stats["context.conftest.Dependency01"]["constructions"] == 1
+
+    def test_keywords_that_are_not_identifiers(self):
+        composite = Composite(dict, **{"not an identifier": 1, "class": 2})
+
+        function = generate(composite)
+
+        assert function() == {"not an identifier": 1, "class": 2}
+
+    def test_only_plain_composites_are_generated(self):
+        assert generate(Composite.scoped(Dependency01)) is None
+        assert generate(DependencyObject("data", "value")) is None
@@ -1,4 +1,8 @@
+from typing import Annotated
+
 from wires import Composite
+from wires.keys import composite_key
+from .conftest import Dependency01
 
 
 class TestCompositeKey:
@@ -11,3 +15,16 @@ class TestCompositeKey:
         assert context.composite_key(
             Composite[self.__class__]
         ) == 'context.test_composite_key.TestCompositeKey'
+
+    def test_composite_key_is_shared(self, context):
+        assert context.composite_key(Dependency01) == composite_key(
+            Dependency01
+        )
+
+    def test_composite_key_of_annotated(self, context):
+        assert context.composite_key(
+            Annotated[Dependency01, {"unhashable": []}]
+        ) == 'context.conftest.Dependency01'
+
+    def test_composite_key_of_non_type(self, context):
+        assert context.composite_key("Dependency01") is None
@@ -0,0 +1,26 @@
+from typing import Annotated
+
+from .conftest import Dependency01, Dependency02
+
+
+class TestGetAdapter:
+    def test_ports_are_indexed_by_type(self, context):
+        adapter = context.get_adapter(Dependency01)
+
+        assert context.ports[Dependency01] is adapter
+        assert adapter.composite_key == 'context.conftest.Dependency01'
+
+    def test_get_adapter_of_annotated_port(self, context):
+        port = Annotated[Dependency02, "metadata"]
+
+        assert context.get_adapter(port) is context.get_adapter(Dependency02)
+        assert context.ports[port] is context.get_adapter(Dependency02)
+
+    def test_get_adapter_of_unhashable_annotation(self, context):
+        port = Annotated[Dependency01, {"unhashable": []}]
+
+        assert context.get_adapter(port) is context.get_adapter(Dependency01)
+
+    def test_get_adapter_of_unknown_port(self, context):
+        assert context.get_adapter(int) is None
+        assert context.resolve(int) is None
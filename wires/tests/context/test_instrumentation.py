@@ -0,0 +1,109 @@
+import pytest
+
+from wires import Composite, Context, Instrumentation, inject
+from .conftest import MockContext, Dependency01, Dependency02, Dependency03
+
+
+DEPENDENCY_01 = "context.conftest.Dependency01"
+
+
+@pytest.fixture()
+def instrumentation(context):
+    context.instrumentation = Instrumentation(spans=True)
+    return context.instrumentation
+
+
+class TestInstrumentation:
+    def test_disabled_by_default(self, context):
+        assert context.instrumentation is None
+        assert isinstance(context.resolve(Dependency01), Dependency01)
+
+    def test_hooks(self, context, instrumentation):
+        calls = []
+        instrumentation.before_resolve.append(
+            lambda _context, port: calls.append(("before", port))
+        )
+        instrumentation.after_resolve.append(
+            lambda _context, port, instance, duration: calls.append(
+                ("after", port, instance, duration >= 0)
+            )
+        )
+
+        instance = context.resolve(Dependency02)
+
+        assert calls == [
+            ("before", Dependency02),
+            ("after", Dependency02, instance, True),
+        ]
+
+    def test_construction_stats(self, context, instrumentation):
+        context.resolve(Dependency03)
+        context.resolve(Dependency01)
+
+        stats = instrumentation.export()["stats"]
+
+        assert stats[DEPENDENCY_01]["constructions"] == 2
+        assert stats["context.conftest.Dependency02"]["constructions"] == 1
+        assert stats["context.conftest.Dependency03"]["constructions"] == 1
+        assert stats[DEPENDENCY_01]["total_ns"] > 0
+
+    def test_singleton_hits_are_not_constructions(self):
+        class SingletonContext(Context):
+            dependency_01: Composite[Dependency01] = Composite.singleton(
+                Dependency01
+            )
+            dependency_02: Composite[Dependency02] = Composite(
+                Dependency02, dependency_01
+            )
+
+        context = SingletonContext()
+        context.initialize_adapters()
+        context.instrumentation = instrumentation = Instrumentation()
+
+        context.resolve(Dependency02)
+        context.resolve(Dependency02)
+
+        stats = instrumentation.export()["stats"]
+        assert stats[DEPENDENCY_01]["constructions"] == 1
+        assert stats["context.conftest.Dependency02"]["constructions"] == 2
+
+    def test_spans(self, context, instrumentation):
+        context.resolve(Dependency02)
+
+        [trace] = instrumentation.export()["traces"]
+
+        assert trace["name"] == "context.conftest.Dependency02"
+        assert [child["name"] for child in trace["children"]] == [
+            DEPENDENCY_01, "context.conftest.Dependency02"
+        ]
+
+    def test_reset(self, context, instrumentation):
+        context.resolve(Dependency01)
+        instrumentation.reset()
+
+        assert instrumentation.export() == {"stats": {}, "traces": []}
+
+    def test_injected_calls_are_instrumented(self):
+        instrumentation = Instrumentation()
+        MockContext.instrumentation = instrumentation
+        try:
+            @inject(MockContext)
+            def handler(port: Dependency01):
+                return port
+
+            handler()
+        finally:
+            MockContext.instrumentation = None
+
+        assert instrumentation.export()["stats"][DEPENDENCY_01] == {
+            "constructions": 1,
+            "total_ns": instrumentation.stats[DEPENDENCY_01].total_ns,
+        }
+
+    @pytest.mark.asyncio()
+    async def test_aresolve_is_instrumented(self, context, instrumentation):
+        await context.aresolve(Dependency02)
+
+        assert instrumentation.export()["traces"][0]["name"] == (
+            "context.conftest.Dependency02"
+        )
@@ -0,0 +1,123 @@
+from threading import Lock
+import multiprocessing
+import os
+import pickle
+
+import pytest
+
+from wires import Composite, Context, ContextStrategy, inject
+from wires.process import ProcessPool, initialize_worker
+
+
+class Settings:
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self.pid = os.getpid()
+
+
+class Client:
+    built = 0
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.lock = Lock()
+        Client.built += 1
+
+
+class WorkerContext(Context):
+    settings: Composite[Settings] = Composite.singleton(Settings)
+    client: Composite[Client] = Composite(Client, settings)
+
+
+@inject(WorkerContext)
+def describe(client: Client) -> tuple[int, int, int]:
+    return os.getpid(), client.settings.pid, Client.built
+
+
+@inject(WorkerContext)
+def settings_name(settings: Settings) -> str:
+    return settings.name
+
+
+class TestPickling:
+    def test_declared_composites_are_pickled_by_reference(self):
+        composite = pickle.loads(pickle.dumps(WorkerContext.client))
+
+        assert composite is WorkerContext.client
+
+    def test_other_composites_are_pickled_without_what_they_built(self):
+        settings = Composite.singleton(Settings, name="local")
+        built = settings()
+
+        copy = pickle.loads(pickle.dumps(settings))
+
+        assert copy is not settings
+        assert copy.lifetime is settings.lifetime
+        assert copy() is not built
+        assert copy().name == "local"
+
+    def test_shared_dependencies_stay_shared(self):
+        settings = Composite.singleton(Settings)
+        graph = [Composite(Client, settings), Composite(Client, settings)]
+
+        first, second = pickle.loads(pickle.dumps(graph))
+
+        assert first.dependencies()[0] is second.dependencies()[0]
+
+    def test_strategies_are_pickled_without_their_instances(self):
+        strategy = ContextStrategy.singleton(
+            "local", {"local": Composite(Settings, name="local")}
+        )
+        strategy()
+
+        copy = pickle.loads(pickle.dumps(strategy))
+
+        assert copy._instances == {}
+        assert copy().name == "local"
+
+    def test_pooled_composites_are_pickled_without_their_objects(self):
+        settings = Composite.pooled(Settings).with_pool(max_size=2)
+        settings.pool.release(settings.pool.acquire(settings._build))
+
+        copy = pickle.loads(pickle.dumps(settings))
+
+        assert copy.pool.max_size == 2
+        assert copy.pool._idle == []
+
+    def test_contexts_are_pickled_as_their_class(self):
+        context = WorkerContext()
+        context.initialize_adapters()
+        client = context.resolve(Client)
+
+        copy = pickle.loads(pickle.dumps(context))
+
+        assert type(copy) is WorkerContext
+        assert copy.adapters_initialized is True
+        assert copy.resolve(Client) is not client
+
+
+class TestWorkers:
+    def test_initialize_worker(self):
+        initialize_worker((WorkerContext,), warmup=True)
+
+        assert settings_name() == "default"
+
+    @pytest.mark.skipif(
+        not hasattr(os, "fork"), reason="needs the fork start method"
+    )
+    def test_injected_functions_run_in_workers(self):
+        Client.built = 0
+        with ProcessPool(
+            WorkerContext,
+            warmup=True,
+            max_workers=1,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as pool:
+            first = pool.submit(describe).result()
+            second = pool.submit(describe).result()
+
+        pid, settings_pid, built = first
+        assert pid != os.getpid()
+        # tasks run by the same worker share its context
+        assert second[:2] == (pid, settings_pid)
+        assert (built, second[2]) == (1, 2)
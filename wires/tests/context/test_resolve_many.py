@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import pytest
+
+from wires import Composite, Context, Instrumentation, Scope
+
+
+class Repository:
+    built = 0
+
+    def __init__(self):
+        Repository.built += 1
+
+
+class UserService:
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+
+class OrderService:
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+
+class Clock:
+    pass
+
+
+class Missing:
+    pass
+
+
+repository = Composite(Repository)
+
+
+class BatchContext(Context):
+    users: Composite[UserService] = Composite(UserService, repository)
+    orders: Composite[OrderService] = Composite(OrderService, repository)
+    clock: Composite[Clock] = Composite.singleton(Clock)
+    repository: Composite[Repository] = repository
+
+
+class Services(NamedTuple):
+    users: UserService
+    orders: OrderService
+
+
+@dataclass
+class Handlers:
+    users: UserService
+    clock: Clock
+    retries: int = 3
+
+
+@pytest.fixture()
+def context():
+    context = BatchContext()
+    context.initialize_adapters()
+    Repository.built = 0
+    return context
+
+
+class TestResolveMany:
+    def test_shared_dependencies_are_built_once(self, context):
+        users, orders = context.resolve_many([UserService, OrderService])
+
+        assert users.repository is orders.repository
+        assert Repository.built == 1
+
+    def test_each_call_builds_new_objects(self, context):
+        first, _ = context.resolve_many([UserService, OrderService])
+        second, _ = context.resolve_many([UserService, OrderService])
+
+        assert first.repository is not second.repository
+        assert Repository.built == 2
+
+    def test_port_of_a_shared_dependency(self, context):
+        users, shared = context.resolve_many([UserService, Repository])
+
+        assert users.repository is shared
+        assert Repository.built == 1
+
+    def test_lifetimes_are_respected(self, context):
+        clock, _ = context.resolve_many([Clock, UserService])
+
+        assert context.resolve_many([Clock])[0] is clock
+        assert context.resolve(Clock) is clock
+
+    def test_missing_ports_resolve_to_none(self, context):
+        users, missing = context.resolve_many([UserService, Missing])
+
+        assert isinstance(users, UserService)
+        assert missing is None
+
+    def test_plans_are_compiled_once(self, context):
+        context.resolve_many([UserService, OrderService])
+        batch = context._batches[(UserService, OrderService)]
+        context.resolve_many([UserService, OrderService])
+
+        assert context._batches[(UserService, OrderService)] is batch
+        assert len(batch.plan) == 3
+
+    def test_overrides_fall_back_to_resolve(self, context):
+        with repository.overrides({}):
+            users, orders = context.resolve_many([UserService, OrderService])
+
+        assert users.repository is not orders.repository
+
+    def test_instrumented_contexts_record_every_port(self, context):
+        context.instrumentation = Instrumentation(spans=True)
+        context.resolve_many([UserService, OrderService])
+
+        assert len(context.instrumentation.traces) == 2
+
+
+class TestResolveInto:
+    def test_named_tuple(self, context):
+        services = context.resolve_into(Services)
+
+        assert isinstance(services, Services)
+        assert services.users.repository is services.orders.repository
+        assert Repository.built == 1
+
+    def test_dataclass_keeps_defaults(self, context):
+        handlers = context.resolve_into(Handlers)
+
+        assert isinstance(handlers.users, UserService)
+        assert handlers.clock is context.resolve(Clock)
+        assert handlers.retries == 3
+
+    def test_rejects_other_types(self, context):
+        with pytest.raises(TypeError):
+            context.resolve_into(Scope)
@@ -0,0 +1,333 @@
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator
+import asyncio
+import time
+
+import pytest
+
+from wires import (
+    AsyncComposite, Composite, Context, ContextRegistry, Scope,
+    aclose_singletons, close_singletons, inject,
+)
+from wires.errors import ResourceError
+
+
+class File:
+    def __init__(self, name: str):
+        self.name = name
+        self.closed = False
+
+
+class Reader:
+    def __init__(self, file: File):
+        self.file = file
+
+
+def tracked(events: list[str]):
+    def open_file(name: str) -> Iterator[File]:
+        file = File(name)
+        events.append(f"open {name}")
+        yield file
+        file.closed = True
+        events.append(f"close {name}")
+
+    return open_file
+
+
+class TestResources:
+    def test_generators_are_resources(self):
+        events: list[str] = []
+        file = Composite(tracked(events), name="log")
+
+        assert file.is_resource is True
+
+        class FileContext(Context):
+            log: Composite[File] = file
+
+        with FileContext() as context:
+            instance = context.resolve(File)
+            assert instance.closed is False
+
+        assert instance.closed is True
+        assert events == ["open log", "close log"]
+
+    def test_context_manager_factory(self):
+        events: list[str] = []
+
+        class ManagerContext(Context):
+            log: Composite[File] = Composite.resource(
+                contextmanager(tracked(events)), name="log"
+            )
+
+        context = ManagerContext()
+        context.initialize_adapters()
+        instance = context.resolve(File)
+        context.close()
+
+        assert instance.closed is True
+        assert len(context.resources) == 0
+
+    def test_exited_in_reverse_dependency_order(self):
+        events: list[str] = []
+        open_file = tracked(events)
+
+        def open_reader(file: File) -> Iterator[Reader]:
+            events.append("open reader")
+            yield Reader(file)
+            events.append("close reader")
+
+        class ReaderContext(Context):
+            reader: Composite[Reader] = Composite(
+                open_reader, Composite(open_file, name="data")
+            )
+
+        with ReaderContext() as context:
+            context.resolve(Reader)
+
+        assert events == [
+            "open data", "open reader", "close reader", "close data",
+        ]
+
+    def test_singleton_is_rebuilt_after_close(self):
+        events: list[str] = []
+
+        class SingletonContext(Context):
+            log: Composite[File] = Composite.singleton(
+                tracked(events), name="log"
+            )
+
+        context = SingletonContext()
+        context.initialize_adapters()
+        first = context.resolve(File)
+        assert context.resolve(File) is first
+        close_singletons()
+
+        assert context.resolve(File) is not first
+        close_singletons()
+        assert events == ["open log", "close log"] * 2
+
+    def test_singletons_outlive_the_context_that_built_them(self):
+        events: list[str] = []
+
+        class SingletonContext(Context):
+            log: Composite[File] = Composite.singleton(
+                tracked(events), name="log"
+            )
+
+        first = SingletonContext()
+        first.initialize_adapters()
+        second = SingletonContext()
+        second.initialize_adapters()
+        instance = first.resolve(File)
+        first.close()
+
+        assert second.resolve(File) is instance
+        assert instance.closed is False
+        assert len(first.resources) == 0
+        close_singletons()
+        assert events == ["open log", "close log"]
+
+    def test_scope_owns_its_resources(self):
+        events: list[str] = []
+
+        class ScopedContext(Context):
+            log: Composite[File] = Composite.scoped(
+                tracked(events), name="log"
+            )
+
+        context = ScopedContext()
+        context.initialize_adapters()
+        with Scope():
+            instance = context.resolve(File)
+        assert instance.closed is True
+        assert len(context.resources) == 0
+
+    def test_failing_exit_does_not_stop_teardown(self):
+        events: list[str] = []
+
+        def open_broken() -> Iterator[File]:
+            yield File("broken")
+            raise RuntimeError("broken")
+
+        class BrokenContext(Context):
+            broken: Composite[Reader] = Composite(
+                Reader, Composite(open_broken)
+            )
+            log: Composite[File] = Composite(tracked(events), name="log")
+
+        context = BrokenContext()
+        context.initialize_adapters()
+        context.resolve(Reader)
+        context.resolve(File)
+
+        with pytest.raises(RuntimeError):
+            context.close()
+        assert events == ["open log", "close log"]
+
+    def test_resources_need_an_owner(self):
+        with pytest.raises(ResourceError):
+            Composite(tracked([]), name="log")()
+
+    def test_pooled_resources_are_rejected(self):
+        with Scope():
+            with pytest.raises(ResourceError):
+                Composite.pooled(tracked([]), name="log")()
+
+
+class TestInjectedResources:
+    def test_exited_when_the_call_returns(self):
+        events: list[str] = []
+
+        class CallContext(Context):
+            log: Composite[File] = Composite(tracked(events), name="log")
+
+        @inject(CallContext)
+        def handler(file: File) -> File:
+            assert file.closed is False
+            return file
+
+        files = [handler() for _ in range(3)]
+
+        assert all(file.closed for file in files)
+        assert events == ["open log", "close log"] * 3
+        context = ContextRegistry.get_instance(CallContext)
+        assert len(context.resources) == 0
+
+    def test_exited_when_the_call_raises(self):
+        events: list[str] = []
+
+        class FailingContext(Context):
+            log: Composite[File] = Composite(tracked(events), name="log")
+
+        @inject(FailingContext)
+        def handler(file: File) -> None:
+            raise RuntimeError("failed")
+
+        with pytest.raises(RuntimeError):
+            handler()
+        assert events == ["open log", "close log"]
+
+    @pytest.mark.asyncio()
+    async def test_async_call(self):
+        events: list[str] = []
+
+        async def open_file(name: str) -> AsyncIterator[File]:
+            file = File(name)
+            events.append(f"open {name}")
+            yield file
+            file.closed = True
+            events.append(f"close {name}")
+
+        class AsyncCallContext(Context):
+            log: Composite[File] = AsyncComposite(open_file, name="log")
+
+        @inject(AsyncCallContext)
+        async def handler(file: File) -> File:
+            return file
+
+        first = await handler()
+        await handler()
+
+        assert first.closed is True
+        assert events == ["open log", "close log"] * 2
+        context = ContextRegistry.get_instance(AsyncCallContext)
+        assert len(context.resources) == 0
+
+
+class TestAsyncResources:
+    @pytest.mark.asyncio()
+    async def test_async_generators_are_resources(self):
+        events: list[str] = []
+
+        async def open_file(name: str) -> AsyncIterator[File]:
+            file = File(name)
+            yield file
+            file.closed = True
+            events.append(name)
+
+        class AsyncFileContext(Context):
+            log: Composite[File] = AsyncComposite(open_file, name="log")
+
+        async with AsyncFileContext() as context:
+            instance = await context.aresolve(File)
+
+        assert instance.closed is True
+        assert events == ["log"]
+
+    @pytest.mark.asyncio()
+    async def test_independent_resources_exit_concurrently(self):
+        async def slow(name: str) -> AsyncIterator[File]:
+            yield File(name)
+            await asyncio.sleep(0.05)
+
+        class SlowContext(Context):
+            first: Composite[File] = AsyncComposite(slow, name="first")
+            second: Composite[Reader] = Composite(
+                Reader, AsyncComposite(slow, name="second")
+            )
+
+        context = SlowContext()
+        context.initialize_adapters()
+        await context.aresolve(File)
+        await context.aresolve(Reader)
+
+        start = time.perf_counter()
+        await context.aclose()
+
+        assert time.perf_counter() - start < 0.09
+
+    @pytest.mark.asyncio()
+    async def test_sync_close_leaves_async_resources(self):
+        async def open_file(name: str) -> AsyncIterator[File]:
+            yield File(name)
+
+        class MixedContext(Context):
+            log: Composite[File] = AsyncComposite(open_file, name="log")
+
+        context = MixedContext()
+        context.initialize_adapters()
+        await context.aresolve(File)
+
+        with pytest.raises(ResourceError):
+            context.close()
+        assert len(context.resources) == 1
+        await context.aclose()
+        assert len(context.resources) == 0
+
+    @pytest.mark.asyncio()
+    async def test_async_singletons_are_closed_by_the_process(self):
+        async def open_file(name: str) -> AsyncIterator[File]:
+            file = File(name)
+            yield file
+            file.closed = True
+
+        class AsyncSingletonContext(Context):
+            log: Composite[File] = AsyncComposite.singleton(
+                open_file, name="log"
+            )
+
+        async with AsyncSingletonContext() as context:
+            instance = await context.aresolve(File)
+
+        assert instance.closed is False
+        await aclose_singletons()
+        assert instance.closed is True
+
+    @pytest.mark.asyncio()
+    async def test_async_scope_exits_async_resources(self):
+        async def open_file(name: str) -> AsyncIterator[File]:
+            file = File(name)
+            yield file
+            file.closed = True
+
+        class AsyncScopedContext(Context):
+            log: Composite[File] = AsyncComposite.scoped(
+                open_file, name="log"
+            )
+
+        context = AsyncScopedContext()
+        context.initialize_adapters()
+        async with Scope():
+            instance = await context.aresolve(File)
+
+        assert instance.closed is True
@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+from threading import current_thread
+import time
+
+import pytest
+
+from wires import AsyncComposite, Composite, Context, ContextStrategy
+from wires.errors import StrategyKeyError, ValidationError
+from .conftest import Dependency01, Dependency02
+
+
+@dataclass
+class Slow:
+    threads: list = field(default_factory=list)
+
+    def __post_init__(self):
+        time.sleep(0.05)
+        self.threads.append(current_thread().name)
+
+
+class Broken:
+    def __init__(self):
+        raise RuntimeError("can't connect")
+
+
+@dataclass
+class First:
+    slow: Slow
+
+
+@dataclass
+class Second:
+    slow: Slow
+
+
+threads: list = []
+
+
+class WarmContext(Context):
+    first: Composite[First] = Composite.singleton(
+        First, slow=Composite(Slow, threads=threads)
+    )
+    second: Composite[Second] = Composite.singleton(
+        Second, slow=Composite(Slow, threads=threads)
+    )
+    dependency_02: Composite[Dependency02] = Composite(
+        Dependency02, first
+    )
+
+
+class TestValidate:
+    def test_valid_context(self, context):
+        context.validate()
+
+    def test_reports_every_problem(self):
+        class BrokenContext(Context):
+            missing: Composite[Dependency02] = Composite(Dependency02)
+            unknown: Composite[Dependency01] = Composite(
+                Dependency01, colour="red"
+            )
+            not_a_port: Composite["Dependency01"] = Composite(Dependency01)
+            undeclared: Composite[First]
+
+        with pytest.raises(ValidationError) as error:
+            BrokenContext().validate()
+
+        problems = {problem.port: problem for problem in error.value.problems}
+        assert set(problems) == {
+            "missing", "unknown", "not_a_port", "undeclared"
+        }
+        assert "dependency_01" in problems["missing"].message
+        assert "colour" in problems["unknown"].message
+        assert problems["missing"].composite == (
+            "context.conftest.Dependency02"
+        )
+
+    def test_reports_unmatched_keys_of_nested_strategies(self):
+        class StrategyContext(Context):
+            second: Composite[Second] = Composite(
+                Second,
+                slow=ContextStrategy("missing", {
+                    "slow": Composite(Slow),
+                }),
+            )
+
+        with pytest.raises(ValidationError) as error:
+            StrategyContext().validate()
+
+        [problem] = error.value.problems
+        assert problem.port == "second"
+        assert isinstance(problem.error, StrategyKeyError)
+
+
+class TestWarmup:
+    def setup_method(self):
+        threads.clear()
+        for composite in (WarmContext.first, WarmContext.second):
+            composite.reset()
+
+    def test_builds_singletons_in_parallel(self):
+        context = WarmContext()
+
+        start = time.perf_counter()
+        context.warmup()
+        elapsed = time.perf_counter() - start
+
+        assert len(threads) == 2
+        assert len(set(threads)) == 2
+        assert elapsed < 0.09
+        assert context.resolve(First) is WarmContext.first()
+
+    def test_reports_construction_errors(self):
+        class BrokenContext(Context):
+            broken: Composite[Broken] = Composite.singleton(Broken)
+            first: Composite[Dependency01] = Composite.singleton(
+                Dependency01
+            )
+
+        with pytest.raises(ValidationError) as error:
+            BrokenContext().warmup()
+
+        [problem] = error.value.problems
+        assert problem.composite.endswith("Broken")
+        assert isinstance(problem.error, RuntimeError)
+
+    @pytest.mark.asyncio()
+    async def test_awarmup_builds_async_singletons(self):
+        calls = []
+
+        async def connect() -> Dependency01:
+            calls.append(1)
+            return Dependency01()
+
+        class AsyncContext(Context):
+            dependency_01: Composite[Dependency01] = AsyncComposite.singleton(
+                connect
+            )
+
+        context = AsyncContext()
+        await context.awarmup()
+        await context.aresolve(Dependency01)
+
+        assert calls == [1]
@@ -0,0 +1,20 @@
+from wires import Context
+
+import pytest
+
+
+class RegistryContext(Context):
+    pass
+
+
+class OtherContext(Context):
+    pass
+
+
+@pytest.fixture(params=["contextvars", "thread"])
+def registry(request):
+    from wires import ContextVarRegistry, ThreadRegistry
+
+    if request.param == "contextvars":
+        return ContextVarRegistry()
+    return ThreadRegistry()
@@ -0,0 +1,251 @@
+from threading import Barrier, Thread
+import asyncio
+import gc
+import time
+import weakref
+
+import pytest
+
+from wires import BoundedRegistry, ContextRegistry, ContextVarRegistry
+from .conftest import RegistryContext, OtherContext
+
+
+class TestRegistryBackends:
+    def test_same_instance_in_the_same_thread(self, registry):
+        instance = registry.get_instance(RegistryContext)
+
+        assert registry.get_instance(RegistryContext) is instance
+        assert registry.get_instance(OtherContext) is not instance
+
+    def test_each_thread_has_its_own_instance(self, registry):
+        instance = registry.get_instance(RegistryContext)
+        instances = []
+
+        def resolve():
+            instances.append(registry.get_instance(RegistryContext))
+
+        thread = Thread(target=resolve)
+        thread.start()
+        thread.join()
+
+        assert instances[0] is not instance
+
+    def test_contexts_are_released_with_their_thread(self, registry):
+        references = []
+
+        def resolve():
+            references.append(
+                weakref.ref(registry.get_instance(RegistryContext))
+            )
+
+        for _ in range(10):
+            thread = Thread(target=resolve)
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        assert all(reference() is None for reference in references)
+
+    def test_scope_discards_its_contexts(self, registry):
+        with registry.scope():
+            scoped = registry.get_instance(RegistryContext)
+
+        assert registry.get_instance(RegistryContext) is not scoped
+
+
+class TestContextVarRegistry:
+    @pytest.mark.asyncio()
+    async def test_each_task_has_its_own_instance(self):
+        registry = ContextVarRegistry()
+
+        async def resolve():
+            instance = registry.get_instance(RegistryContext)
+            await asyncio.sleep(0)
+            assert registry.get_instance(RegistryContext) is instance
+            return instance
+
+        first, second = await asyncio.gather(resolve(), resolve())
+
+        assert first is not second
+
+    @pytest.mark.asyncio()
+    async def test_tasks_inherit_existing_contexts(self):
+        registry = ContextVarRegistry()
+        instance = registry.get_instance(RegistryContext)
+
+        async def resolve():
+            return registry.get_instance(RegistryContext)
+
+        assert await asyncio.create_task(resolve()) is instance
+
+    def test_scope_restores_the_outer_contexts(self):
+        registry = ContextVarRegistry()
+        instance = registry.get_instance(RegistryContext)
+
+        with registry.scope():
+            assert registry.get_instance(RegistryContext) is not instance
+
+        assert registry.get_instance(RegistryContext) is instance
+
+    @pytest.mark.asyncio()
+    async def test_async_scope_closes_its_contexts(self):
+        registry = ContextVarRegistry()
+        closed = []
+
+        async def aclose():
+            closed.append(1)
+
+        async with registry.scope():
+            context = registry.get_instance(RegistryContext)
+            context.aclose = aclose
+
+        assert closed == [1]
+
+
+class ClosingContext(RegistryContext):
+    def close(self):
+        self.closed = True
+
+
+class SlowContext(RegistryContext):
+    built = 0
+
+    def __init__(self):
+        super().__init__()
+        time.sleep(0.01)
+        SlowContext.built += 1
+
+
+class TestBoundedRegistry:
+    def test_one_instance_per_thread(self):
+        registry = BoundedRegistry()
+        instance = registry.get_instance(RegistryContext)
+        instances = []
+
+        thread = Thread(
+            target=lambda: instances.append(
+                registry.get_instance(RegistryContext)
+            )
+        )
+        thread.start()
+        thread.join()
+
+        assert registry.get_instance(RegistryContext) is instance
+        assert instances[0] is not instance
+        assert len(registry) == 2
+
+    def test_built_once_per_partition(self):
+        registry = BoundedRegistry(partition=lambda: "shared")
+        barrier = Barrier(8)
+        instances = []
+        SlowContext.built = 0
+
+        def resolve():
+            barrier.wait()
+            instances.append(registry.get_instance(SlowContext))
+
+        threads = [Thread(target=resolve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert SlowContext.built == 1
+        assert all(instance is instances[0] for instance in instances)
+        assert registry.stats.misses == 1
+        assert registry.stats.hits == 7
+
+    def test_least_recently_used_is_evicted_and_closed(self):
+        partition = ["a"]
+        registry = BoundedRegistry(
+            max_size=2, stripes=1, partition=lambda: partition[0]
+        )
+        first = registry.get_instance(ClosingContext)
+        partition[0] = "b"
+        second = registry.get_instance(ClosingContext)
+        partition[0] = "a"
+        assert registry.get_instance(ClosingContext) is first
+
+        partition[0] = "c"
+        registry.get_instance(ClosingContext)
+
+        assert len(registry) == 2
+        assert second.closed is True
+        assert not hasattr(first, "closed")
+        assert registry.stats.evictions == 1
+
+    def test_expired_contexts_are_replaced(self):
+        registry = BoundedRegistry(ttl=0.01)
+        first = registry.get_instance(ClosingContext)
+        time.sleep(0.02)
+
+        assert registry.get_instance(ClosingContext) is not first
+        assert first.closed is True
+        assert registry.stats.expired == 1
+
+    def test_failed_build_is_not_kept(self):
+        calls = []
+
+        class BrokenContext(RegistryContext):
+            def __init__(self):
+                calls.append(1)
+                if len(calls) == 1:
+                    raise RuntimeError("broken")
+                super().__init__()
+
+        registry = BoundedRegistry()
+        with pytest.raises(RuntimeError):
+            registry.get_instance(BrokenContext)
+
+        assert isinstance(registry.get_instance(BrokenContext), BrokenContext)
+        assert len(registry) == 1
+
+    def test_teardown_errors_are_counted(self):
+        def teardown(context):
+            raise RuntimeError("broken")
+
+        registry = BoundedRegistry(max_size=1, teardown=teardown)
+        registry.get_instance(RegistryContext)
+        registry.get_instance(OtherContext)
+
+        assert registry.stats.to_dict() == {
+            "lookups": 2,
+            "hits": 0,
+            "misses": 2,
+            "hit_rate": 0.0,
+            "evictions": 1,
+            "expired": 0,
+            "teardown_errors": 1,
+        }
+
+    def test_scope_evicts_its_contexts(self):
+        registry = BoundedRegistry()
+        outer = registry.get_instance(RegistryContext)
+
+        with registry.scope():
+            assert registry.get_instance(RegistryContext) is outer
+            scoped = registry.get_instance(ClosingContext)
+
+        assert scoped.closed is True
+        assert registry.get_instance(ClosingContext) is not scoped
+        assert registry.get_instance(RegistryContext) is outer
+
+    def test_clear_closes_every_context(self):
+        registry = BoundedRegistry()
+        instance = registry.get_instance(ClosingContext)
+        registry.clear()
+
+        assert instance.closed is True
+        assert len(registry) == 0
+
+
+class TestContextRegistry:
+    def test_uses_the_configured_backend(self, registry):
+        backend = ContextRegistry.backend
+        ContextRegistry.use(registry)
+        try:
+            assert ContextRegistry.get_instance(
+                RegistryContext
+            ) is registry.get_instance(RegistryContext)
+        finally:
+            ContextRegistry.use(backend)
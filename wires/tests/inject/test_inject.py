@@ -1,5 +1,12 @@
-from wires import inject
-from .conftest import Dependency01, MockContext
+import inspect
+
+import pytest
+
+from wires import Context, inject
+from wires.composite import DependencyObject
+from wires.inject import InjectionPlan
+from wires.parameters import ArgumentBinder
+from .conftest import Dependency01, Dependency02, MockContext
 
 
 @inject(
@@ -23,3 +30,150 @@ class TestInject:
         )
 
         assert result == (1, 2, "test", Dependency01("Deep dependency 01"))
+
+    def test_inject_with_missing_argument(self, context: MockContext):
+        with pytest.raises(TypeError):
+            subject(1, name="test")
+
+    def test_injection_plan_is_compiled_once(
+        self, context: MockContext, monkeypatch
+    ):
+        calls = []
+        compile = InjectionPlan.compile
+
+        def counting_compile(plan, _context):
+            calls.append(plan)
+            return compile(plan, _context)
+
+        monkeypatch.setattr(InjectionPlan, "compile", counting_compile)
+
+        @inject(MockContext)
+        def handler(name: str, port: Dependency01):
+            return name, port
+
+        for _ in range(3):
+            assert handler("test") == ("test", Dependency01())
+
+        assert len(calls) == 1
+
+    def test_dependency_object_port(self):
+        class Settings:
+            pass
+
+        loaded = Settings()
+
+        class SettingsContext(Context):
+            settings: DependencyObject[Settings] = DependencyObject(
+                "settings", loaded
+            )
+
+        @inject(SettingsContext)
+        def handler(settings: Settings) -> Settings:
+            return settings
+
+        assert handler() is loaded
+        assert handler() is loaded
+
+
+class TestArgumentBinding:
+    def test_caller_argument_takes_precedence(self, context: MockContext):
+        dependency = Dependency01("from caller")
+
+        assert subject(1, 2, "test", dependency)[3] is dependency
+        assert subject(1, 2, "test", port=dependency)[3] is dependency
+
+    def test_supplied_dependency_is_not_resolved(
+        self, context: MockContext, monkeypatch
+    ):
+        resolved = []
+        resolve = InjectionPlan.resolve
+
+        def counting_resolve(plan, _context, keys=None):
+            resolved.append(keys)
+            return resolve(plan, _context, keys)
+
+        monkeypatch.setattr(InjectionPlan, "resolve", counting_resolve)
+
+        subject(1, 2, "test", Dependency01())
+
+        assert resolved == []
+
+    def test_positional_only(self, context: MockContext):
+        @inject(MockContext)
+        def handler(port: Dependency01, name: str = "default", /):
+            return port, name
+
+        assert handler() == (Dependency01(), "default")
+        assert handler(Dependency01("own"), "name") == (
+            Dependency01("own"), "name"
+        )
+
+    def test_positional_only_after_a_default(self, context: MockContext):
+        @inject(MockContext)
+        def handler(
+            name: str = "default", port: Dependency01 | None = None, /
+        ):
+            return name, port
+
+        assert handler() == ("default", Dependency01())
+
+    def test_keyword_only(self, context: MockContext):
+        @inject(MockContext)
+        def handler(name: str, *, port: Dependency01, flag: bool = False):
+            return name, port, flag
+
+        assert handler("test", flag=True) == ("test", Dependency01(), True)
+
+    def test_var_positional_and_var_keyword(self, context: MockContext):
+        @inject(MockContext)
+        def handler(
+            name: str, port: Dependency01, *args: int, **kwargs: int
+        ):
+            return name, port, args, kwargs
+
+        assert handler("test", extra=1) == (
+            "test", Dependency01(), (), {"extra": 1}
+        )
+        assert handler("test", Dependency01("own"), 1, 2, extra=1) == (
+            "test", Dependency01("own"), (1, 2), {"extra": 1}
+        )
+
+    def test_binder_only_fills_unbound_slots(self):
+        def handler(name: str, port: Dependency01, other: Dependency02):
+            ...
+
+        parameters = inspect.signature(handler).parameters
+        binder = ArgumentBinder(handler, parameters, {
+            "port": "port", "other": "other",
+        })
+        slots = binder.unbound(("test",), {"other": None})
+
+        assert [slot.name for slot in slots] == ["port"]
+        assert binder.bind(("test",), {"other": None}, slots, {
+            "port": 1,
+        }) == (("test",), {"other": None, "port": 1})
+
+
+@inject(
+    MockContext,
+)
+async def async_subject(name: str, port: Dependency01):
+    return name, port
+
+
+class TestInjectAsync:
+    @pytest.mark.asyncio()
+    async def test_inject_coroutine_function(self, context: MockContext):
+        result = await async_subject("test")
+
+        assert result == ("test", Dependency01("Deep dependency 01"))
+
+    @pytest.mark.asyncio()
+    async def test_caller_argument_takes_precedence(
+        self, context: MockContext
+    ):
+        dependency = Dependency01("from caller")
+
+        result = await async_subject("test", port=dependency)
+
+        assert result[1] is dependency
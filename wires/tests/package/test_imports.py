@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+import wires
+
+
+def modules_after(statement: str) -> set[str]:
+    output = subprocess.run(
+        [
+            sys.executable, "-c",
+            f"import sys\n{statement}\nprint(*sys.modules)",
+        ],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return set(output.split())
+
+
+class TestImports:
+    def test_all_names_exist(self):
+        for name in wires.__all__:
+            assert getattr(wires, name) is not None
+
+    def test_star_import(self):
+        namespace: dict = {}
+        exec("from wires import *", namespace)
+        assert set(wires.__all__) <= set(namespace)
+
+    def test_dir_lists_lazy_exports(self):
+        assert set(wires.__all__) <= set(dir(wires))
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError, match="Port"):
+            wires.Port  # type: ignore
+
+    def test_inject_is_the_decorator(self):
+        assert callable(wires.inject)
+        assert wires.inject.__module__ == "wires.inject"
+
+    def test_import_is_lazy(self):
+        modules = modules_after("import wires")
+        assert "wires.composite" not in modules
+        assert "asyncio" not in modules
+
+    def test_context_does_not_import_asyncio(self):
+        modules = modules_after(
+            "from wires import Context, Composite, inject"
+        )
+        assert "wires.context" in modules
+        assert "asyncio" not in modules
+        assert "concurrent.futures" not in modules
+        assert "wires.validation" not in modules
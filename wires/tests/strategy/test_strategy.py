@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+
+import pytest
+
+from wires import Composite, Context, ContextStrategy, Scope, ScopeValue
+from wires.composite import DependencyObject
+from wires.errors import ScopeError, StrategyKeyError
+
+
+@dataclass
+class Storage:
+    name: str
+
+
+def storages() -> dict[str, Composite[Storage]]:
+    return {
+        "acme": Composite(Storage, name="acme"),
+        "globex": Composite(Storage, name="globex"),
+    }
+
+
+class TestContextStrategy:
+    def test_string_key(self):
+        strategy = ContextStrategy("acme", storages())
+
+        assert strategy() == Storage("acme")
+        assert strategy() is not strategy()
+
+    def test_dependency_object_key(self):
+        strategy = ContextStrategy(
+            DependencyObject("tenant", "globex"), storages()
+        )
+
+        assert strategy() == Storage("globex")
+
+    def test_scope_value_key(self):
+        strategy = ContextStrategy(ScopeValue("tenant"), storages())
+
+        with Scope(tenant="acme"):
+            assert strategy() == Storage("acme")
+        with Scope(tenant="globex"):
+            assert strategy() == Storage("globex")
+
+    def test_scope_value_without_value(self):
+        strategy = ContextStrategy(ScopeValue("tenant"), storages())
+
+        with pytest.raises(ScopeError):
+            with Scope():
+                strategy()
+
+    def test_unknown_key(self):
+        strategy = ContextStrategy(lambda: "initech", storages())
+
+        with pytest.raises(StrategyKeyError):
+            strategy()
+
+    def test_singleton_caches_per_key(self):
+        strategy = ContextStrategy.singleton(
+            ScopeValue("tenant"), storages()
+        )
+
+        with Scope(tenant="acme"):
+            acme = strategy()
+            assert strategy() is acme
+        with Scope(tenant="globex"):
+            assert strategy() == Storage("globex")
+        with Scope(tenant="acme"):
+            assert strategy() is acme
+
+        strategy.reset()
+        with Scope(tenant="acme"):
+            assert strategy() is not acme
+
+    def test_scoped_caches_per_scope_and_key(self):
+        strategy = ContextStrategy.scoped(ScopeValue("tenant"), storages())
+
+        with Scope(tenant="acme"):
+            acme = strategy()
+            assert strategy() is acme
+        with Scope(tenant="acme"):
+            assert strategy() is not acme
+
+    def test_unmatched_static_key_fails_at_initialization(self):
+        class StrategyContext(Context):
+            storage: Composite[Storage] = ContextStrategy(
+                "initech", storages()
+            )
+
+        with pytest.raises(StrategyKeyError):
+            StrategyContext().initialize_adapters()
+
+    def test_unmatched_nested_static_key_fails_at_initialization(self):
+        @dataclass
+        class Backup:
+            storage: Storage
+
+        class StrategyContext(Context):
+            backup: Composite[Backup] = Composite(
+                Backup, storage=ContextStrategy("initech", storages())
+            )
+
+        with pytest.raises(StrategyKeyError):
+            StrategyContext().initialize_adapters()
+
+    def test_resolve_from_context(self):
+        class StrategyContext(Context):
+            storage: Composite[Storage] = ContextStrategy.singleton(
+                ScopeValue("tenant"), storages()
+            )
+
+        context = StrategyContext()
+        context.initialize_adapters()
+
+        with Scope(tenant="globex"):
+            assert context.resolve(Storage) == Storage("globex")
+
+    @pytest.mark.asyncio()
+    async def test_aresolve(self):
+        strategy = ContextStrategy.singleton("acme", storages())
+
+        instance = await strategy.__aresolve__()
+
+        assert instance == Storage("acme")
+        assert await strategy.__aresolve__() is instance
@@ -0,0 +1,276 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Iterable, get_args, get_origin
+import asyncio
+import inspect
+
+from .composite import Composite, DependencyObject
+from .context import check_pooled, context_annotations
+from .errors import ValidationError, WiresError
+from .graph import walk
+from .instrumentation import label
+from .keys import composite_key
+from .lazy import Lazy
+from .lifetime import Lifetime
+from .resources import current_resources
+from .strategy import ContextStrategy
+
+
+@dataclass
+class Problem:
+    """
+    Something wrong with the declaration of a context.
+
+    `port` is the attribute of the context the problem was found from,
+    `composite` the composite that has the problem, if any.
+    """
+    port: str
+    composite: str | None
+    message: str
+    error: BaseException | None = None
+
+    def __str__(self) -> str:
+        where = self.port
+        if self.composite:
+            where = f"{where} ({self.composite})"
+        return f"{where}: {self.message}"
+
+
+def _placeholder(value: Any) -> Any:
+    if isinstance(value, DependencyObject):
+        return value.dependency
+    return value
+
+
+def check_signature(composite: Composite) -> str | None:
+    """
+    Checks that the arguments of a composite can be bound
+    to the signature of its model.
+    """
+    if isinstance(composite, (ContextStrategy, Lazy)):
+        return None
+    try:
+        signature = inspect.signature(composite.model)
+    except (TypeError, ValueError):
+        # builtins and extensions without signature
+        return None
+    try:
+        signature.bind(
+            *[_placeholder(arg) for arg in composite._args],
+            **{
+                key: _placeholder(value)
+                for key, value in composite._kwargs.items()
+            },
+        )
+    except TypeError as error:
+        return str(error)
+    return None
+
+
+def validate(context: Any) -> list[Problem]:
+    """
+    Finds every problem of a context without building anything:
+    annotations that don't describe a port, declarations without a
+    composite, constructor arguments that don't match the signature
+    of the model, pooled dependencies of singletons and strategies,
+    cycles and unmatched strategy keys.
+    """
+    problems: list[Problem] = []
+    roots: list[tuple[str, Composite]] = []
+
+    for name, annotation in context_annotations(
+        context.__class__
+    ).items():
+        origin = get_origin(annotation)
+        if not (
+            isinstance(origin, type) and issubclass(origin, Composite)
+        ):
+            continue
+        args = get_args(annotation)
+        port = args[0] if args else annotation
+        if composite_key(port) is None:
+            problems.append(Problem(
+                name, None, f"{port!r} is not a type and can't be a port"
+            ))
+        value = getattr(context, name, None)
+        if not isinstance(value, (Composite, DependencyObject)):
+            problems.append(Problem(
+                name, None, f"declared as {annotation!r} but is {value!r}"
+            ))
+            continue
+        if isinstance(value, Composite):
+            roots.append((name, value))
+
+    seen: set[int] = set()
+    for name, root in roots:
+        for node in walk(root):
+            if id(node) in seen or not isinstance(node, Composite):
+                continue
+            seen.add(id(node))
+            message = check_signature(node)
+            if message is not None:
+                problems.append(Problem(name, label(node), message))
+            checks: list[Callable[[], None]] = [partial(check_pooled, node)]
+            if isinstance(node, ContextStrategy):
+                checks.append(node.check_key)
+            for check in checks:
+                try:
+                    check()
+                except WiresError as error:
+                    problems.append(
+                        Problem(name, label(node), str(error), error)
+                    )
+
+    if not problems:
+        try:
+            if context.adapters_initialized:
+                context.compile_adapters()
+            else:
+                context.initialize_adapters()
+        except WiresError as error:
+            problems.append(Problem("context", None, str(error), error))
+
+    return problems
+
+
+def singleton_levels(roots: Iterable[Composite]) -> list[list[Composite]]:
+    """
+    Groups the singletons reachable from `roots` in levels, the
+    singletons of a level only depend on singletons of previous levels,
+    so the singletons of a level can be built in parallel.
+    """
+    levels: dict[int, int] = {}
+    nodes: dict[int, Composite] = {}
+
+    for root in roots:
+        for node in walk(root):
+            if isinstance(node, Composite):
+                nodes[id(node)] = node
+
+    def level(node: Composite) -> int:
+        # iterative post order, graphs may be deeper than the stack
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in levels:
+                continue
+            children = [
+                child for child in current.dependencies()
+                if isinstance(child, Composite)
+            ]
+            if not expanded:
+                stack.append((current, True))
+                stack.extend(
+                    (child, False) for child in children
+                    if id(child) not in levels
+                )
+                continue
+            depth = max(
+                (levels[id(child)] for child in children), default=-1
+            )
+            if current.lifetime is Lifetime.SINGLETON:
+                depth += 1
+            levels[id(current)] = depth
+        return levels[id(node)]
+
+    grouped: dict[int, list[Composite]] = {}
+    for node in nodes.values():
+        if (
+            node.lifetime is Lifetime.SINGLETON
+            and not isinstance(node, ContextStrategy)
+        ):
+            grouped.setdefault(level(node), []).append(node)
+    return [grouped[index] for index in sorted(grouped)]
+
+
+def _roots(context: Any) -> list[Composite]:
+    return [
+        adapter.adapter for adapter in context.adapters.values()
+        if isinstance(adapter.adapter, Composite)
+    ]
+
+
+def _build(context: Any, node: Composite) -> Problem | None:
+    # worker threads don't see the context variables of the caller,
+    # singleton resources go to `singleton_resources`, the other
+    # resources built by singletons are owned by the context
+    token = current_resources.set(context.resources)
+    try:
+        node()
+    except Exception as error:
+        return Problem(
+            "warmup", label(node), f"{type(error).__name__}: {error}", error
+        )
+    finally:
+        current_resources.reset(token)
+    return None
+
+
+def warmup(context: Any, max_workers: int | None = None) -> None:
+    """
+    Validates the context and builds all its singletons, singletons
+    that don't depend on each other are built in parallel threads.
+
+    Raises `ValidationError` with every problem found.
+    """
+    problems = validate(context)
+    if problems:
+        raise ValidationError(problems)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for level in singleton_levels(_roots(context)):
+            synchronous = [
+                node for node in level if not node.is_async()
+            ]
+            problems.extend(
+                problem for problem in executor.map(
+                    partial(_build, context), synchronous
+                )
+                if problem is not None
+            )
+            if problems:
+                break
+
+    if problems:
+        raise ValidationError(problems)
+
+
+async def awarmup(context: Any) -> None:
+    """
+    Validates the context and builds all its singletons, including
+    async ones, singletons that don't depend on each other are built
+    concurrently.
+
+    Raises `ValidationError` with every problem found.
+    """
+    problems = validate(context)
+    if problems:
+        raise ValidationError(problems)
+
+    async def build(node: Composite) -> Problem | None:
+        try:
+            token = current_resources.set(context.resources)
+            try:
+                await node.__aresolve__(context.resources)
+            finally:
+                current_resources.reset(token)
+        except Exception as error:
+            return Problem(
+                "warmup",
+                label(node),
+                f"{type(error).__name__}: {error}",
+                error,
+            )
+        return None
+
+    for level in singleton_levels(_roots(context)):
+        results = await asyncio.gather(*(build(node) for node in level))
+        problems.extend(
+            problem for problem in results if problem is not None
+        )
+        if problems:
+            break
+
+    if problems:
+        raise ValidationError(problems)